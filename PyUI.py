@@ -1,4 +1,5 @@
 import pygame
+import os
 import sys
 import math
 from enum import Enum
@@ -33,6 +34,14 @@ class PyUI:
         
         self.game = Game(GameMode.ASYNC)
         self.game.ui = self  # Allow game to access UI for sound effects
+
+        # Slow-frame capture for stutter reports, see frame_watchdog.py
+        watchdog_budget = os.environ.get("BIGBADABLER_WATCHDOG_MS")
+        if watchdog_budget:
+            from frame_watchdog import SlowFrameWatchdog
+            self.game.board.add_probe(SlowFrameWatchdog(
+                os.environ.get("BIGBADABLER_WATCHDOG_DIR", "slow_frames"),
+                budget_ms=float(watchdog_budget)))
         
         self.tile_size = 75  # Increased from 60 to make units larger
         # Recalculate board position for 8x8 grid with 75px tiles
@@ -179,7 +188,7 @@ class PyUI:
 
     def init_game(self):
         self.game.available_units = get_available_units()
-        self.game.available_augments = generate_augment_shop()
+        self.game.available_augments = generate_augment_shop(rng=self.game.rng)
         self.game.start_new_round()
         # Clear visual positions when starting a new round
         self.unit_visual_positions.clear()
@@ -1040,7 +1049,7 @@ class PyUI:
         if unit.status_effects:
             # Position them just above the HP bar
             status_base_y = y + offset_y + self.tile_size - 28  # Above HP bar
-            for i, status in enumerate(unit.status_effects[:6]):  # Max 6 shown
+            for i, status in enumerate(list(unit.status_effects.values())[:6]):  # Max 6 shown
                 status_x = x + offset_x + 8 + i * 12  # Horizontal spacing
                 status_y = status_base_y
                 status_color = (200, 100, 255) if "buff" in status.name.lower() else (255, 100, 100)
@@ -1910,7 +1919,9 @@ class PyUI:
         if unit.status_effects:
             lines.append(('', None))
             lines.append(("STATUS EFFECTS:", (255, 150, 255)))
-            for status in unit.status_effects:
+            for status in unit.status_effects.values():
+                if unit.status_timers:
+                    unit.status_timers.sync(status)
                 try:
                     if hasattr(status, 'remaining_duration') and status.remaining_duration is not None:
                         duration_text = f" ({status.remaining_duration:.1f}s)"
@@ -65,6 +65,12 @@ class ItemAugment(Augment):
 
 class PassiveAugment(Augment):
     """Augment that provides a passive bonus"""
+
+    # (event_type, role) pairs this augment's on_event handles; see event_bus.py
+    event_subscriptions = ()
+    # (timer attribute, interval) when on_frame only counts a timer up to an interval
+    # between actions, so fast-forward can skip ahead; see fast_forward.py
+    frame_timer = None
     
     def __init__(self, name, description, cost):
         super().__init__(name, description, cost)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Combat benchmark suite for BigBadAbler.
+
+Runs a fixed set of headless scenarios and reports:
+- frames/sec of the combat update for each scenario
+- battles/sec of full headless battles for each scenario
+- milliseconds per Team.generate_enemy_team and generate_augment_shop call
+
+Usage:
+    python benchmark.py                      # run and write benchmark_results.json
+    python benchmark.py --quick              # fewer repeats, for a fast sanity check
+    python benchmark.py --save-baseline      # also store the results as the baseline
+    python benchmark.py --compare            # compare against benchmarks/baseline.json
+    python benchmark.py --compare OTHER.json
+    python benchmark.py --vectorized         # run the scenarios with Board(vectorized=True)
+
+Every scenario is seeded, so runs differ only in timing. Baselines are
+only comparable on the same machine and Python version.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+GAME_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, GAME_ROOT)
+
+from constants import FRAME_TIME
+
+BASELINE_PATH = os.path.join(GAME_ROOT, "benchmarks", "baseline.json")
+RESULTS_PATH = os.path.join(GAME_ROOT, "benchmark_results.json")
+
+# Change larger than this fraction is flagged in comparisons
+DEFAULT_THRESHOLD = 0.10
+
+# Below this many units the vectorized stores cost more than they save: every
+# 8x8 scenario here runs 1.3-2.7x slower with them, and 16x16 boards break even
+# at about 128 units
+VECTORIZED_MIN_UNITS = 128
+
+ALL_UNITS = ["sun_spirit", "crazed_thornhound", "pillar_of_bones", "water_nymph", "big_lips",
+             "oakenheart", "imp_torturer", "mass_of_tentacles", "flame_maiden", "red_wyrm",
+             "void_knight", "blood_ogre"]
+
+
+def _full_board_team(x_range):
+    """32 units filling one half of the board, every item spread across them"""
+    from content.items import get_all_items
+    from content.augments import get_all_passive_augment_types
+
+    items = get_all_items()
+    units = []
+    for index, (x, y) in enumerate((x, y) for x in x_range for y in range(8)):
+        units.append({
+            "unit": ALL_UNITS[index % len(ALL_UNITS)],
+            "x": x,
+            "y": y,
+            "items": [items[(index * 3 + slot) % len(items)] for slot in range(3)],
+        })
+    return {"units": units,
+            "augments": [augment.__name__ for augment in get_all_passive_augment_types()]}
+
+
+def _mixed_team(x_range, offset):
+    positions = [(x, y) for x in x_range for y in range(1, 7, 2)]
+    return [{"unit": ALL_UNITS[(index + offset) % len(ALL_UNITS)], "x": x, "y": y}
+            for index, (x, y) in enumerate(positions[:8])]
+
+
+def get_scenarios():
+    """Scenario name -> (player_spec, enemy_spec)"""
+    return {
+        "1v1_melee": (
+            [{"unit": "blood_ogre", "x": 2, "y": 3}],
+            [{"unit": "crazed_thornhound", "x": 5, "y": 3}],
+        ),
+        "8v8_mixed": (_mixed_team(range(0, 3), 0), _mixed_team(range(5, 8), 6)),
+        "skeleton_spam": (
+            [{"unit": "pillar_of_bones", "x": 1, "y": y} for y in (1, 3, 5, 7)],
+            [{"unit": "pillar_of_bones", "x": 6, "y": y} for y in (0, 2, 4, 6)],
+        ),
+        "projectile_storm": (
+            [{"unit": "imp_torturer", "x": x, "y": y} for x in (0, 1) for y in (1, 3, 5, 7)],
+            [{"unit": "imp_torturer", "x": x, "y": y} for x in (6, 7) for y in (0, 2, 4, 6)],
+        ),
+        "full_board": (_full_board_team(range(0, 4)), _full_board_team(range(4, 8))),
+    }
+
+
+def _best_time(function, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def count_units(team_spec):
+    return len(team_spec["units"] if isinstance(team_spec, dict) else team_spec)
+
+
+def vectorized_warnings(scenarios):
+    """Warnings for scenarios too small to benefit from vectorized=True"""
+    return [f"{name}: {units} units is below {VECTORIZED_MIN_UNITS}; vectorized=True is "
+            f"likely slower than the default path"
+            for name, units in ((name, count_units(player_spec) + count_units(enemy_spec))
+                                for name, (player_spec, enemy_spec) in scenarios.items())
+            if units < VECTORIZED_MIN_UNITS]
+
+
+def measure_frames(player_spec, enemy_spec, frames=600, repeat=3, seed=0, vectorized=False):
+    """Frames/sec of the combat update over the first frames of a battle"""
+    from game import Game, GamePhase
+    from simulation import build_team
+
+    best = float('inf')
+    stepped = 0
+    for _ in range(repeat):
+        game = Game(headless=True, seed=seed, vectorized=vectorized)
+        build_team(game, game.player_team, player_spec)
+        build_team(game, game.enemy_team, enemy_spec)
+        game.start_combat()
+        stepped = 0
+        start = time.perf_counter()
+        while stepped < frames and game.phase == GamePhase.COMBAT:
+            game.update_combat(FRAME_TIME)
+            stepped += 1
+        best = min(best, time.perf_counter() - start)
+    return stepped / best
+
+
+def measure_battles(player_spec, enemy_spec, seeds=range(5), repeat=3, vectorized=False):
+    """Full headless battles per second, over the given seeds"""
+    from simulation import simulate_combat
+
+    def run():
+        for seed in seeds:
+            simulate_combat(player_spec, enemy_spec, seed, vectorized=vectorized)
+
+    return len(seeds) / _best_time(run, repeat)
+
+
+def measure_generate_enemy_team(calls=50, repeat=3):
+    """Milliseconds per Team.generate_enemy_team"""
+    from game import Game
+
+    game = Game(headless=True, seed=0)
+
+    def run():
+        game.rng.seed(0)
+        for _ in range(calls):
+            game.enemy_team.generate_enemy_team(budget=300)
+
+    return _best_time(run, repeat) / calls * 1000
+
+
+def measure_generate_augment_shop(calls=200, repeat=3):
+    """Milliseconds per generate_augment_shop"""
+    import random
+    from game import Game
+    from content.augments import generate_augment_shop
+
+    game = Game(headless=True, seed=0)
+    rng = random.Random(0)
+
+    def run():
+        rng.seed(0)
+        for _ in range(calls):
+            generate_augment_shop(game.player_team, rng=rng)
+
+    return _best_time(run, repeat) / calls * 1000
+
+
+def run_benchmarks(quick=False, vectorized=False):
+    repeat = 1 if quick else 3
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "quick": quick,
+            "vectorized": vectorized,
+        },
+        "scenarios": {},
+        "functions": {},
+    }
+    for name, (player_spec, enemy_spec) in get_scenarios().items():
+        seeds = range(2) if quick else range(5)
+        results["scenarios"][name] = {
+            "frames_per_sec": measure_frames(player_spec, enemy_spec, repeat=repeat, vectorized=vectorized),
+            "battles_per_sec": measure_battles(player_spec, enemy_spec, seeds=seeds, repeat=repeat,
+                                               vectorized=vectorized),
+        }
+    results["functions"]["generate_enemy_team_ms"] = measure_generate_enemy_team(repeat=repeat)
+    results["functions"]["generate_augment_shop_ms"] = measure_generate_augment_shop(repeat=repeat)
+    return results
+
+
+def _flatten(results):
+    """(name, value) pairs for every metric in a results dict"""
+    metrics = {}
+    for scenario, values in results.get("scenarios", {}).items():
+        for metric, value in values.items():
+            metrics[f"{scenario}.{metric}"] = value
+    for metric, value in results.get("functions", {}).items():
+        metrics[metric] = value
+    return metrics
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """List of (metric, baseline, current, change, verdict) rows.
+
+    change is the relative improvement: positive is faster, whether the
+    metric is a rate (per_sec) or a duration (_ms). verdict is "faster",
+    "slower" or "" when the change is within threshold.
+    """
+    rows = []
+    old_metrics = _flatten(baseline)
+    for metric, new in _flatten(current).items():
+        old = old_metrics.get(metric)
+        if old is None or old == 0 or new == 0:
+            continue
+        if metric.endswith("_ms"):
+            change = old / new - 1
+        else:
+            change = new / old - 1
+        if change > threshold:
+            verdict = "faster"
+        elif change < -threshold:
+            verdict = "slower"
+        else:
+            verdict = ""
+        rows.append((metric, old, new, change, verdict))
+    return rows
+
+
+def print_results(results):
+    print(f"{'Scenario':<20} {'frames/s':>12} {'battles/s':>12}")
+    for name, values in results["scenarios"].items():
+        print(f"{name:<20} {values['frames_per_sec']:>12.1f} {values['battles_per_sec']:>12.2f}")
+    print()
+    for name, value in results["functions"].items():
+        print(f"{name:<32} {value:>10.3f}")
+
+
+def print_comparison(rows):
+    print(f"{'Metric':<36} {'baseline':>12} {'current':>12} {'change':>9}")
+    for metric, old, new, change, verdict in rows:
+        print(f"{metric:<36} {old:>12.2f} {new:>12.2f} {change:>+8.1%} {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the combat benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and seeds")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to write the results JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=BASELINE_PATH, default=None,
+                        help="baseline JSON to compare against (default benchmarks/baseline.json)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative change to flag as faster/slower")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="run the scenarios with NumPy unit and projectile stores")
+    args = parser.parse_args()
+
+    if args.vectorized:
+        for warning in vectorized_warnings(get_scenarios()):
+            print(f"warning: {warning}", file=sys.stderr)
+    results = run_benchmarks(quick=args.quick, vectorized=args.vectorized)
+    print_results(results)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved to {BASELINE_PATH}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print()
+        print_comparison(compare_results(results, baseline, args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,48 @@
+"""
+Bitboard helpers for the default 8x8 board.
+
+Tile (x, y) is bit y * 8 + x of a 64-bit integer. RANGE_MASKS[r][tile] has
+every tile within Chebyshev distance r of tile set, so "is any enemy within
+range r" is a single AND against a team's occupancy bitboard.
+"""
+
+SIZE = 8
+TILE_COUNT = SIZE * SIZE
+MAX_RANGE = SIZE - 1  # Range 7 already covers the whole board from any tile
+ALL_TILES = (1 << TILE_COUNT) - 1
+
+
+def tile_index(x: int, y: int) -> int:
+    return y * SIZE + x
+
+
+def tile_bit(x: int, y: int) -> int:
+    return 1 << (y * SIZE + x)
+
+
+def _build_range_masks():
+    masks = []
+    for r in range(MAX_RANGE + 1):
+        row = []
+        for index in range(TILE_COUNT):
+            x, y = index % SIZE, index // SIZE
+            mask = 0
+            for ty in range(max(0, y - r), min(SIZE, y + r + 1)):
+                for tx in range(max(0, x - r), min(SIZE, x + r + 1)):
+                    mask |= tile_bit(tx, ty)
+            row.append(mask)
+        masks.append(row)
+    return masks
+
+
+RANGE_MASKS = _build_range_masks()
+
+# Adjacent tiles only, excluding the tile itself; one flow-field BFS ring per OR (see Board.get_flow_field)
+NEIGHBOUR_MASKS = [RANGE_MASKS[1][index] & ~(1 << index) for index in range(TILE_COUNT)]
+
+
+def range_mask(index: int, r) -> int:
+    """Mask of tiles within Chebyshev distance r of tile index (r may be fractional)"""
+    if r < 0:
+        return 0
+    return RANGE_MASKS[min(int(r), MAX_RANGE)][index]
@@ -1,60 +1,186 @@
+import copy
 import math
+import random
 from typing import List, Optional, Tuple, Set
 from collections import deque
+from itertools import chain
 from visual_effect import VisualEffect, VisualEffectType
 from text_floater import TextFloaterManager
 from cloud_effect import CloudEffect
+from event_bus import EventBus
+from status_timers import StatusTimers
+import bitboard
+
+# Golden ratio fraction: consecutive placements get evenly spread think phases
+THINK_PHASE_STEP = 0.6180339887498949
+
+# Neighbour order for movement: straight moves before diagonals
+STEP_DIRECTIONS = [(-1, 0), (0, -1), (0, 1), (1, 0),
+                   (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+UNREACHABLE = float('inf')
+
 
 class Board:
-    def __init__(self, width: int = 8, height: int = 8):
+    def __init__(self, width: int = 8, height: int = 8, headless: bool = False, rng=None,
+                 vectorized: bool = False, think_rate: Optional[float] = None,
+                 analytic_projectiles: bool = False):
         self.width = width
         self.height = height
+        # Headless boards skip all presentation state (floaters, visual effects,
+        # flash/bump timers, combat log) so batch simulations only pay for gameplay
+        self.headless = headless
+        # Gameplay randomness must come from self.rng so a seeded battle replays exactly.
+        # Cosmetic randomness uses fx_rng so presentation never shifts the gameplay stream.
+        self.rng = rng if rng is not None else random.Random()
+        self.fx_rng = random.Random()
         self.units = {}
         self.player_units = []
         self.enemy_units = []
+        # player_units + enemy_units, and the living units of each side in the same
+        # order. These lists are replaced rather than changed in place when units are
+        # added, removed or die, so callers may iterate them while the board changes.
+        self.all_units = []
+        self.living_units = {"player": [], "enemy": []}
         self.projectiles = []
         self.visual_effects = []
         self.cloud_effects = []
-        self.text_floater_manager = TextFloaterManager()
-        self.event_handlers = {}
+        self.text_floater_manager = TextFloaterManager(self.fx_rng)
+        self.events = EventBus()
+        self.event_handlers = {}  # (event_type, handler) -> bus token for add_event_handler
         self.game = None  # Will be set by Game class
         self.corpses = []  # List of corpse positions for necromancer abilities
+
+        # Neighbour tile indices (index = y * width + x) in STEP_DIRECTIONS order
+        self.neighbours = []
+        for y in range(height):
+            for x in range(width):
+                self.neighbours.append([(y + dy) * width + (x + dx) for dx, dy in STEP_DIRECTIONS
+                                        if self.is_valid_position(x + dx, y + dy)])
+        # team -> distance field to that team's nearest living enemy, rebuilt lazily
+        # after occupancy changes
+        self.flow_fields = {}
+        # Bumped whenever a unit is added, moves, dies or is removed; units key their
+        # cached targets on it (see Unit.acquire_targets)
+        self.layout_version = 0
+
+        # 8x8 boards keep a bitboard of living units per side for O(1) range checks;
+        # other sizes use the plain list scans
+        self.use_bitboards = (width == bitboard.SIZE and height == bitboard.SIZE)
+        self.living_bitboards = {"player": 0, "enemy": 0}
+
+        # Optional NumPy-backed timers, regen and projectile flight for large boards
+        # (see unit_store.py and projectile_store.py). Below about 128 units the stores
+        # cost more than they save: every 8x8 benchmark scenario runs 1.3-2.7x slower.
+        # Battles also differ from the default path, on any board size.
+        self.unit_store = None
+        self.projectile_store = None
+        if vectorized:
+            from unit_store import UnitStore
+            from projectile_store import ProjectileStore
+            self.unit_store = UnitStore()
+            if not analytic_projectiles:
+                self.projectile_store = ProjectileStore(self.projectiles, self.unit_store)
+
+        # Headless boards may schedule projectile landings instead of stepping
+        # their flight (see projectile_arrivals.py)
+        self.projectile_arrivals = None
+        if analytic_projectiles:
+            if not headless:
+                raise ValueError("Analytic projectiles require a headless board")
+            from projectile_arrivals import ProjectileArrivals
+            self.projectile_arrivals = ProjectileArrivals(self.projectiles)
+
+        # Wakes status effects only when they tick or expire (see status_timers.py)
+        self.status_timers = StatusTimers()
+
+        # With a think_rate (Hz), units only decide once every think_interval
+        # seconds, each at its own phase; 0 decides every frame
+        self.think_interval = 1.0 / think_rate if think_rate else 0.0
+        self.units_placed = 0
+
+        # Timing and counting probes (see frame_stats.py); empty unless profiling
+        self.probes = []
         
     def add_unit(self, unit, x: int, y: int, team: str):
         if self.is_valid_position(x, y) and not self.get_unit_at(x, y):
+            # A unit on the board is always registered at its own tile
+            assert self.units.get((unit.x, unit.y)) is not unit
             unit.x = x
             unit.y = y
             unit.team = team
             unit.board = self  # Set board reference
             self.units[(x, y)] = unit
+            # Player units before enemy units, each in the order they were placed,
+            # like get_all_units; orders the unit's event listeners (see event_bus.py)
+            unit.event_order = (0 if team == "player" else 1, self.units_placed)
+            # Spread think ticks over the interval so units don't all decide on one frame
+            unit.think_phase = (1.0 - self.units_placed * THINK_PHASE_STEP % 1.0) * self.think_interval
+            unit.think_timer = unit.think_phase
+            self.units_placed += 1
             
             if team == "player":
-                assert(unit not in self.player_units)
                 self.player_units.append(unit)
             else:
-                assert(unit not in self.enemy_units)
                 self.enemy_units.append(unit)
-            
+            self.all_units = self.player_units + self.enemy_units
+
+            if unit.is_alive():
+                side = self._side(team)
+                self.living_units[side] = self.living_units[side] + [unit]
+                if self.use_bitboards:
+                    self.living_bitboards[side] |= bitboard.tile_bit(x, y)
+            self.layout_changed()
+            if self.unit_store:
+                self.unit_store.attach(unit)
+            self.status_timers.add_unit(unit)
+            unit.bind_frame_hooks()
+            self.subscribe_unit(unit)
             self.raise_event("unit_added", unit=unit)
             return True
         return False
     
     def remove_unit(self, unit):
-        if (unit.x, unit.y) in self.units:
+        on_board = self.units.get((unit.x, unit.y)) is unit
+        if on_board:
             del self.units[(unit.x, unit.y)]
-            
-        if unit in self.player_units:
-            self.player_units.remove(unit)
-        elif unit in self.enemy_units:
-            self.enemy_units.remove(unit)
-            
+            if unit.team == "player":
+                self.player_units.remove(unit)
+            else:
+                self.enemy_units.remove(unit)
+            self.all_units = self.player_units + self.enemy_units
+
+        if on_board and unit.is_alive():
+            self._remove_living(unit)
+        if self.projectile_arrivals:
+            self.projectile_arrivals.target_changed(unit)
+        self.layout_changed()
+        self.unsubscribe_unit(unit)
+        if self.unit_store:
+            self.unit_store.detach(unit)
+        if on_board:
+            self.status_timers.remove_unit(unit)
         self.raise_event("unit_removed", unit=unit)
     
     def clear(self):
         """Clear all units, projectiles, visual effects, and cloud effects from the board."""
+        for unit in self.get_all_units():
+            self.unsubscribe_unit(unit)
+            if self.unit_store:
+                self.unit_store.detach(unit)
+            self.status_timers.remove_unit(unit)
+        self.status_timers.clear()
         self.units.clear()
+        self.layout_changed()
+        self.living_bitboards = {"player": 0, "enemy": 0}
         self.player_units.clear()
         self.enemy_units.clear()
+        self.all_units = []
+        self.living_units = {"player": [], "enemy": []}
+        if self.projectile_store:
+            self.projectile_store.clear()
+        if self.projectile_arrivals:
+            self.projectile_arrivals.clear()
         self.projectiles.clear()
         self.visual_effects.clear()
         self.cloud_effects.clear()
@@ -68,10 +194,19 @@ class Board:
         if self.get_unit_at(new_x, new_y):
             return False
             
+        if self.use_bitboards and unit.is_alive():
+            side = self._side(unit.team)
+            self.living_bitboards[side] = ((self.living_bitboards[side] & ~bitboard.tile_bit(unit.x, unit.y))
+                                           | bitboard.tile_bit(new_x, new_y))
         del self.units[(unit.x, unit.y)]
         unit.x = new_x
         unit.y = new_y
         self.units[(new_x, new_y)] = unit
+        if unit.store_row is not None:
+            self.unit_store.move(unit)
+        if self.projectile_arrivals:
+            self.projectile_arrivals.target_changed(unit)
+        self.layout_changed()
         return True
     
     def get_unit_at(self, x: int, y: int):
@@ -86,41 +221,97 @@ class Board:
     def get_distance_to_point(self, unit, x: float, y: float) -> float:
         return max(abs(unit.x - x), abs(unit.y - y))
     
+    @staticmethod
+    def _side(team: str) -> str:
+        """Which unit list / bitboard a team's units live in"""
+        return "player" if team == "player" else "enemy"
+
     def get_nearest_enemy(self, unit):
-        enemies = self.enemy_units if unit.team == "player" else self.player_units
+        enemies = self.get_living_enemies(unit.team)
         if not enemies:
             return None
+
+        if self.use_bitboards:
+            occupied = self.living_bitboards["enemy" if unit.team == "player" else "player"]
+            # Smallest ring containing an enemy; the first enemy in list order inside it
+            # is the nearest with the same tie-break as the full scan
+            index = bitboard.tile_index(unit.x, unit.y)
+            for ring in bitboard.RANGE_MASKS:
+                mask = ring[index]
+                if mask & occupied:
+                    for enemy in enemies:
+                        if mask >> (enemy.y * bitboard.SIZE + enemy.x) & 1:
+                            return enemy
+                    break
+        elif self.unit_store and unit.store_row is not None:
+            # Ties go to the first enemy in list order, as in the scan below
+            candidates = self.unit_store.nearest_enemy_candidates(unit)
+            if len(candidates) > 1:
+                candidates.sort(key=enemies.index)
+            return candidates[0] if candidates else None
             
         nearest = None
         min_distance = float('inf')
         
         for enemy in enemies:
-            if enemy.is_alive():
-                distance = self.get_distance(unit, enemy)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest = enemy
+            distance = self.get_distance(unit, enemy)
+            if distance < min_distance:
+                min_distance = distance
+                nearest = enemy
                     
         return nearest
     
+    def filter_in_range(self, units, x: int, y: int, range) -> List:
+        """Living units from units within Chebyshev range of tile (x, y), in list order"""
+        if self.use_bitboards:
+            mask = bitboard.range_mask(bitboard.tile_index(x, y), range)
+            size = bitboard.SIZE
+            return [unit for unit in units if mask >> (unit.y * size + unit.x) & 1 and unit.is_alive()]
+        return [unit for unit in units
+                if unit.is_alive() and max(abs(unit.x - x), abs(unit.y - y)) <= range]
+
+    def has_enemy_in_range(self, unit, range) -> bool:
+        """Whether any living enemy of unit is within range"""
+        if self.use_bitboards:
+            occupied = self.living_bitboards["enemy" if unit.team == "player" else "player"]
+            return bool(occupied & bitboard.range_mask(bitboard.tile_index(unit.x, unit.y), range))
+        if self.unit_store and unit.store_row is not None:
+            return self.unit_store.has_enemy_in_range(unit, range)
+        return any(self.get_distance(unit, enemy) <= range
+                   for enemy in self.get_living_enemies(unit.team))
+
     def get_units_in_range(self, x: int, y: int, range: int, team: Optional[str] = None) -> List:
-        units_in_range = []
-        
-        for unit in self.get_all_units():
-            if not unit.is_alive():
-                continue
-                
-            if team and unit.team != team:
-                continue
-                
-            distance = max(abs(unit.x - x), abs(unit.y - y))
-            if distance <= range:
-                units_in_range.append(unit)
-                
-        return units_in_range
+        """Living units within Chebyshev range of (x, y), optionally of one team, in board order"""
+        living = self.living_units
+        if team == "player":
+            units = living["player"]
+        elif team:
+            units = living["enemy"]
+            if team != "enemy":
+                units = [unit for unit in units if unit.team == team]
+        else:
+            units = chain(living["player"], living["enemy"])
+
+        if self.use_bitboards and isinstance(x, int) and isinstance(y, int) and self.is_valid_position(x, y):
+            mask = bitboard.range_mask(bitboard.tile_index(x, y), range)
+            size = bitboard.SIZE
+            return [unit for unit in units if mask >> (unit.y * size + unit.x) & 1]
+        return [unit for unit in units if max(abs(unit.x - x), abs(unit.y - y)) <= range]
     
     def get_all_units(self) -> List:
-        return self.player_units + self.enemy_units
+        """Every unit on the board, player units first. The list is shared; don't modify it."""
+        return self.all_units
+
+    def get_living_units(self, team: str) -> List:
+        """Living units on team's side in board order. Shared like get_all_units."""
+        return self.living_units[self._side(team)]
+
+    def get_living_enemies(self, team: str) -> List:
+        """Living enemies of team in board order. Shared like get_all_units."""
+        return self.living_units["enemy" if team == "player" else "player"]
+
+    def count_living(self, team: str) -> int:
+        return len(self.living_units[self._side(team)])
         
     def get_enemy_units(self, team: str) -> List:
         """Get all units that are enemies of the given team"""
@@ -145,18 +336,17 @@ class Board:
         
         if start == end:
             return [start]
+        if self.probes:
+            self.probe_count("path_search")
             
         queue = deque([(start, [start])])
         visited = {start}
         
-        # Prioritize straight movements over diagonal ones
-        directions = [(-1, 0), (0, -1), (0, 1), (1, 0),  # Straight movements first
-                     (-1, -1), (-1, 1), (1, -1), (1, 1)]  # Diagonal movements second
-        
         while queue:
             (x, y), path = queue.popleft()
             
-            for dx, dy in directions:
+            # Prioritize straight movements over diagonal ones
+            for dx, dy in STEP_DIRECTIONS:
                 new_x, new_y = x + dx, y + dy
                 new_pos = (new_x, new_y)
                 
@@ -170,29 +360,172 @@ class Board:
                     queue.append((new_pos, path + [new_pos]))
                     
         return []
+
+    def get_flow_field(self, team: str) -> List[float]:
+        """Distance from every tile to the nearest living enemy of team, by tile index.
+
+        Multi-source BFS over empty tiles seeded from all living enemies (distance 0).
+        Occupied tiles other than the seeds are UNREACHABLE. Cached until occupancy changes.
+        """
+        field = self.flow_fields.get(team)
+        if field is not None:
+            return field
+        if self.probes:
+            self.probe_count("flow_field")
+
+        if self.use_bitboards:
+            field = self._bitboard_flow_field(team)
+            self.flow_fields[team] = field
+            return field
+
+        width = self.width
+        field = [UNREACHABLE] * (width * self.height)
+        blocked = [False] * len(field)
+        for (x, y) in self.units:
+            blocked[y * width + x] = True
+
+        queue = deque()
+        for enemy in self.get_living_enemies(team):
+            index = enemy.y * width + enemy.x
+            if field[index] != 0:
+                field[index] = 0
+                queue.append(index)
+
+        neighbours = self.neighbours
+        while queue:
+            index = queue.popleft()
+            distance = field[index] + 1
+            for neighbour in neighbours[index]:
+                if not blocked[neighbour] and field[neighbour] > distance:
+                    field[neighbour] = distance
+                    queue.append(neighbour)
+
+        self.flow_fields[team] = field
+        return field
+
+    def _bitboard_flow_field(self, team: str) -> List[float]:
+        """get_flow_field on an 8x8 board, expanding a whole BFS ring per step with NEIGHBOUR_MASKS"""
+        field = [UNREACHABLE] * bitboard.TILE_COUNT
+        free = bitboard.ALL_TILES
+        for (x, y) in self.units:
+            free &= ~bitboard.tile_bit(x, y)
+
+        frontier = 0
+        for enemy in self.get_living_enemies(team):
+            frontier |= bitboard.tile_bit(enemy.x, enemy.y)
+        reached = frontier
+        neighbour_masks = bitboard.NEIGHBOUR_MASKS
+        distance = 0
+        while frontier:
+            ring = 0
+            while frontier:
+                low = frontier & -frontier
+                index = low.bit_length() - 1
+                field[index] = distance
+                ring |= neighbour_masks[index]
+                frontier ^= low
+            frontier = ring & free & ~reached
+            reached |= frontier
+            distance += 1
+        return field
+
+    def get_next_step(self, unit, target) -> Optional[Tuple[int, int]]:
+        """Next tile for unit moving towards target, or None if there is no way forward.
+
+        Towards a living enemy this reads the team's flow field: the first neighbour in
+        STEP_DIRECTIONS order with the smallest distance, which matches the first step
+        of find_path when there is a single enemy. Other targets fall back to find_path.
+        """
+        if target.team == unit.team or not target.is_alive():
+            path = self.find_path(unit.x, unit.y, target.x, target.y)
+            return path[1] if len(path) > 1 else None
+
+        field = self.get_flow_field(unit.team)
+        best = None
+        best_distance = UNREACHABLE
+        for neighbour in self.neighbours[unit.y * self.width + unit.x]:
+            if field[neighbour] < best_distance:
+                best = neighbour
+                best_distance = field[neighbour]
+        if best is None:
+            return None
+        return (best % self.width, best // self.width)
     
+    def add_event_handler(self, event_type: str, handler):
+        """Register a callable invoked as handler(**kwargs) whenever event_type is raised."""
+        token = self.events.subscribe(event_type, lambda _event_type, **kwargs: handler(**kwargs))
+        self.event_handlers[(event_type, handler)] = token
+
+    def remove_event_handler(self, event_type: str, handler):
+        token = self.event_handlers.pop((event_type, handler), None)
+        if token:
+            self.events.unsubscribe(token)
+
+    def subscribe_unit(self, unit):
+        """Subscribe a unit's skills, items and status effects to board events"""
+        unit.events_subscribed = True
+        for skill in unit.iter_skills():
+            self.events.subscribe_listener(skill, unit)
+        for item in unit.items:
+            self.events.subscribe_listener(item, unit)
+        for status in unit.status_effects.values():
+            self.events.subscribe_listener(status, unit)
+
+    def unsubscribe_unit(self, unit):
+        unit.events_subscribed = False
+        for skill in unit.iter_skills():
+            self.events.unsubscribe_listener(skill)
+        for item in unit.items:
+            self.events.unsubscribe_listener(item)
+        for status in unit.status_effects.values():
+            self.events.unsubscribe_listener(status)
+
+    def notify_death(self, unit):
+        """Called by Unit.die before death events are raised"""
+        # Dead units never react to events, so drop their listeners now rather than at removal
+        self.unsubscribe_unit(unit)
+        # The corpse still blocks its tile but no longer attracts enemies
+        self.layout_changed()
+        self._remove_living(unit)
+        if self.projectile_arrivals:
+            self.projectile_arrivals.target_changed(unit)
+
+    def layout_changed(self):
+        """Drop flow fields and cached targets after units were added, moved, killed or removed"""
+        self.flow_fields.clear()
+        self.layout_version += 1
+
+    def _remove_living(self, unit):
+        side = self._side(unit.team)
+        self.living_units[side] = [living for living in self.living_units[side] if living is not unit]
+        if self.use_bitboards:
+            self.living_bitboards[side] &= ~bitboard.tile_bit(unit.x, unit.y)
+
     def raise_event(self, event_type: str, **kwargs):
-        for unit in self.get_all_units():
-            if not unit.is_alive():
-                continue
-                
-            for skill in unit.iter_skills():
-                if hasattr(skill, 'on_event'):
-                    skill.on_event(event_type, **kwargs)
-                    
-            for item in unit.items:
-                if hasattr(item, 'on_event'):
-                    item.on_event(event_type, **kwargs)
-                    
-            for status in unit.status_effects[:]:
-                if hasattr(status, 'on_event'):
-                    status.on_event(event_type, **kwargs)
+        probes = self.probes
+        if probes:
+            for probe in probes:
+                probe.count("event:" + event_type)
+                probe.begin("events", event_type)
+            self.events.publish(event_type, kwargs)
+            for probe in reversed(probes):
+                probe.end("events", event_type)
+            return
+        self.events.publish(event_type, kwargs)
     
     def add_projectile(self, projectile):
         self.projectiles.append(projectile)
+        if self.projectile_store:
+            self.projectile_store.attach(projectile)
+        elif self.projectile_arrivals:
+            self.projectile_arrivals.add(projectile)
     
     def remove_projectile(self, projectile):
-        if projectile in self.projectiles:
+        if self.projectile_arrivals:
+            self.projectile_arrivals.remove(projectile)
+        elif self.projectile_store:
+            self.projectile_store.remove(projectile)
+        elif projectile in self.projectiles:
             self.projectiles.remove(projectile)
             
     def add_cloud_effect(self, cloud_effect):
@@ -204,6 +537,12 @@ class Board:
             self.cloud_effects.remove(cloud_effect)
     
     def update_projectiles(self, dt: float):
+        if self.projectile_store:
+            self.projectile_store.advance(dt)
+            return
+        if self.projectile_arrivals:
+            self.projectile_arrivals.advance(dt)
+            return
         for projectile in self.projectiles[:]:
             projectile.update(dt)
             if projectile.reached_target:
@@ -211,12 +550,16 @@ class Board:
     
     def add_visual_effect(self, effect_type: VisualEffectType, x: int, y: int):
         """Add a visual effect at the specified position."""
+        if self.headless:
+            return
         if self.is_valid_position(x, y):
             effect = VisualEffect(effect_type, x, y)
             self.visual_effects.append(effect)
     
     def make_text_floater(self, text: str, color: tuple, x: int = None, y: int = None, unit=None):      
         """Add a text floater at the specified position or unit's position."""
+        if self.headless:
+            return
         if unit is not None:
             # Use unit's position if unit is provided
             pos_x, pos_y = unit.x, unit.y
@@ -246,21 +589,95 @@ class Board:
     
     def update_combat(self, dt: float):
         """Update all combat entities - units, projectiles, visual effects, and cloud effects"""
+        if self.probes:
+            self._update_combat_probed(dt)
+            return
+
         # Update projectiles
         self.update_projectiles(dt)
         
         # Update cloud effects
         self.update_cloud_effects(dt)
         
-        # Update visual effects
-        self.update_visual_effects(dt)
-        
-        # Update text floaters
-        self.text_floater_manager.update(dt)
+        if not self.headless:
+            # Update visual effects
+            self.update_visual_effects(dt)
+
+            # Update text floaters
+            self.text_floater_manager.update(dt)
         
+        if self.unit_store:
+            self.unit_store.advance(dt)
+
+        self.status_timers.advance(dt)
+
         # Update all units
         for unit in self.get_all_units():
             unit.update(dt)
+
+    def _update_combat_probed(self, dt: float):
+        """update_combat with each phase reported to the probes (see frame_stats.py)"""
+        self._probe_phase("projectiles", self.update_projectiles, dt)
+        self._probe_phase("clouds", self.update_cloud_effects, dt)
+        if not self.headless:
+            self._probe_phase("visual_effects", self.update_visual_effects, dt)
+            self._probe_phase("text_floaters", self.text_floater_manager.update, dt)
+        if self.unit_store:
+            self._probe_phase("unit_store", self.unit_store.advance, dt)
+        self._probe_phase("status_timers", self.status_timers.advance, dt)
+        self._probe_phase("units", self._update_units, dt)
+
+    def _update_units(self, dt: float):
+        unit_probes = [probe for probe in self.probes if probe.trace_units]
+        if not unit_probes:
+            for unit in self.get_all_units():
+                unit.update(dt)
+            return
+        for unit in self.get_all_units():
+            for probe in unit_probes:
+                probe.begin("unit", unit)
+            unit.update(dt)
+            for probe in reversed(unit_probes):
+                probe.end("unit", unit)
+
+    def _probe_phase(self, phase: str, update, dt: float):
+        probes = self.probes
+        for probe in probes:
+            probe.begin(phase)
+        update(dt)
+        for probe in reversed(probes):
+            probe.end(phase)
+
+    def __getstate__(self):
+        """Pickle gameplay state only. Probes and add_event_handler callbacks belong to
+        tools and UI, so they are left out of snapshots."""
+        state = self.__dict__.copy()
+        state['probes'] = []
+        state['event_handlers'] = {}
+        if self.event_handlers:
+            events = copy.copy(self.events)
+            events.handlers = dict(self.events.handlers)
+            for token in self.event_handlers.values():
+                events.unsubscribe(token)
+            state['events'] = events
+        return state
+
+    def add_probe(self, probe):
+        """Report combat frame timings and counts to probe (see frame_stats.py)"""
+        if probe not in self.probes:
+            self.probes.append(probe)
+            if hasattr(probe, 'attach'):
+                probe.attach(self)
+
+    def remove_probe(self, probe):
+        if probe in self.probes:
+            self.probes.remove(probe)
+            if hasattr(probe, 'detach'):
+                probe.detach(self)
+
+    def probe_count(self, name: str):
+        for probe in self.probes:
+            probe.count(name)
             
     def add_corpse(self, x: int, y: int, dead_unit):
         """Add a corpse at the specified position"""
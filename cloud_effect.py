@@ -3,6 +3,10 @@ Cloud Effect system for persistent spell effects that remain on the board.
 These effects can deal damage over time, heal, or apply other effects to units in their area.
 """
 
+import bitboard
+from damage import DamageFlag
+
+
 class CloudEffect:
     def __init__(self, name: str, x: float, y: float, radius: float, duration: float):
         self.name = name
@@ -28,6 +32,21 @@ class CloudEffect:
     def is_expired(self) -> bool:
         """Check if this cloud effect has expired"""
         return self.remaining_duration <= 0
+
+    def next_due(self) -> float:
+        """Seconds until update next does more than count down (see fast_forward.py)"""
+        due = self.remaining_duration
+        if type(self).on_tick is not CloudEffect.on_tick:
+            due = min(due, self.tick_interval - self.tick_timer)
+        return due
+
+    def fast_forward(self, frames: int, dt: float):
+        """Apply frames updates in which nothing is due"""
+        for _ in range(frames):
+            self.remaining_duration -= dt
+            self.tick_timer += dt
+            if self.tick_timer >= self.tick_interval:
+                self.tick_timer -= self.tick_interval
         
     def on_tick(self):
         """Called every tick_interval seconds - override in subclasses"""
@@ -37,6 +56,13 @@ class CloudEffect:
         """Get all units within the cloud's radius"""
         if not self.board:
             return []
+
+        if (self.board.use_bitboards and self.x == int(self.x) and self.y == int(self.y)
+                and self.board.is_valid_position(int(self.x), int(self.y))):
+            mask = bitboard.range_mask(bitboard.tile_index(int(self.x), int(self.y)), self.radius)
+            return [unit for unit in self.board.get_all_units()
+                    if mask >> bitboard.tile_index(unit.x, unit.y) & 1
+                    and (team_filter is None or unit.team == team_filter)]
             
         units = []
         for unit in self.board.get_all_units():
@@ -62,12 +88,11 @@ class FirestormCloud(CloudEffect):
             
         # Get enemy units in radius
         enemies = []
-        for unit in self.board.get_all_units():
-            if unit.team != self.source.team and unit.is_alive():
-                distance = self.board.get_distance_to_point(unit, self.x, self.y)
-                if distance <= self.radius:
-                    enemies.append(unit)
+        for unit in self.board.get_living_enemies(self.source.team):
+            distance = self.board.get_distance_to_point(unit, self.x, self.y)
+            if distance <= self.radius:
+                enemies.append(unit)
         
         # Deal damage to all enemies
         for enemy in enemies:
-            enemy.take_damage(self.damage_per_tick, "fire", self.source)
\ No newline at end of file
+            enemy.take_damage(self.damage_per_tick, DamageFlag.FIRE, self.source)
\ No newline at end of file
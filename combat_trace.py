@@ -0,0 +1,185 @@
+"""
+Chrome Trace Event export of a combat timeline.
+
+CombatTracer is a board probe (see frame_stats.py) that records:
+
+- one span per combat frame,
+- nested spans for each Board.update_combat phase, each unit's
+  Unit.update and each raised event (named by event type),
+- instant events for spell casts, deaths and projectile hits,
+- with hooks=True, a span for every content hook call, named by the
+  concrete class (see content_profile.py).
+
+The JSON loads in chrome://tracing or https://ui.perfetto.dev. Events
+are formatted as they happen and written through TraceWriter in large
+chunks, so tracing a long battle does not turn into a file write per
+event. Close the tracer (or use it as a context manager) to finish the
+file.
+
+    with CombatTracer("combat.json", hooks=True) as tracer:
+        simulate_combat(player_spec, enemy_spec, seed=1, probes=[tracer])
+"""
+
+import json
+from time import perf_counter
+
+from content_profile import ContentProfiler
+
+
+class TraceWriter:
+    """Streams a JSON array of trace events to a file in buffered chunks"""
+
+    def __init__(self, path: str, buffer_size: int = 8192):
+        self.file = open(path, "w")
+        self.buffer = []
+        self.buffer_size = buffer_size
+        self.first = True
+        self.file.write("[\n")
+
+    def write(self, event: str):
+        self.buffer.append(event)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if not self.first:
+            self.file.write(",\n")
+        self.file.write(",\n".join(self.buffer))
+        self.buffer = []
+        self.first = False
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.write("\n]\n")
+        self.file.close()
+
+
+class _HookTracer(ContentProfiler):
+    """ContentProfiler that also writes each hook call as a complete span"""
+
+    def __init__(self, tracer):
+        super().__init__()
+        self.tracer = tracer
+
+    def _record(self, class_name: str, hook: str, start: float, elapsed: float, self_time: float):
+        super()._record(class_name, hook, start, elapsed, self_time)
+        tracer = self.tracer
+        tracer.writer.write(
+            f'{{"name":"{class_name}.{hook}","cat":"hook","ph":"X",'
+            f'"ts":{(start - tracer.start) * 1e6:.3f},"dur":{elapsed * 1e6:.3f},'
+            f'"pid":1,"tid":1}}')
+
+
+class CombatTracer:
+    trace_units = True
+
+    # Event type -> (instant name, kwarg naming the unit it happened to)
+    INSTANTS = {
+        "spell_cast": ("cast", "caster"),
+        "unit_death": ("death", "unit"),
+        "projectile_hit": ("projectile hit", "target"),
+    }
+
+    def __init__(self, path: str, hooks: bool = False, buffer_size: int = 8192):
+        self.path = path
+        self.writer = TraceWriter(path, buffer_size)
+        self.start = perf_counter()
+        self.hook_tracer = _HookTracer(self) if hooks else None
+        self.boards = []
+        self.instant_handlers = {
+            "spell_cast": self._on_spell_cast,
+            "unit_death": self._on_unit_death,
+            "projectile_hit": self._on_projectile_hit,
+        }
+        self._write_metadata()
+
+    def _write_metadata(self):
+        self.writer.write('{"name":"process_name","ph":"M","pid":1,"args":{"name":"BigBadAbler combat"}}')
+        self.writer.write('{"name":"thread_name","ph":"M","pid":1,"tid":1,"args":{"name":"combat"}}')
+
+    def _ts(self) -> str:
+        return f"{(perf_counter() - self.start) * 1e6:.3f}"
+
+    def _event(self, ph: str, name: str, cat: str, args: dict = None):
+        event = f'{{"name":{json.dumps(name)},"cat":"{cat}","ph":"{ph}","ts":{self._ts()},"pid":1,"tid":1'
+        if ph == "i":
+            event += ',"s":"t"'
+        if args:
+            event += ',"args":' + json.dumps(args)
+        self.writer.write(event + "}")
+
+    def attach(self, board):
+        self.boards.append(board)
+        for event_type, handler in self.instant_handlers.items():
+            board.add_event_handler(event_type, handler)
+        if self.hook_tracer:
+            self.hook_tracer.enable()
+
+    def detach(self, board):
+        if board in self.boards:
+            self.boards.remove(board)
+        for event_type, handler in self.instant_handlers.items():
+            board.remove_event_handler(event_type, handler)
+        if self.hook_tracer and not self.boards:
+            self.hook_tracer.disable()
+
+    def _on_instant(self, event_type: str, kwargs: dict):
+        name, role = self.INSTANTS[event_type]
+        unit = kwargs.get(role)
+        args = {}
+        if unit is not None:
+            args["unit"] = getattr(unit, "name", str(unit))
+            args["team"] = getattr(unit, "team", None)
+        skill = kwargs.get("skill")
+        if skill is not None:
+            args["skill"] = skill.name
+        self._event("i", name, "instant", args)
+
+    def _on_spell_cast(self, **kwargs):
+        self._on_instant("spell_cast", kwargs)
+
+    def _on_unit_death(self, **kwargs):
+        self._on_instant("unit_death", kwargs)
+
+    def _on_projectile_hit(self, **kwargs):
+        self._on_instant("projectile_hit", kwargs)
+
+    # Probe interface
+
+    def begin_frame(self, frame: int, dt: float):
+        self._event("B", "frame", "frame", {"frame": frame, "dt": dt})
+
+    def end_frame(self):
+        self.writer.write(f'{{"ph":"E","ts":{self._ts()},"pid":1,"tid":1}}')
+
+    def begin(self, phase: str, detail=None):
+        if phase == "unit":
+            self._event("B", detail.name, "unit", {"team": detail.team, "x": detail.x, "y": detail.y,
+                                                   "state": detail.state.name})
+        elif phase == "events":
+            self._event("B", detail, "event")
+        else:
+            self._event("B", phase, "phase")
+
+    def end(self, phase: str, detail=None):
+        self.writer.write(f'{{"ph":"E","ts":{self._ts()},"pid":1,"tid":1}}')
+
+    def count(self, name: str):
+        pass
+
+    def close(self):
+        for board in list(self.boards):
+            board.remove_probe(self)
+        if self.hook_tracer:
+            self.hook_tracer.disable()
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -2,4 +2,6 @@
 
 # Frame rate and timing
 FPS = 60
-FRAME_TIME = 1.0 / FPS  # Duration of one frame in seconds
\ No newline at end of file
+FRAME_TIME = 1.0 / FPS  # Duration of one frame in seconds
+# Slack when comparing accumulated timers against their thresholds
+TIMER_EPSILON = 1e-6
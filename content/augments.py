@@ -3,10 +3,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from augment import Augment, UnitAugment, ItemAugment, PassiveAugment
+from functools import partial
 from content.items import create_item
-from unit import UnitType
+from unit import UnitType, DamageFlag
 from status_effect import StatModifierEffect
-import random
 
 
 # Shop Entry Types (not augments - these are shop slots for characters)
@@ -96,8 +96,7 @@ class HealthBoostAugment(PassiveAugment):
         """Apply HP boost to a single unit"""
         if unit.is_alive():
             # Check if unit already has this effect to avoid double-applying hp bonus
-            has_effect = any(e.name == "Vitality Surge" for e in unit.status_effects)
-            if has_effect:
+            if "Vitality Surge" in unit.status_effects:
                 return
 
             hp_bonus = int(unit.max_hp * 0.25)
@@ -213,6 +212,7 @@ class DefensiveAuraAugment(PassiveAugment):
 
 class RegenerationFieldAugment(PassiveAugment):
     """All allies passively heal over time"""
+    frame_timer = ("tick_timer", "tick_interval")
 
     def __init__(self):
         super().__init__(
@@ -267,6 +267,7 @@ class FireResistanceAugment(PassiveAugment):
 
 class DeathsChillAugment(PassiveAugment):
     """Enemy deaths deal ice damage to nearby enemies"""
+    event_subscriptions = (("death", None),)
 
     def __init__(self):
         super().__init__(
@@ -283,7 +284,6 @@ class DeathsChillAugment(PassiveAugment):
                 self.apply_chill(dying_unit)
 
     def apply_chill(self, dying_unit):
-        import random
         if not self.team or not self.team.board:
             return
 
@@ -293,13 +293,14 @@ class DeathsChillAugment(PassiveAugment):
         nearby_enemies = [e for e in nearby_enemies if e != dying_unit and e.is_alive()]
 
         if nearby_enemies:
-            target = random.choice(nearby_enemies)
+            target = self.team.board.rng.choice(nearby_enemies)
             damage = dying_unit.max_hp * 0.10
-            target.take_damage(damage, "magical", None)
+            target.take_damage(damage, DamageFlag.ARCANE, None)
 
 
 class PurificationAugment(PassiveAugment):
     """Allies are cleansed of debuffs when healed"""
+    event_subscriptions = (("unit_healed", None),)
 
     def __init__(self):
         super().__init__(
@@ -309,14 +310,14 @@ class PurificationAugment(PassiveAugment):
         )
 
     def on_event(self, event_type: str, **kwargs):
-        if event_type == "heal" and "target" in kwargs:
-            target = kwargs["target"]
+        if event_type == "unit_healed" and "unit" in kwargs:
+            target = kwargs["unit"]
             if self.team and target.team == self.team.name:
                 self.cleanse_debuffs(target)
 
     def cleanse_debuffs(self, unit):
         debuffs_to_remove = []
-        for effect in unit.status_effects:
+        for effect in unit.status_effects.values():
             if hasattr(effect, 'is_debuff') and effect.is_debuff:
                 debuffs_to_remove.append(effect)
         for debuff in debuffs_to_remove:
@@ -325,6 +326,7 @@ class PurificationAugment(PassiveAugment):
 
 class SoulHarvestAugment(PassiveAugment):
     """Units heal when adjacent enemies die"""
+    event_subscriptions = (("death", None),)
 
     def __init__(self):
         super().__init__(
@@ -365,8 +367,7 @@ class FlatHealthAugment(PassiveAugment):
 
     def apply_to_unit(self, unit):
         if unit.is_alive():
-            has_effect = any(e.name == "Fortitude" for e in unit.status_effects)
-            if has_effect:
+            if "Fortitude" in unit.status_effects:
                 return
             effect = StatModifierEffect(
                 "Fortitude",
@@ -435,7 +436,7 @@ class WizardSynergyAugment(PassiveAugment):
         bonus = wizard_count
         for unit in self.team.units:
             if unit.is_alive():
-                unit.mp_regen += bonus
+                unit.add_stat_modifier(self, {"mp_regen": bonus})
 
 
 class FormationAugment(PassiveAugment):
@@ -481,6 +482,7 @@ class FormationAugment(PassiveAugment):
 
 class ScalingDamageAugment(PassiveAugment):
     """Each second, all units gain +1 attack damage"""
+    frame_timer = ("tick_timer", "tick_interval")
 
     def __init__(self):
         super().__init__(
@@ -500,11 +502,12 @@ class ScalingDamageAugment(PassiveAugment):
             self.tick_timer -= self.tick_interval
             for unit in self.team.units:
                 if unit.is_alive():
-                    unit.attack_damage += 1
+                    unit.add_stat_modifier(self, {"attack_damage": 1})
 
 
 class ScalingDefenseAugment(PassiveAugment):
     """Each second, all units gain +1 armor and +1 magic resist"""
+    frame_timer = ("tick_timer", "tick_interval")
 
     def __init__(self):
         super().__init__(
@@ -524,12 +527,12 @@ class ScalingDefenseAugment(PassiveAugment):
             self.tick_timer -= self.tick_interval
             for unit in self.team.units:
                 if unit.is_alive():
-                    unit.armor += 1
-                    unit.magic_resist += 1
+                    unit.add_stat_modifier(self, {"armor": 1, "magic_resist": 1})
 
 
 class GlobalRegenAugment(PassiveAugment):
     """All units heal for 1% of max HP per second"""
+    frame_timer = ("tick_timer", "tick_interval")
 
     def __init__(self):
         super().__init__(
@@ -555,6 +558,7 @@ class GlobalRegenAugment(PassiveAugment):
 
 class LowestHPHealAugment(PassiveAugment):
     """Lowest HP unit heals for 3% of max HP per second"""
+    frame_timer = ("tick_timer", "tick_interval")
 
     def __init__(self):
         super().__init__(
@@ -588,7 +592,7 @@ class FrenzyMaskAugment(ItemAugment):
             "Frenzy Mask",
             "Item: On attack +5% AS, +10 armor",
             45,
-            lambda: create_item("frenzy_mask")
+            partial(create_item, "frenzy_mask")
         )
 
 
@@ -598,7 +602,7 @@ class ThrumbladeAugment(ItemAugment):
             "Thrumblade",
             "Item: Every second +5 AD, +10% max HP",
             50,
-            lambda: create_item("thrumblade")
+            partial(create_item, "thrumblade")
         )
 
 
@@ -608,7 +612,7 @@ class HammerOfBamAugment(ItemAugment):
             "Hammer of Bam",
             "Item: Every 3rd attack deals 300% damage",
             55,
-            lambda: create_item("hammer_of_bam")
+            partial(create_item, "hammer_of_bam")
         )
 
 
@@ -618,7 +622,7 @@ class ManastaffAugment(ItemAugment):
             "Manastaff",
             "Item: +5 MP/s, on cast projectile deals mana cost",
             60,
-            lambda: create_item("manastaff")
+            partial(create_item, "manastaff")
         )
 
 
@@ -628,7 +632,7 @@ class BurnmailAugment(ItemAugment):
             "Burnmail",
             "Item: +50 armor +25 MR, burn nearby enemies",
             70,
-            lambda: create_item("burnmail")
+            partial(create_item, "burnmail")
         )
 
 
@@ -638,7 +642,7 @@ class ScorpionTailAugment(ItemAugment):
             "Scorpion Tail",
             "Item: +10 AD, attacks inflict poison",
             40,
-            lambda: create_item("scorpion_tail")
+            partial(create_item, "scorpion_tail")
         )
 
 
@@ -648,7 +652,7 @@ class PhylacteryAugment(ItemAugment):
             "Phylactery",
             "Item: At 50% HP cleanse and heal to full",
             80,
-            lambda: create_item("phylactery")
+            partial(create_item, "phylactery")
         )
 
 
@@ -658,7 +662,7 @@ class SundererAugment(ItemAugment):
             "Sunderer",
             "Item: +20 AD, attacks apply -5 armor",
             45,
-            lambda: create_item("sunderer")
+            partial(create_item, "sunderer")
         )
 
 
@@ -668,7 +672,7 @@ class BeastheartAugment(ItemAugment):
             "Beastheart",
             "Item: +500 HP, +25% max HP",
             65,
-            lambda: create_item("beastheart")
+            partial(create_item, "beastheart")
         )
 
 
@@ -678,7 +682,7 @@ class PhantomSaberAugment(ItemAugment):
             "Phantom Saber",
             "Item: +10 all stats, spawns 2 clones",
             90,
-            lambda: create_item("phantom_saber")
+            partial(create_item, "phantom_saber")
         )
 
 
@@ -688,7 +692,7 @@ class SnowGlobeAugment(ItemAugment):
             "Snow Globe",
             "Item: +20 int, magic damage applies chill",
             50,
-            lambda: create_item("snow_globe")
+            partial(create_item, "snow_globe")
         )
 
 
@@ -698,7 +702,7 @@ class EchostoneAugment(ItemAugment):
             "Echostone",
             "Item: Cast abilities twice at 50% int",
             75,
-            lambda: create_item("echostone")
+            partial(create_item, "echostone")
         )
 
 
@@ -708,7 +712,7 @@ class OminstoneAugment(ItemAugment):
             "Ominstone",
             "Item: +20 all combat stats",
             100,
-            lambda: create_item("ominstone")
+            partial(create_item, "ominstone")
         )
 
 
@@ -718,7 +722,7 @@ class RedWavebladeAugment(ItemAugment):
             "Red Waveblade",
             "Item: +30 AD, +30% attack speed",
             55,
-            lambda: create_item("red_waveblade")
+            partial(create_item, "red_waveblade")
         )
 
 
@@ -728,7 +732,7 @@ class BlueWavebladeAugment(ItemAugment):
             "Blue Waveblade",
             "Item: +30 int, +30% attack speed",
             55,
-            lambda: create_item("blue_waveblade")
+            partial(create_item, "blue_waveblade")
         )
 
 
@@ -738,7 +742,7 @@ class NegationHelmAugment(ItemAugment):
             "Negation Helm",
             "Item: +60 MR, +4 MP/s",
             60,
-            lambda: create_item("negation_helm")
+            partial(create_item, "negation_helm")
         )
 
 
@@ -748,7 +752,7 @@ class ArmorOfTimeAugment(ItemAugment):
             "Armor of Time",
             "Item: +10 armor/MR, +2 per second",
             65,
-            lambda: create_item("armor_of_time")
+            partial(create_item, "armor_of_time")
         )
 
 
@@ -760,7 +764,7 @@ class ThunderGlovesAugment(ItemAugment):
             "Thunder Gloves",
             "Item: +65 lightning damage on melee attacks",
             45,
-            lambda: create_item("thunder_gloves")
+            partial(create_item, "thunder_gloves")
         )
 
 
@@ -770,7 +774,7 @@ class LeapBootsAugment(ItemAugment):
             "Leap Boots",
             "Item: On kill, leap to lowest HP enemy",
             50,
-            lambda: create_item("leap_boots")
+            partial(create_item, "leap_boots")
         )
 
 
@@ -780,7 +784,7 @@ class ArmorShredderAugment(ItemAugment):
             "Armor Shredder",
             "Item: Attacks reduce target armor by 1",
             40,
-            lambda: create_item("armor_shredder")
+            partial(create_item, "armor_shredder")
         )
 
 
@@ -790,7 +794,7 @@ class CleavingBladeAugment(ItemAugment):
             "Cleaving Blade",
             "Item: Attacks hit 3 adjacent enemies",
             55,
-            lambda: create_item("cleaving_blade")
+            partial(create_item, "cleaving_blade")
         )
 
 
@@ -800,7 +804,7 @@ class FireStaffAugment(ItemAugment):
             "Fire Staff",
             "Item: Attacks deal +INT fire damage",
             45,
-            lambda: create_item("fire_staff")
+            partial(create_item, "fire_staff")
         )
 
 
@@ -810,7 +814,7 @@ class HealingBladeAugment(ItemAugment):
             "Healing Blade",
             "Item: On hit, heal nearest ally 50 HP",
             50,
-            lambda: create_item("healing_blade")
+            partial(create_item, "healing_blade")
         )
 
 
@@ -820,7 +824,7 @@ class CloakOfShadowsAugment(ItemAugment):
             "Cloak of Shadows",
             "Item: Gain 1 dodge every 2 seconds",
             55,
-            lambda: create_item("cloak_of_shadows")
+            partial(create_item, "cloak_of_shadows")
         )
 
 
@@ -830,7 +834,7 @@ class ThrowingKnivesAugment(ItemAugment):
             "Throwing Knives",
             "Item: Attacks hit another random enemy",
             40,
-            lambda: create_item("throwing_knives")
+            partial(create_item, "throwing_knives")
         )
 
 
@@ -840,7 +844,7 @@ class VenomousBladeAugment(ItemAugment):
             "Venomous Blade",
             "Item: Attacks apply poison",
             35,
-            lambda: create_item("venomous_blade")
+            partial(create_item, "venomous_blade")
         )
 
 
@@ -850,7 +854,7 @@ class CriticalEdgeAugment(ItemAugment):
             "Critical Edge",
             "Item: Every 4th attack deals 3x damage",
             50,
-            lambda: create_item("critical_edge")
+            partial(create_item, "critical_edge")
         )
 
 
@@ -860,7 +864,7 @@ class BasiliskHammerAugment(ItemAugment):
             "Basilisk Hammer",
             "Item: On attack deal damage = your armor + MR",
             55,
-            lambda: create_item("basilisk_hammer")
+            partial(create_item, "basilisk_hammer")
         )
 
 
@@ -870,7 +874,7 @@ class FrostyCloakAugment(ItemAugment):
             "Frosty Cloak",
             "Item: Enemies within 3 tiles are chilled",
             50,
-            lambda: create_item("frosty_cloak")
+            partial(create_item, "frosty_cloak")
         )
 
 
@@ -997,33 +1001,39 @@ def get_all_item_augment_types():
     ]
 
 
-def generate_augment_shop(team=None, count: int = 10) -> list:
+def generate_augment_shop(team=None, count: int = 10, rng=None) -> list:
     """Generate a 10-slot shop with the new slot rules.
 
     Slots 0-1: Always characters
     Slot 2: Always an item
     Slots 3-9: Random (15% char, 30% item, 45% augment, 10% rare unit)
+
+    Draws from rng, or from team.rng when rng is omitted.
     """
     from content.unit_registry import get_available_units
 
+    if rng is None:
+        if team is None:
+            raise ValueError("generate_augment_shop needs an rng or a team")
+        rng = team.rng
     shop = []
 
     # Helper to generate a character entry
     # Cost is calculated dynamically based on team's current unit count
     def gen_character():
-        unit_type = random.choice(get_available_units())
+        unit_type = rng.choice(get_available_units())
         return CharacterShopEntry(unit_type, team)
 
     # Helper to generate an item entry
     def gen_item():
         from content.items import get_all_items
         all_items = get_all_items()
-        return ItemShopEntry(random.choice(all_items))
+        return ItemShopEntry(rng.choice(all_items))
 
     # Helper to generate a passive augment
     def gen_augment():
         augment_types = get_all_passive_augment_types()
-        return random.choice(augment_types)()
+        return rng.choice(augment_types)()
 
     # Slots 0-1: Always characters
     for _ in range(2):
@@ -1034,7 +1044,7 @@ def generate_augment_shop(team=None, count: int = 10) -> list:
 
     # Slots 3-9: Random with weights (20% char, 30% item, 40% augment, 10% rare)
     for _ in range(7):
-        roll = random.random()
+        roll = rng.random()
         if roll < 0.20:  # 20% character
             shop.append(gen_character())
         elif roll < 0.50:  # 30% item
@@ -1059,7 +1069,7 @@ def generate_augment_shop(team=None, count: int = 10) -> list:
     return shop
 
 
-def generate_augment_shop_legacy(count: int = 5) -> list:
+def generate_augment_shop_legacy(rng, count: int = 5) -> list:
     """Legacy shop generation for enemy teams."""
     all_augment_types = get_all_augment_types()
 
@@ -1074,5 +1084,5 @@ def generate_augment_shop_legacy(count: int = 5) -> list:
             weights.append(2)  # Default
 
     # Select random augments
-    selected_types = random.choices(all_augment_types, weights=weights, k=count)
+    selected_types = rng.choices(all_augment_types, weights=weights, k=count)
     return [augment_type() for augment_type in selected_types]
\ No newline at end of file
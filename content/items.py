@@ -3,11 +3,21 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from status_effect import DamageOverTimeEffect, StatModifierEffect, StackType
-from projectile import Projectile
+from projectile import Projectile, deal_damage
+from damage import DamageFlag
 from constants import FRAME_TIME
+import functools
 import math
 
 class Item:
+    # (event_type, role) pairs this item's on_event handles; see event_bus.py
+    event_subscriptions = ()
+    # Delivery order among a unit's listeners: skills, items, then statuses
+    event_rank = 1
+    # (timer attribute, interval) when on_frame only counts a timer up to an interval
+    # between actions, so fast-forward can skip ahead; see fast_forward.py
+    frame_timer = None
+
     def __init__(self, name: str, description: str, cost: int):
         self.name = name
         self.description = description
@@ -17,28 +27,22 @@ class Item:
         
     def apply_to_unit(self, unit):
         self.unit = unit
-        for stat, value in self.stats.items():
-            if hasattr(unit, stat):
-                current_val = getattr(unit, stat)
-                if stat in ["max_hp"]:
-                    # Percentage increase for max_hp if value > 1
-                    if "percent_hp" in self.stats:
-                        setattr(unit, stat, int(current_val * (1 + self.stats["percent_hp"])))
-                    else:
-                        setattr(unit, stat, current_val + value)
-                    # Update current HP when max HP changes
-                    unit.hp = min(unit.hp + value, unit.max_hp)
-                else:
-                    setattr(unit, stat, current_val + value)
+        # The item's stats are one modifier layer keyed by the item; bonuses it
+        # gains during combat are added to the same layer
+        stats = self.stats
+        if "percent_hp" in stats:
+            # A percentage of max_hp as it stands when the item is equipped, rounded
+            # down, in place of the flat max_hp value; items and augments applied
+            # later are not scaled
+            current = unit.max_hp
+            stats = dict(stats, max_hp=int(current * (1 + stats["percent_hp"])) - current)
+        unit.add_stat_modifier(self, stats)
+        if "max_hp" in self.stats:
+            # Update current HP when max HP changes
+            unit.hp = min(unit.hp + self.stats["max_hp"], unit.max_hp)
                 
     def remove_from_unit(self, unit):
-        for stat, value in self.stats.items():
-            if hasattr(unit, stat):
-                if stat in ["max_hp"] and "percent_hp" in self.stats:
-                    current_val = getattr(unit, stat)
-                    setattr(unit, stat, int(current_val / (1 + self.stats["percent_hp"])))
-                else:
-                    setattr(unit, stat, getattr(unit, stat) - value)
+        unit.remove_stat_modifier(self)
         self.unit = None
                 
     def on_event(self, event_type: str, **kwargs):
@@ -49,6 +53,8 @@ class Item:
 
 
 class FrenzyMask(Item):
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Frenzy Mask", "On attack: +5% attack speed, +10 armor", 45)
         self.stats = {"armor": 10}
@@ -59,14 +65,12 @@ class FrenzyMask(Item):
         if event_type == "unit_attack" and kwargs.get("attacker") == self.unit:
             self.stacks += 1
             # Add 5 attack speed and track it
-            self.unit.attack_speed += 5
+            self.unit.add_stat_modifier(self, {"attack_speed": 5})
             self.applied_attack_speed += 5
     
     def remove_from_unit(self, unit):
-        # Remove all applied attack speed bonuses before calling parent method
-        if hasattr(self, 'applied_attack_speed'):
-            unit.attack_speed -= self.applied_attack_speed
-            self.applied_attack_speed = 0
+        # The parent method drops the applied bonuses with the rest of the layer
+        self.applied_attack_speed = 0
         self.stacks = 0
         super().remove_from_unit(unit)
     
@@ -78,6 +82,8 @@ class FrenzyMask(Item):
             
 
 class Thrumblade(Item):
+    frame_timer = ("timer", 1.0)
+
     def __init__(self):
         super().__init__("Thrumblade", "Every second: +5 attack damage, +10% max HP", 50)
         self.stats = {"max_hp": 0, "percent_hp": 0.1}
@@ -89,14 +95,12 @@ class Thrumblade(Item):
             self.timer += dt
             if self.timer >= 1.0:
                 self.timer -= 1.0
-                self.unit.attack_damage += 5
+                self.unit.add_stat_modifier(self, {"attack_damage": 5})
                 self.applied_attack_damage += 5
     
     def remove_from_unit(self, unit):
-        # Remove all applied attack damage bonuses before calling parent method
-        if hasattr(self, 'applied_attack_damage'):
-            unit.attack_damage -= self.applied_attack_damage
-            self.applied_attack_damage = 0
+        # The parent method drops the applied bonuses with the rest of the layer
+        self.applied_attack_damage = 0
         self.timer = 0
         super().remove_from_unit(unit)
     
@@ -108,6 +112,8 @@ class Thrumblade(Item):
 
 
 class HammerOfBam(Item):
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Hammer of Bam", "Every 3rd attack deals 300% damage, +20 damage", 55)
         self.stats = {"attack_damage": 20}
@@ -122,10 +128,12 @@ class HammerOfBam(Item):
                 target = kwargs.get("target")
                 damage = kwargs.get("damage", 0)
                 if target and target.is_alive():
-                    target.take_damage(damage * 2, "physical", self.unit)
+                    target.take_damage(damage * 2, DamageFlag.PHYSICAL, self.unit)
 
 
 class Manastaff(Item):
+    event_subscriptions = (("spell_cast", "caster"),)
+
     def __init__(self):
         super().__init__("Manastaff", "+5 MP/s, on cast: projectile deals spell's mana cost as magic damage", 60)
         self.stats = {"mp_regen": 5}
@@ -141,11 +149,13 @@ class Manastaff(Item):
                         nearest = min(enemies, key=lambda e: self.unit.board.get_distance(self.unit, e))
                         projectile = Projectile(self.unit, nearest, speed=15)
                         damage = skill.mana_cost
-                        projectile.on_hit_callback = lambda target: target.take_damage(damage, "magical", self.unit)
+                        projectile.on_hit_callback = functools.partial(deal_damage, damage, DamageFlag.ARCANE, self.unit)
                         self.unit.board.add_projectile(projectile)
 
 
 class Burnmail(Item):
+    frame_timer = ("burn_timer", 1.0)
+
     def __init__(self):
         super().__init__("Burnmail", "+50 armor, +25 MR, deal 15 magic damage/s to enemies within 2 tiles", 70)
         self.stats = {"armor": 50, "magic_resist": 25}
@@ -160,10 +170,12 @@ class Burnmail(Item):
                 enemies = self.unit.board.get_enemy_units(self.unit.team)
                 for enemy in enemies:
                     if self.unit.board.get_distance(self.unit, enemy) <= 2:
-                        enemy.take_damage(15, "magical", self.unit)
+                        enemy.take_damage(15, DamageFlag.ARCANE, self.unit)
 
 
 class ScorpionTail(Item):
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Scorpion Tail", "+10 damage, on attack: inflict poison (5 damage/s)", 40)
         self.stats = {"attack_damage": 10}
@@ -173,12 +185,14 @@ class ScorpionTail(Item):
             target = kwargs.get("target")
             if target and target.is_alive():
                 # Apply poison status effect
-                poison = DamageOverTimeEffect("Poison", None, 5.0, "magical")
+                poison = DamageOverTimeEffect("Poison", None, 5.0, DamageFlag.ARCANE)
                 poison.source = self.unit
                 target.add_status_effect(poison)
 
 
 class Phylactery(Item):
+    event_subscriptions = (("damage_taken", "unit"),)
+
     def __init__(self):
         super().__init__("Phylactery", "Once per battle: at 50% HP, cleanse debuffs and heal to full", 80)
         self.triggered = False
@@ -188,9 +202,7 @@ class Phylactery(Item):
             if not self.triggered and self.unit.hp <= self.unit.max_hp * 0.5:
                 self.triggered = True
                 # Cleanse all debuffs (properly remove to revert stat modifiers)
-                for effect in self.unit.status_effects[:]:
-                    effect.remove(self.unit)
-                self.unit.status_effects.clear()
+                self.unit.clear_status_effects()
                 # Heal to full
                 old_hp = self.unit.hp
                 self.unit.hp = self.unit.max_hp
@@ -203,6 +215,8 @@ class Phylactery(Item):
 
 
 class Sunderer(Item):
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Sunderer", "+20 damage, on hit: inflict sunder (-5 armor)", 45)
         self.stats = {"attack_damage": 20}
@@ -220,36 +234,29 @@ class Sunderer(Item):
 class Beastheart(Item):
     def __init__(self):
         super().__init__("Beastheart", "+500 max HP, +25% max HP", 65)
-        self.stats = {"max_hp": 500}
-        
-    def apply_to_unit(self, unit):
-        self.unit = unit
-        # First add flat HP
-        unit.max_hp += 500
-        unit.hp += 500
-        # Then multiply by 1.25
-        unit.max_hp = int(unit.max_hp * 1.25)
-        unit.hp = min(unit.hp, unit.max_hp)
-        
+        self.stats = {"max_hp": 500, "percent_hp": 0.25}
+
     def remove_from_unit(self, unit):
-        # Reverse the multiplication first
-        unit.max_hp = int(unit.max_hp / 1.25)
-        # Then remove flat HP
-        unit.max_hp -= 500
+        super().remove_from_unit(unit)
         unit.hp = min(unit.hp, unit.max_hp)
-        self.unit = None
 
 
 class PhantomSaber(Item):
+    event_subscriptions = (("battle_start", None),)
+
     def __init__(self):
         super().__init__("Phantom Saber", "+10 all combat stats, spawns 2 clones at battle start", 90)
         self.stats = {"attack_damage": 10, "armor": 10, "magic_resist": 10, "attack_speed": 10}
         self.clones_spawned = False
         
     def on_event(self, event_type: str, **kwargs):
-        # We'll spawn clones at the first frame of combat
         if not self.clones_spawned and self.unit and self.unit.board:
             self.spawn_clones()
+
+    def apply_to_unit(self, unit):
+        # Items are re-applied on round reset, so clones spawn again each battle
+        self.clones_spawned = False
+        super().apply_to_unit(unit)
             
     def spawn_clones(self):
         if self.clones_spawned or not self.unit or not self.unit.board:
@@ -295,6 +302,8 @@ class PhantomSaber(Item):
 
 
 class SnowGlobe(Item):
+    event_subscriptions = (("damage_taken", "source"),)
+
     def __init__(self):
         super().__init__("Snow Globe", "+20 int, +1 MP/s, on magic damage: apply chill (-3% AS/MS)", 50)
         self.stats = {"intelligence": 20, "mp_regen": 1}
@@ -314,6 +323,8 @@ class SnowGlobe(Item):
 
 
 class Echostone(Item):
+    event_subscriptions = (("spell_cast", "caster"),)
+
     def __init__(self):
         super().__init__("Echostone", "On casting an ability, cast it again at 50% int", 75)
         self.echo_pending = False
@@ -326,15 +337,14 @@ class Echostone(Item):
                 if skill and not skill.is_passive:
                     self.echo_pending = True
                     self.echoed_skill = skill
-                    # Store original int
-                    original_int = self.unit.intelligence
-                    # Reduce int by 50%
-                    self.unit.intelligence = int(original_int * 0.5)
+                    # Halve int for the echo with a layer of its own
+                    echo_key = (self, "echo")
+                    self.unit.set_stat_multiplier(echo_key, {"intelligence": 0.5})
                     # Cast again (will happen next frame)
                     if hasattr(skill, 'execute'):
                         skill.execute(self.unit)
                     # Restore int
-                    self.unit.intelligence = original_int
+                    self.unit.remove_stat_modifier(echo_key)
                     self.echo_pending = False
 
 
@@ -370,6 +380,8 @@ class NegationHelm(Item):
 
 
 class ArmorOfTime(Item):
+    frame_timer = ("timer", 1.0)
+
     def __init__(self):
         super().__init__("Armor of Time", "+10 armor/MR, +2 armor/MR per second", 65)
         self.stats = {"armor": 10, "magic_resist": 10}
@@ -382,19 +394,14 @@ class ArmorOfTime(Item):
             self.timer += dt
             if self.timer >= 1.0:
                 self.timer -= 1.0
-                self.unit.armor += 2
-                self.unit.magic_resist += 2
+                self.unit.add_stat_modifier(self, {"armor": 2, "magic_resist": 2})
                 self.applied_armor += 2
                 self.applied_magic_resist += 2
     
     def remove_from_unit(self, unit):
-        # Remove all applied bonuses before calling parent method
-        if hasattr(self, 'applied_armor'):
-            unit.armor -= self.applied_armor
-            self.applied_armor = 0
-        if hasattr(self, 'applied_magic_resist'):
-            unit.magic_resist -= self.applied_magic_resist
-            self.applied_magic_resist = 0
+        # The parent method drops the applied bonuses with the rest of the layer
+        self.applied_armor = 0
+        self.applied_magic_resist = 0
         self.timer = 0
         super().remove_from_unit(unit)
     
@@ -410,6 +417,8 @@ class ArmorOfTime(Item):
 
 class ThunderGloves(Item):
     """Melee attacks deal bonus lightning damage"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Thunder Gloves", "+65 lightning damage on melee attacks", 45)
         self.bonus_damage = 65
@@ -419,11 +428,13 @@ class ThunderGloves(Item):
             target = kwargs.get("target")
             # Only trigger for melee attacks
             if target and target.is_alive() and self.unit.attack_range <= 1:
-                target.take_damage(self.bonus_damage, "lightning", self.unit)
+                target.take_damage(self.bonus_damage, DamageFlag.LIGHTNING, self.unit)
 
 
 class LeapBoots(Item):
     """On kill, leap to lowest HP enemy within 3 tiles"""
+    event_subscriptions = (("unit_death", "killer"),)
+
     def __init__(self):
         super().__init__("Leap Boots", "On kill, leap to lowest HP enemy within 3 tiles", 50)
 
@@ -461,6 +472,8 @@ class LeapBoots(Item):
 
 class ArmorShredder(Item):
     """Attacks permanently reduce target armor"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Armor Shredder", "Attacks permanently reduce target armor by 1", 40)
 
@@ -468,11 +481,16 @@ class ArmorShredder(Item):
         if event_type == "unit_attack" and kwargs.get("attacker") == self.unit:
             target = kwargs.get("target")
             if target and target.is_alive():
-                target.armor = max(0, target.armor - 1)
+                # A layer on the target keyed by this item; cleared when the target resets
+                shred = min(1, target.armor)
+                if shred > 0:
+                    target.add_stat_modifier(self, {"armor": -shred})
 
 
 class CleavingBlade(Item):
     """Attacks hit adjacent enemies"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Cleaving Blade", "Attacks also hit up to 3 adjacent enemies", 55)
 
@@ -500,11 +518,13 @@ class CleavingBlade(Item):
             damage = self.unit.attack_damage
             if self.unit.strength > 0:
                 damage *= (1 + self.unit.strength / 100.0)
-            target.take_damage(damage, "physical", self.unit)
+            target.take_damage(damage, DamageFlag.PHYSICAL, self.unit)
 
 
 class FireStaff(Item):
     """Attacks deal bonus fire damage based on INT"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Fire Staff", "Attacks deal additional fire damage equal to Intelligence", 45)
 
@@ -514,11 +534,13 @@ class FireStaff(Item):
             if target and target.is_alive():
                 fire_damage = getattr(self.unit, 'intelligence', 0)
                 if fire_damage > 0:
-                    target.take_damage(fire_damage, "fire", self.unit)
+                    target.take_damage(fire_damage, DamageFlag.FIRE, self.unit)
 
 
 class HealingBlade(Item):
     """On hit, heal nearest ally"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Healing Blade", "On hit, heal nearest ally for 50 HP", 50)
         self.heal_amount = 50
@@ -527,7 +549,6 @@ class HealingBlade(Item):
         if event_type == "unit_attack" and kwargs.get("attacker") == self.unit:
             damage = kwargs.get("damage", 0)
             if damage > 0 and self.unit.board:
-                import random
                 allies = self.unit.board.get_allied_units(self.unit.team)
                 injured_allies = [a for a in allies if a.is_alive() and a.hp < a.max_hp]
 
@@ -536,12 +557,14 @@ class HealingBlade(Item):
                     nearest_dist = min(self.unit.board.get_distance(self.unit, a) for a in injured_allies)
                     nearest_allies = [a for a in injured_allies
                                      if self.unit.board.get_distance(self.unit, a) == nearest_dist]
-                    target_ally = random.choice(nearest_allies)
+                    target_ally = self.unit.board.rng.choice(nearest_allies)
                     target_ally.heal(self.heal_amount, self.unit)
 
 
 class CloakOfShadows(Item):
     """Gain dodge stacks over time"""
+    frame_timer = ("dodge_timer", "dodge_interval")
+
     def __init__(self):
         super().__init__("Cloak of Shadows", "Gain 1 dodge every 2 seconds", 55)
         self.dodge_timer = 0
@@ -556,11 +579,7 @@ class CloakOfShadows(Item):
             self.dodge_timer -= self.dodge_interval
 
             # Check if unit already has dodge effect
-            existing_dodge = None
-            for effect in self.unit.status_effects:
-                if effect.name == "Dodge":
-                    existing_dodge = effect
-                    break
+            existing_dodge = self.unit.status_effects.get("Dodge")
 
             if existing_dodge and hasattr(existing_dodge, 'stacks'):
                 existing_dodge.stacks += 1
@@ -574,6 +593,8 @@ class CloakOfShadows(Item):
 
 class ThrowingKnives(Item):
     """Attacks hit another random enemy"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Throwing Knives", "Attacks also hit another random enemy within 3 tiles", 40)
         self._throwing = False  # Reentrancy guard
@@ -586,7 +607,6 @@ class ThrowingKnives(Item):
             self.throw_knife(primary_target, kwargs.get("damage", 0))
 
     def throw_knife(self, primary_target, original_damage):
-        import random
         if not self.unit or not self.unit.board:
             return
 
@@ -601,16 +621,18 @@ class ThrowingKnives(Item):
                     potential_targets.append(enemy)
 
             if potential_targets:
-                knife_target = random.choice(potential_targets)
+                knife_target = self.unit.board.rng.choice(potential_targets)
                 # Use 75% of original attack damage, not current attack_damage stat
                 knife_damage = original_damage * 0.75 if original_damage > 0 else self.unit.attack_damage * 0.75
-                knife_target.take_damage(knife_damage, "physical", self.unit)
+                knife_target.take_damage(knife_damage, DamageFlag.PHYSICAL, self.unit)
         finally:
             self._throwing = False
 
 
 class VenomousBlade(Item):
     """Attacks apply poison"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Venomous Blade", "Attacks apply poison (15 damage/s for 10s)", 35)
 
@@ -626,6 +648,8 @@ class VenomousBlade(Item):
 
 class CriticalEdge(Item):
     """Every 4th attack deals triple damage"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Critical Edge", "Every 4th attack deals 3x damage", 50)
         self.attack_count = 0
@@ -639,11 +663,13 @@ class CriticalEdge(Item):
                 damage = kwargs.get("damage", 0)
                 if target and target.is_alive() and damage > 0:
                     # Deal 2x extra damage (for 3x total)
-                    target.take_damage(damage * 2, "physical", self.unit)
+                    target.take_damage(damage * 2, DamageFlag.PHYSICAL, self.unit)
 
 
 class BasiliskHammer(Item):
     """On attack, deal physical damage equal to wielder's armor + resist"""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Basilisk Hammer", "On attack: deal physical damage equal to your armor + magic resist", 55)
         self.stats = {"attack_damage": 15}
@@ -654,11 +680,13 @@ class BasiliskHammer(Item):
             if target and target.is_alive() and self.unit:
                 bonus_damage = self.unit.armor + self.unit.magic_resist
                 if bonus_damage > 0:
-                    target.take_damage(bonus_damage, "physical", self.unit)
+                    target.take_damage(bonus_damage, DamageFlag.PHYSICAL, self.unit)
 
 
 class FrostyCloak(Item):
     """Enemies within 3 tiles are chilled (reduced attack speed and move speed)"""
+    frame_timer = ("tick_timer", "tick_interval")
+
     def __init__(self):
         super().__init__("Frosty Cloak", "Enemies within 3 tiles are chilled (-15% attack speed, -20% move speed)", 50)
         self.stats = {"armor": 20, "magic_resist": 20}
@@ -683,8 +711,7 @@ class FrostyCloak(Item):
                 distance = self.unit.board.get_distance(self.unit, enemy)
                 if distance <= self.range:
                     # Check if already chilled by this item
-                    has_chill = any(e.name == "Frosty Chill" for e in enemy.status_effects)
-                    if not has_chill:
+                    if "Frosty Chill" not in enemy.status_effects:
                         chill = StatModifierEffect(
                             "Frosty Chill",
                             2.0,  # 2 second duration, reapplied every second
@@ -769,9 +796,8 @@ def get_all_items():
     ]
 
 
-def generate_item_shop(count: int = 10) -> list:
-    import random
+def generate_item_shop(rng, count: int = 10) -> list:
     all_items = get_all_items()
     # Allow duplicates since we have more items than shop slots
-    selected_items = random.choices(all_items, k=min(count, len(all_items)))
+    selected_items = rng.choices(all_items, k=min(count, len(all_items)))
     return [create_item(item_name) for item_name in selected_items]
\ No newline at end of file
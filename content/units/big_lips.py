@@ -1,4 +1,4 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 from status_effect import AbsorbShieldEffect
 
@@ -36,15 +36,14 @@ def create_big_lips() -> BigLips:
 
 class AllyShieldPassive(Skill):
     """Allies within 2 tiles start battle with a 25% Max HP shield."""
+    event_subscriptions = (("battle_start", None),)
+
     def __init__(self):
         super().__init__("Protective Aura", "Allies within 2 tiles start with 25% Max HP shield")
         self.is_passive = True
-        self.applied = False
 
     def on_event(self, event_type, **kwargs):
-        if not self.applied and self.owner and self.owner.board:
-            # Apply shields on first event (battle has started)
-            self.applied = True
+        if self.owner and self.owner.board:
             allies = self.owner.board.get_allied_units(self.owner.team)
             for ally in allies:
                 if ally != self.owner and ally.is_alive():
@@ -76,7 +75,7 @@ class TongueAttack(Skill):
         # Pull up to 3 farthest enemies
         damage = 50 * (1 + caster.strength / 100)
         for enemy in enemies[:3]:
-            enemy.take_damage(damage, [DamageType.PHYSICAL], caster)
+            enemy.take_damage(damage, DamageFlag.PHYSICAL, caster)
             self._pull_towards(caster, enemy, 3)
 
     def _pull_towards(self, caster, target, distance):
@@ -94,10 +93,3 @@ class TongueAttack(Skill):
                 caster.board.move_unit(target, new_x, new_y)
             else:
                 break
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
@@ -1,4 +1,4 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 from status_effect import StatModifierEffect
 
@@ -37,14 +37,14 @@ def create_blood_ogre() -> BloodOgre:
 
 class BattleCryPassive(Skill):
     """On battle start, adjacent allies get +25% attack damage."""
+    event_subscriptions = (("battle_start", None),)
+
     def __init__(self):
         super().__init__("Battle Cry", "Adjacent allies get +25% attack damage at battle start")
         self.is_passive = True
-        self.applied = False
 
     def on_event(self, event_type, **kwargs):
-        if not self.applied and self.owner and self.owner.board:
-            self.applied = True
+        if self.owner and self.owner.board:
             allies = self.owner.board.get_allied_units(self.owner.team)
             for ally in allies:
                 if ally != self.owner and ally.is_alive():
@@ -72,15 +72,8 @@ class Crushblow(Skill):
         if not target or not target.is_alive():
             return
         damage = caster.attack_damage * (1 + caster.strength / 100) * 5.0
-        target.take_damage(damage, [DamageType.PHYSICAL], caster)
+        target.take_damage(damage, DamageFlag.PHYSICAL, caster)
         stun = StatModifierEffect("Crushed", 2.0, {"attack_speed": -9999, "move_speed": -9999})
         stun.source = caster
         target.add_status_effect(stun)
         caster.board.make_text_floater("CRUSHBLOW!", (255, 50, 50), unit=target)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
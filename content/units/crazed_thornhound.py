@@ -1,6 +1,6 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
-from status_effect import StatusEffect, StackType
+from status_effect import StatModifierEffect, StackType
 
 
 class CrazedThornhound(Unit):
@@ -35,6 +35,8 @@ def create_crazed_thornhound() -> CrazedThornhound:
 
 class ThornReflect(Skill):
     """Passive: deal phys damage to units that attack it in melee."""
+    event_subscriptions = (("unit_attack", "target"),)
+
     def __init__(self):
         super().__init__("Thorns", "Deal 20 physical damage to melee attackers")
         self.is_passive = True
@@ -44,7 +46,7 @@ class ThornReflect(Skill):
         if event_type == "unit_attack" and kwargs.get("target") == self.owner:
             attacker = kwargs.get("attacker")
             if attacker and attacker.is_alive() and attacker.attack_range <= 1:
-                attacker.take_damage(self.reflect_damage, [DamageType.PHYSICAL], self.owner)
+                attacker.take_damage(self.reflect_damage, DamageFlag.PHYSICAL, self.owner)
 
 
 class Berserk(Skill):
@@ -64,28 +66,16 @@ class Berserk(Skill):
         effect.source = caster
         caster.add_status_effect(effect)
 
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
 
+class BerserkEffect(StatModifierEffect):
+    event_subscriptions = (("unit_attack", "attacker"),)
 
-class BerserkEffect(StatusEffect):
     def __init__(self):
-        super().__init__("Berserk", None, StackType.STACK_INTENSITY)
         self.attack_speed_bonus = 15
+        super().__init__("Berserk", None, {"attack_speed": self.attack_speed_bonus},
+                         StackType.STACK_INTENSITY)
         self.lifesteal_percent = 5
 
-    def apply(self, unit):
-        super().apply(unit)
-        unit.attack_speed += self.attack_speed_bonus
-
-    def remove(self, unit):
-        unit.attack_speed -= self.attack_speed_bonus * self.stacks
-        super().remove(unit)
-
     def on_event(self, event_type, **kwargs):
         if event_type == "unit_attack" and kwargs.get("attacker") == self.unit:
             damage = kwargs.get("damage", 0)
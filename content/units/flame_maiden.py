@@ -1,4 +1,4 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 from visual_effect import VisualEffectType
 
@@ -36,6 +36,8 @@ def create_flame_maiden() -> FlameMaiden:
 
 class FireChargePassive(Skill):
     """On enemy takes fire damage, gain a charge. At 25 charges, heal lowest HP ally."""
+    event_subscriptions = (("damage_taken", "source"),)
+
     def __init__(self):
         super().__init__("Ember Soul", "On fire damage dealt, gain charge. At 25, heal lowest ally")
         self.is_passive = True
@@ -91,12 +93,5 @@ class FlameBlast(Skill):
         # Hit all enemies within 2 tiles of target
         enemies_in_area = self.get_targets_in_area(caster, target.x, target.y, 2, "enemy")
         for enemy in enemies_in_area:
-            enemy.take_damage(damage, [DamageType.FIRE], caster)
+            enemy.take_damage(damage, DamageFlag.FIRE, caster)
         caster.board.add_visual_effect(VisualEffectType.FIRE, target.x, target.y)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
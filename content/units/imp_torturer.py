@@ -1,8 +1,9 @@
+import functools
 from unit import Unit, UnitType, DamageType, ElementalAffinity
 from skill import Skill
 from status_effect import StatModifierEffect
 from visual_effect import VisualEffectType
-import random
+from damage import DamageFlag
 
 
 class ImpTorturer(Unit):
@@ -39,6 +40,8 @@ def create_imp_torturer() -> ImpTorturer:
 
 class MicroStunPassive(Skill):
     """On damaging an enemy, stun for 0.1s."""
+    event_subscriptions = (("damage_taken", "source"),)
+
     def __init__(self):
         super().__init__("Torment", "On damaging an enemy, stun for 0.1s")
         self.is_passive = True
@@ -69,19 +72,12 @@ class Sparks(Skill):
         enemies = self.get_valid_targets(caster, "enemy", self.range)
         if not enemies:
             return
-        targets = random.sample(enemies, min(3, len(enemies)))
+        targets = caster.board.rng.sample(enemies, min(3, len(enemies)))
         damage = self.damage * (1 + caster.intelligence / 100)
         for target in targets:
-            from projectile import Projectile
+            from projectile import Projectile, deal_damage
             proj = Projectile(caster, target, speed=20.0)
             proj.damage = damage
             proj.damage_types = [DamageType.FIRE]
-            proj.on_hit_callback = lambda tgt, d=damage: tgt.take_damage(d, [DamageType.FIRE], caster)
+            proj.on_hit_callback = functools.partial(deal_damage, damage, DamageFlag.FIRE, caster)
             caster.board.add_projectile(proj)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
@@ -1,4 +1,4 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 
 
@@ -36,6 +36,8 @@ def create_mass_of_tentacles() -> MassOfTentacles:
 
 class DamageAuraPassive(Skill):
     """Arcane and Dark damage aura."""
+    frame_timer = ("timer", 1.0)
+
     def __init__(self):
         super().__init__("Eldritch Aura", "Deal arcane and dark damage to nearby enemies each second")
         self.is_passive = True
@@ -51,7 +53,7 @@ class DamageAuraPassive(Skill):
             enemies = self.owner.board.get_enemy_units(self.owner.team)
             for enemy in enemies:
                 if enemy.is_alive() and self.owner.board.get_distance(self.owner, enemy) <= 2:
-                    enemy.take_damage(self.dps, [DamageType.ARCANE, DamageType.DARK], self.owner)
+                    enemy.take_damage(self.dps, DamageFlag.ARCANE | DamageFlag.DARK, self.owner)
 
 
 class TentacleGrab(Skill):
@@ -92,7 +94,3 @@ class TentacleGrab(Skill):
                 caster.board.move_unit(target, new_x, new_y)
             else:
                 break
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
@@ -37,6 +37,8 @@ def create_oakenheart() -> Oakenheart:
 
 class ArmorAuraPassive(Skill):
     """Nearby allies gain 1 armor each second."""
+    frame_timer = ("timer", 1.0)
+
     def __init__(self):
         super().__init__("Bark Aura", "Nearby allies gain 1 armor per second")
         self.is_passive = True
@@ -79,7 +81,3 @@ class Entangle(Skill):
         stun.source = caster
         target.add_status_effect(stun)
         caster.board.make_text_floater("Entangled!", (100, 200, 50), unit=target)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
@@ -36,6 +36,8 @@ def create_pillar_of_bones() -> PillarOfBones:
 
 class DeathManaPassive(Skill):
     """On any unit death, gain 50 mana."""
+    event_subscriptions = (("death", None),)
+
     def __init__(self):
         super().__init__("Death Harvest", "On any unit death, gain 50 mana")
         self.is_passive = True
@@ -71,10 +73,3 @@ class RaiseSkeleton(Skill):
             skeleton.attack_damage_types = [DamageType.PHYSICAL]
             self.summon_minion(caster, skeleton, pos)
             caster.board.add_visual_effect(VisualEffectType.DARK, pos[0], pos[1])
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
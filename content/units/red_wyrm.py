@@ -1,7 +1,6 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 from visual_effect import VisualEffectType
-import random
 
 
 class RedWyrm(Unit):
@@ -39,6 +38,8 @@ def create_red_wyrm() -> RedWyrm:
 
 class DisplacePassive(Skill):
     """On attack, displace defender to random adjacent tile and move into that tile."""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Rampage", "On attack, push defender aside and advance")
         self.is_passive = True
@@ -53,7 +54,7 @@ class DisplacePassive(Skill):
                 return
             # Find random adjacent empty tile for target
             directions = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
-            random.shuffle(directions)
+            self.owner.board.rng.shuffle(directions)
             old_x, old_y = target.x, target.y
             for dx, dy in directions:
                 new_x, new_y = target.x + dx, target.y + dy
@@ -102,12 +103,5 @@ class FireLine(Skill):
                 break
             unit_at = caster.board.get_unit_at(check_x, check_y)
             if unit_at and unit_at.is_alive() and unit_at.team != caster.team:
-                unit_at.take_damage(damage, [DamageType.FIRE], caster)
+                unit_at.take_damage(damage, DamageFlag.FIRE, caster)
             caster.board.add_visual_effect(VisualEffectType.FIRE, check_x, check_y)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
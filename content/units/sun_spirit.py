@@ -1,4 +1,4 @@
-from unit import Unit, UnitType, DamageType, ElementalAffinity
+from unit import Unit, UnitType, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 from status_effect import StatusEffect, AbsorbShieldEffect
 from visual_effect import VisualEffectType
@@ -38,6 +38,8 @@ def create_sun_spirit() -> SunSpirit:
 
 class FireShieldEffect(StatusEffect):
     """Shield that deals fire damage to nearby enemies while active."""
+    damage_stages = ("post_damage",)
+
     def __init__(self, shield_amount, dps):
         super().__init__("Fire Shield", None)
         self.shield_remaining = shield_amount
@@ -56,21 +58,21 @@ class FireShieldEffect(StatusEffect):
         enemies = self.unit.board.get_enemy_units(self.unit.team)
         for enemy in enemies:
             if enemy.is_alive() and self.unit.board.get_distance(self.unit, enemy) <= 2:
-                enemy.take_damage(self.dps * self.tick_interval, [DamageType.FIRE], self.unit)
+                enemy.take_damage(self.dps * self.tick_interval, DamageFlag.FIRE, self.unit)
 
-    def on_event(self, event_type, **kwargs):
-        if event_type == "damage_taken" and kwargs.get("unit") == self.unit:
-            damage = kwargs.get("damage", 0)
-            self.shield_remaining -= damage
-            if self.shield_remaining <= 0:
-                self.shield_remaining = 0
-                # Remove the effect
-                if self.unit:
-                    self.unit.remove_status_effect(self)
+    def post_damage(self, hit):
+        self.shield_remaining -= hit.amount
+        if self.shield_remaining <= 0:
+            self.shield_remaining = 0
+            # Remove the effect
+            if self.unit:
+                self.unit.remove_status_effect(self)
 
 
 class SunSpiritPassive(Skill):
     """Nearby allies heal each second."""
+    frame_timer = ("heal_timer", 1.0)
+
     def __init__(self):
         super().__init__("Radiance", "Nearby allies heal 15 HP per second")
         self.is_passive = True
@@ -101,18 +103,11 @@ class FireShield(Skill):
 
     def should_cast(self, caster) -> bool:
         # Cast when no active fire shield
-        for effect in caster.status_effects:
-            if effect.name == "Fire Shield" and effect.shield_remaining > 0:
-                return False
-        return True
+        shield = caster.status_effects.get("Fire Shield")
+        return not (shield and shield.shield_remaining > 0)
 
     def execute(self, caster):
         shield = FireShieldEffect(200 * (1 + caster.intelligence / 100), 10 * (1 + caster.intelligence / 100))
         shield.source = caster
         caster.add_status_effect(shield)
         caster.board.add_visual_effect(VisualEffectType.HOLY, caster.x, caster.y)
-
-    def update(self, dt):
-        # Delegate to passive
-        self.passive.owner = self.owner
-        self.passive.update(dt)
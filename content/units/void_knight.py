@@ -1,7 +1,6 @@
-from unit import Unit, UnitType, UnitState, DamageType, ElementalAffinity
+from unit import Unit, UnitType, UnitState, DamageType, DamageFlag, ElementalAffinity
 from skill import Skill
 from status_effect import AbsorbShieldEffect
-import random
 
 
 class VoidKnight(Unit):
@@ -35,6 +34,8 @@ def create_void_knight() -> VoidKnight:
 
 class ArcaneShieldPassive(Skill):
     """On deal arcane damage, gain 20% of dealt damage as shield for 5s."""
+    event_subscriptions = (("damage_taken", "source"),)
+
     def __init__(self):
         super().__init__("Void Shield", "On deal arcane damage, gain 20% as shield for 5s")
         self.is_passive = True
@@ -65,9 +66,7 @@ class VoidStrike(Skill):
 
     def execute(self, caster):
         # Cleanse all debuffs
-        for effect in caster.status_effects[:]:
-            effect.remove(caster)
-        caster.status_effects.clear()
+        caster.clear_status_effects()
 
         # Drop aggro - clear all enemies targeting this unit
         enemies = caster.board.get_enemy_units(caster.team)
@@ -79,7 +78,7 @@ class VoidStrike(Skill):
         alive_enemies = [e for e in enemies if e.is_alive()]
         if not alive_enemies:
             return
-        target = random.choice(alive_enemies)
+        target = caster.board.rng.choice(alive_enemies)
 
         # Find adjacent position to target
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
@@ -92,12 +91,5 @@ class VoidStrike(Skill):
         # Attack the target
         caster.target = target
         damage = caster.attack_damage * (1 + caster.strength / 100) * 1.5
-        target.take_damage(damage, [DamageType.ARCANE], caster)
+        target.take_damage(damage, DamageFlag.ARCANE, caster)
         caster.board.make_text_floater("Void Strike!", (100, 150, 255), unit=target)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
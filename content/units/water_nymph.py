@@ -36,6 +36,8 @@ def create_water_nymph() -> WaterNymph:
 
 class SplashHealPassive(Skill):
     """Autoattacks heal adjacent allies."""
+    event_subscriptions = (("unit_attack", "attacker"),)
+
     def __init__(self):
         super().__init__("Splash", "Autoattacks heal adjacent allies for 20 HP")
         self.is_passive = True
@@ -73,10 +75,3 @@ class HealSpell(Skill):
             target = min(injured, key=lambda a: a.hp / a.max_hp)
             heal = self.heal_amount * (1 + caster.intelligence / 100)
             target.heal(heal, caster)
-
-    def update(self, dt):
-        self.passive.owner = self.owner
-        self.passive.update(dt)
-
-    def on_event(self, event_type, **kwargs):
-        self.passive.on_event(event_type, **kwargs)
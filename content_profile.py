@@ -0,0 +1,167 @@
+"""
+Cost attribution for content hooks, keyed by concrete class.
+
+While a ContentProfiler is enabled, the hook methods of every skill,
+item, status effect and augment class are replaced by timing wrappers.
+Each call is recorded under the class of the object it runs on, not the
+class that defines the method, so a handler inherited from Skill still
+shows up as PhantomSaber.on_event. The wrappers are removed on disable,
+so battles without a profiler pay nothing.
+
+Enable the profiler before building teams: the event bus binds on_event
+and units bind their per-frame hooks when a unit is added to the board
+(see frame_hooks.py).
+
+    profiler = ContentProfiler()
+    with profiler:
+        for seed in range(20):
+            simulate_combat(player_spec, enemy_spec, seed)
+    print(profiler.report())
+
+Self time excludes time spent in other wrapped hooks called from inside
+the hook (events raised from a handler, damage applied by a status);
+total time includes it. A super() call into the same hook on the same
+object counts as part of the outer call.
+
+Battles run in BattlePool workers are not profiled.
+"""
+
+import functools
+from time import perf_counter
+
+# Methods of content classes that the game calls during a battle
+HOOKS = ("update", "on_event", "on_tick", "on_frame", "execute", "should_cast",
+         "apply", "remove", "pre_mitigation", "absorb", "post_damage", "on_battle_start",
+         "apply_to_unit", "remove_from_unit")
+
+
+def content_classes():
+    """(category, class) for every skill, item, status effect and augment class"""
+    import content.unit_registry  # noqa: F401 - defines every unit's skill classes
+    import content.items  # noqa: F401
+    import content.augments  # noqa: F401
+    from skill import Skill
+    from content.items import Item
+    from status_effect import StatusEffect
+    from augment import Augment
+
+    classes = []
+    for category, root in (("skill", Skill), ("item", Item), ("status", StatusEffect),
+                           ("augment", Augment)):
+        pending = [root]
+        seen = set()
+        while pending:
+            cls = pending.pop()
+            if cls in seen:
+                continue
+            seen.add(cls)
+            # UnitStore view classes have no hooks of their own
+            if 'store_base_class' not in cls.__dict__:
+                classes.append((category, cls))
+            pending.extend(cls.__subclasses__())
+    return classes
+
+
+class HookStats:
+    def __init__(self, category: str, class_name: str, hook: str):
+        self.category = category
+        self.class_name = class_name
+        self.hook = hook
+        self.calls = 0
+        self.total = 0.0    # Seconds including nested hooks
+        self.self_time = 0.0
+
+
+class ContentProfiler:
+    def __init__(self):
+        self.stats = {}       # (class name, hook) -> HookStats
+        self.categories = {}  # class name -> category
+        self.originals = []   # (class, hook, function) replaced while enabled
+        self._stack = []      # [object, hook, child seconds] for each running hook
+
+    def enable(self):
+        if self.originals:
+            return
+        for category, cls in content_classes():
+            self.categories[cls.__name__] = category
+            for hook in HOOKS:
+                function = cls.__dict__.get(hook)
+                if callable(function):
+                    self.originals.append((cls, hook, function))
+                    setattr(cls, hook, self._wrap(function, hook))
+
+    def disable(self):
+        for cls, hook, function in reversed(self.originals):
+            setattr(cls, hook, function)
+        self.originals = []
+        self._stack = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _wrap(self, function, hook: str):
+        stack = self._stack
+
+        @functools.wraps(function)
+        def wrapper(obj, *args, **kwargs):
+            if stack and stack[-1][0] is obj and stack[-1][1] == hook:
+                return function(obj, *args, **kwargs)
+            frame = [obj, hook, 0.0]
+            stack.append(frame)
+            start = perf_counter()
+            try:
+                return function(obj, *args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                if stack:
+                    stack[-1][2] += elapsed
+                self._record(type(obj).__name__, hook, start, elapsed, elapsed - frame[2])
+
+        return wrapper
+
+    def _record(self, class_name: str, hook: str, start: float, elapsed: float, self_time: float):
+        key = (class_name, hook)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = HookStats(self.categories.get(class_name, "?"), class_name, hook)
+            self.stats[key] = stats
+        stats.calls += 1
+        stats.total += elapsed
+        stats.self_time += self_time
+
+    def ranked(self):
+        """HookStats sorted by self time, most expensive first"""
+        return sorted(self.stats.values(), key=lambda stats: stats.self_time, reverse=True)
+
+    def report(self, limit: int = 30) -> str:
+        ranked = self.ranked()
+        grand_total = sum(stats.self_time for stats in ranked) or 1.0
+        lines = [f"{'Category':<9} {'Hook':<40} {'calls':>9} {'self ms':>10} {'total ms':>10} "
+                 f"{'us/call':>9} {'share':>7}"]
+        for stats in ranked[:limit]:
+            name = f"{stats.class_name}.{stats.hook}"
+            lines.append(f"{stats.category:<9} {name:<40} {stats.calls:>9} "
+                         f"{stats.self_time * 1000:>10.2f} {stats.total * 1000:>10.2f} "
+                         f"{stats.self_time / stats.calls * 1e6:>9.1f} "
+                         f"{stats.self_time / grand_total:>7.1%}")
+        return "\n".join(lines)
+
+    def clear(self):
+        self.stats.clear()
+
+
+if __name__ == "__main__":
+    from benchmark import get_scenarios
+    from simulation import simulate_combat
+
+    profiler = ContentProfiler()
+    with profiler:
+        for player_spec, enemy_spec in get_scenarios().values():
+            for seed in range(3):
+                simulate_combat(player_spec, enemy_spec, seed)
+    print(profiler.report())
@@ -0,0 +1,111 @@
+"""
+Damage pipeline for Unit.take_damage.
+
+A hit runs through four stages on the target unit:
+
+    pre_mitigation  before armor and resists; may block the hit outright
+                    (DodgeEffect)
+    mitigation      armor / magic resist and elemental affinities, built in
+    absorb          shields eat into the mitigated amount (AbsorbShieldEffect)
+    post_damage     after HP is reduced (FireShieldEffect)
+
+Interceptors register on the unit they protect, so a hit only visits the
+target's own interceptors. A class declares the stages it handles and
+implements a method of the same name taking the DamageHit:
+
+    damage_stages = ("absorb",)
+
+    def absorb(self, hit):
+        hit.amount -= ...
+
+Status effects are registered while they are on a unit; anything else can
+use Unit.add_damage_interceptor / remove_damage_interceptor. Interceptor
+lists are tuples replaced on change, so an interceptor may remove itself
+while a hit is being processed.
+
+The damage_taken event is still raised afterwards for on-hit reactions
+elsewhere on the board.
+"""
+
+from enum import Enum, IntFlag
+
+
+class DamageType(Enum):
+    PHYSICAL = "physical"
+    FIRE = "fire"
+    ICE = "ice"
+    LIGHTNING = "lightning"
+    HOLY = "holy"
+    DARK = "dark"
+    ARCANE = "arcane"
+    POISON = "poison"
+
+
+class DamageFlag(IntFlag):
+    """A set of damage types as a bitmask, one bit per DamageType"""
+    NONE = 0
+    PHYSICAL = 1
+    FIRE = 2
+    ICE = 4
+    LIGHTNING = 8
+    HOLY = 16
+    DARK = 32
+    ARCANE = 64
+    POISON = 128
+
+
+TYPE_FLAGS = {damage_type: DamageFlag[damage_type.name] for damage_type in DamageType}
+
+# Legacy damage type strings; "magical" is arcane
+STRING_FLAGS = {damage_type.value: flag for damage_type, flag in TYPE_FLAGS.items()}
+STRING_FLAGS["magical"] = DamageFlag.ARCANE
+
+_flag_types = {}
+
+
+def to_damage_flags(damage_types) -> DamageFlag:
+    """DamageFlag for any spelling Unit.take_damage accepts: a DamageFlag, a DamageType,
+    a legacy string or a list of those. Unknown strings are dropped.
+
+    Convert once where damage is defined rather than on every hit.
+    """
+    if isinstance(damage_types, DamageFlag):
+        return damage_types
+    if damage_types is None:
+        return DamageFlag.NONE
+    if isinstance(damage_types, DamageType):
+        return TYPE_FLAGS[damage_types]
+    if isinstance(damage_types, str):
+        return STRING_FLAGS.get(damage_types, DamageFlag.NONE)
+    flags = DamageFlag.NONE
+    for damage_type in damage_types:
+        flags |= to_damage_flags(damage_type)
+    return flags
+
+
+def flag_types(flags: DamageFlag) -> tuple:
+    """The DamageTypes in flags, in DamageType order"""
+    types = _flag_types.get(flags)
+    if types is None:
+        types = tuple(damage_type for damage_type, flag in TYPE_FLAGS.items() if flags & flag)
+        _flag_types[flags] = types
+    return types
+
+
+PRE_MITIGATION = "pre_mitigation"
+ABSORB = "absorb"
+POST_DAMAGE = "post_damage"
+
+STAGES = (PRE_MITIGATION, ABSORB, POST_DAMAGE)
+
+
+class DamageHit:
+    def __init__(self, target, amount: float, damage_flags: DamageFlag, source, is_attack: bool = False):
+        self.target = target
+        self.raw_amount = amount       # As dealt, before any stage
+        self.amount = amount           # Current amount, updated by each stage
+        self.damage_flags = damage_flags
+        self.source = source
+        self.is_attack = is_attack     # A basic attack, melee or projectile
+        self.blocked = False           # Set in pre_mitigation to cancel the hit
+        self.absorbed = 0.0            # Total taken by absorb interceptors
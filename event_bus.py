@@ -0,0 +1,201 @@
+"""
+Subscription-indexed event dispatch for board events.
+
+Listeners subscribe to specific event types instead of every unit being
+polled on every event. A subscription can be scoped to a subject unit
+through a role: the name of the event kwarg that must be that unit, e.g.
+("unit_attack", "attacker") only fires for the owner's own attacks.
+
+Content classes declare what they listen to with a class attribute:
+
+    event_subscriptions = (("unit_attack", "attacker"), ("death", None))
+
+A role of None subscribes to every event of that type; an event type of
+"*" receives every event. A class that overrides on_event without
+declaring event_subscriptions keeps the old broadcast behaviour and is
+subscribed to "*".
+
+Handler lists are immutable tuples replaced on change, so listeners may
+subscribe or unsubscribe while an event is being dispatched; the change
+takes effect from the next event.
+
+Handlers run in the order the old broadcast loop called them, whichever
+list (scoped, unscoped or wildcard) they sit in: first plain handlers
+(Board.add_event_handler) in subscription order, then each unit's
+listeners in get_all_units order (player units, then enemy units, in
+placement order), a unit's skills before its items before its statuses.
+Listeners without an owner unit (team augments) run last. Every
+subscription carries a sort key for this, and publish merges the matching
+lists by it.
+"""
+
+from itertools import chain
+from operator import itemgetter
+
+WILDCARD = "*"
+
+# First element of a subscription's sort key
+HANDLER_ORDER = 0
+UNIT_ORDER = 1
+TEAM_ORDER = 2
+
+_entry_order = itemgetter(2)
+
+_subscription_cache = {}
+
+
+def get_event_subscriptions(cls):
+    """Resolve the (event_type, role) pairs a listener class handles.
+
+    Walks the MRO; the first class defining either event_subscriptions or
+    on_event decides. An on_event override without a declaration is
+    treated as a wildcard listener.
+    """
+    subscriptions = _subscription_cache.get(cls)
+    if subscriptions is None:
+        subscriptions = ()
+        for klass in cls.__mro__:
+            if 'event_subscriptions' in klass.__dict__:
+                subscriptions = tuple(klass.__dict__['event_subscriptions'])
+                break
+            if 'on_event' in klass.__dict__:
+                subscriptions = ((WILDCARD, None),)
+                break
+        _subscription_cache[cls] = subscriptions
+    return subscriptions
+
+
+def _insert(entries: tuple, entry) -> tuple:
+    """entries with entry added, keeping them sorted by their keys"""
+    key = entry[2]
+    index = len(entries)
+    while index and entries[index - 1][2] > key:
+        index -= 1
+    return entries[:index] + (entry,) + entries[index:]
+
+
+class EventBus:
+    def __init__(self):
+        # event_type -> tuple of (handler, owner, sort key), sorted by key
+        self.handlers = {}
+        # event_type -> tuple of (role, {subject: tuple of (handler, owner, sort key)})
+        self.scoped_handlers = {}
+        # id(listener) -> (listener, [tokens])
+        self.listeners = {}
+        self.sequence = 0
+
+    def __setstate__(self, state):
+        # listeners is keyed by id(), which changes when a snapshot is loaded
+        self.__dict__.update(state)
+        self.listeners = {id(record[0]): record for record in state['listeners'].values()}
+
+    def subscribe(self, event_type: str, handler, subject=None, role: str = None, owner=None,
+                  order: tuple = (HANDLER_ORDER,)):
+        """Register handler(event_type, **kwargs) and return a token for unsubscribe.
+
+        With a role, handler only fires when kwargs[role] is subject.
+        Handlers with an owner unit are skipped while that unit is dead.
+        order places the handler among the others (see the module docstring);
+        ties go by subscription order.
+        """
+        self.sequence += 1
+        entry = (handler, owner, order + (self.sequence,))
+        if role is None:
+            self.handlers[event_type] = _insert(self.handlers.get(event_type, ()), entry)
+        else:
+            roles = self.scoped_handlers.get(event_type, ())
+            for role_name, by_subject in roles:
+                if role_name == role:
+                    break
+            else:
+                by_subject = {}
+                self.scoped_handlers[event_type] = roles + ((role, by_subject),)
+            by_subject[subject] = _insert(by_subject.get(subject, ()), entry)
+        return (event_type, role, subject, entry)
+
+    def unsubscribe(self, token):
+        event_type, role, subject, entry = token
+        if role is None:
+            entries = self.handlers.get(event_type, ())
+            remaining = tuple(e for e in entries if e is not entry)
+            if remaining:
+                self.handlers[event_type] = remaining
+            else:
+                self.handlers.pop(event_type, None)
+            return
+        for role_name, by_subject in self.scoped_handlers.get(event_type, ()):
+            if role_name == role:
+                remaining = tuple(e for e in by_subject.get(subject, ()) if e is not entry)
+                if remaining:
+                    by_subject[subject] = remaining
+                else:
+                    by_subject.pop(subject, None)
+                return
+
+    def subscribe_listener(self, listener, owner=None):
+        """Subscribe listener.on_event for every event its class declares.
+
+        Scoped declarations use owner as the subject. Subscribing an already
+        subscribed listener does nothing.
+        """
+        if id(listener) in self.listeners:
+            return
+        subscriptions = get_event_subscriptions(type(listener))
+        if not subscriptions:
+            return
+        handler = listener.on_event
+        if owner is None:
+            order = (TEAM_ORDER,)
+        else:
+            order = (UNIT_ORDER,) + owner.event_order + (getattr(listener, 'event_rank', 0),)
+        tokens = []
+        for event_type, role in subscriptions:
+            if role is not None and owner is None:
+                continue
+            tokens.append(self.subscribe(event_type, handler,
+                                         subject=owner if role is not None else None,
+                                         role=role, owner=owner, order=order))
+        self.listeners[id(listener)] = (listener, tokens)
+
+    def unsubscribe_listener(self, listener):
+        record = self.listeners.pop(id(listener), None)
+        if record:
+            for token in record[1]:
+                self.unsubscribe(token)
+
+    def is_subscribed(self, listener) -> bool:
+        return id(listener) in self.listeners
+
+    def publish(self, event_type: str, kwargs: dict):
+        """Deliver an event to its scoped, unscoped and wildcard handlers, in key order"""
+        batches = []
+        roles = self.scoped_handlers.get(event_type)
+        if roles:
+            for role, by_subject in roles:
+                subject = kwargs.get(role)
+                if subject is None:
+                    continue
+                entries = by_subject.get(subject)
+                if entries:
+                    batches.append(entries)
+        entries = self.handlers.get(event_type)
+        if entries:
+            batches.append(entries)
+        entries = self.handlers.get(WILDCARD)
+        if entries:
+            batches.append(entries)
+
+        if not batches:
+            return
+        if len(batches) == 1:
+            entries = batches[0]
+        else:
+            entries = sorted(chain.from_iterable(batches), key=_entry_order)
+        for handler, owner, _ in entries:
+            if owner is None or owner.is_alive():
+                handler(event_type, **kwargs)
+
+    def clear(self):
+        self.handlers.clear()
+        self.scoped_handlers.clear()
+        self.listeners.clear()
@@ -0,0 +1,430 @@
+"""
+Fast-forward combat for headless simulation.
+
+Most frames of a battle only count timers down: attack cooldowns,
+move_timer, cast progress and the periodic ticks of statuses, clouds,
+passives, items and augments. Fast-forward asks every such object how
+long until it next does something, skips all frames before the earliest
+one in a single step, then runs that frame normally through
+Game.update_combat. Anything that reacts to the board (attacking,
+moving, casting, projectile arrival, deaths, events) therefore still
+happens inside an ordinary fixed-step frame.
+
+An object takes part by either
+
+- defining next_due() (seconds until its update next does more than
+  count down) and fast_forward(frames, dt), like CloudEffect and
+  Projectile, or
+- declaring frame_timer = (timer attribute, interval) when its
+  update/on_frame just adds dt to a timer and acts once it reaches the
+  interval, like SunSpiritPassive or Thrumblade. The interval is a
+  number or the name of an attribute holding it.
+
+A class that overrides update/on_frame without either is assumed to act
+every frame, which disables skipping while it is on the board.
+
+Status effects are already only woken when due by the board's
+StatusTimers (see status_timers.py), so skipping just moves its clock.
+The same goes for projectiles on boards with analytic arrivals (see
+projectile_arrivals.py).
+
+An idle unit whose attack is ready re-evaluates its spell, targets and
+movement every frame. If none of those would act now, it stays stalled
+until something else happens or its mana fills, since positions, targets
+and statuses only change in normal frames. This assumes should_cast does
+not start returning True just because HP regenerated. With a think_rate
+the unit re-evaluates only on its think ticks, and skipped frames keep
+its think clock on the same grid (see think_rate.py).
+
+Skipped frames still apply regen and timers one dt at a time, in plain
+arithmetic with none of the per-frame queries, so timers cross their
+thresholds on exactly the same frame as in the fixed-step engine. Skips
+also stop a frame short of each due time. validate() reports how closely
+fast-forwarded battles match.
+
+Looking for quiet frames costs a pass over the board, and on a crowded
+board some unit is due almost every frame (full_board in benchmark.py
+has one or two units acting in nine frames out of ten). run_combat
+therefore backs off: after SCAN_PATIENCE scans in a row that find
+nothing to skip, it steps 1, 2, 4... up to MAX_SCAN_BACKOFF frames
+normally before looking again, and goes back to scanning every frame as
+soon as a scan finds quiet frames. Stepping a frame normally is always
+exact, so this only gives up a few skips, and a battle with nothing to
+skip costs little more than fixed stepping.
+
+Speedups over fixed stepping depend on how many frames are quiet. Small
+battles like 1v1_melee step only one frame in twenty-five. The 8v8
+battles still step over a third of their frames, and full_board about
+all of them. Stepped frames are the busy ones, and quiet frames were
+already cheap in the fixed-step engine, so an order of magnitude is out
+of reach except in the smallest battles.
+"""
+
+import math
+from constants import FRAME_TIME, TIMER_EPSILON
+from unit import UnitState
+from skill import Skill
+
+NEVER = math.inf
+
+SCAN_PATIENCE = 4        # Empty scans in a row before run_combat starts backing off
+MAX_SCAN_BACKOFF = 32    # Most frames stepped between scans while backing off
+
+_hook_kinds = {}
+
+
+def _hook_kind(cls, hook: str) -> str:
+    """How a class's hook (update/on_frame) can be fast-forwarded.
+
+    Walks the MRO; the first class defining next_due, a frame_timer or
+    the hook itself decides: "custom", "timer", "noop" (the base class
+    no-op, which sits next to frame_timer = None) or "unknown".
+    """
+    key = (cls, hook)
+    kind = _hook_kinds.get(key)
+    if kind is None:
+        kind = "noop"
+        for klass in cls.__mro__:
+            attrs = klass.__dict__
+            if 'next_due' in attrs:
+                kind = "custom"
+                break
+            if attrs.get('frame_timer') is not None:
+                kind = "timer"
+                break
+            if hook in attrs:
+                kind = "noop" if 'frame_timer' in attrs else "unknown"
+                break
+        _hook_kinds[key] = kind
+    return kind
+
+
+def _timer_interval(obj, interval):
+    return getattr(obj, interval) if isinstance(interval, str) else interval
+
+
+def hook_next_due(obj, hook: str) -> float:
+    """Seconds until obj's hook next does more than count a timer"""
+    kind = _hook_kind(type(obj), hook)
+    if kind == "noop":
+        return NEVER
+    if kind == "custom":
+        return obj.next_due()
+    if kind == "timer":
+        attr, interval = obj.frame_timer
+        return _timer_interval(obj, interval) - getattr(obj, attr)
+    return 0.0
+
+
+def hook_fast_forward(obj, hook: str, frames: int, dt: float):
+    kind = _hook_kind(type(obj), hook)
+    if kind == "custom":
+        obj.fast_forward(frames, dt)
+    elif kind == "timer":
+        attr = obj.frame_timer[0]
+        timer = getattr(obj, attr)
+        for _ in range(frames):
+            timer += dt
+        setattr(obj, attr, timer)
+
+
+def _mana_due(unit) -> float:
+    """Seconds of mp_regen until unit's spell has its mana"""
+    spell = unit.spell
+    if spell and spell.current_mana < spell.mana_cost and unit.mp_regen > 0:
+        return (spell.mana_cost - spell.current_mana) / unit.mp_regen
+    return NEVER
+
+
+def _ready_unit_due(unit) -> float:
+    """Seconds until an idle unit with its attack ready acts (mirrors Unit.update)"""
+    due = NEVER
+    spell = unit.spell
+    if spell and not spell.is_passive:
+        if spell.current_mana < spell.mana_cost:
+            due = _mana_due(unit)
+        elif spell.should_cast(unit):
+            return 0.0
+
+    if unit.target and unit.target.is_alive() and unit.can_attack(unit.target):
+        return 0.0
+    enemy_in_range, nearest_enemy = unit.acquire_targets()
+    if enemy_in_range:
+        return 0.0
+    if not unit.immobile and nearest_enemy and unit.board.get_next_step(unit, nearest_enemy):
+        return 0.0
+    return due
+
+
+def _accumulate(value, step, cap, frames):
+    """value = min(value + step, cap) applied frames times, with the same rounding"""
+    if step < 0:
+        for _ in range(frames):
+            value = min(value + step, cap)
+        return value
+    for _ in range(frames):
+        value += step
+        if value >= cap:
+            return cap
+    return value
+
+
+def unit_next_due(unit) -> float:
+    """Seconds until Unit.update next does more than count down"""
+    if not unit.is_alive():
+        return unit.death_timer if unit.death_timer > 0 else NEVER
+
+    state = unit.state
+    if state == UnitState.IDLE or state == UnitState.ATTACKING:
+        # ATTACKING only lasts until the next frame, which then idles on the cooldown
+        if unit.attack_timer > 0:
+            due = unit.attack_timer
+        elif state == UnitState.IDLE:
+            due = _ready_unit_due(unit)
+            target = unit.target
+            if unit.board.think_interval and not (target and target.is_alive() and unit.can_attack(target)):
+                # Anything but attacking its target waits for a think tick
+                due = max(due, unit.think_timer - TIMER_EPSILON)
+        else:
+            return 0.0
+    elif state == UnitState.CASTING:
+        due = unit.cast_time - unit.cast_timer
+    elif state == UnitState.WALKING:
+        due = unit.move_timer
+    else:
+        return 0.0
+
+    for skill in unit.iter_skills():
+        due = min(due, hook_next_due(skill, 'update'))
+    for item in unit.items:
+        due = min(due, hook_next_due(item, 'on_frame'))
+    return due
+
+
+def fast_forward_unit(unit, frames: int, dt: float):
+    """Apply frames quiet frames of Unit.update to unit"""
+    if not unit.is_alive():
+        death_timer = unit.death_timer
+        if death_timer > 0:
+            for _ in range(frames):
+                death_timer -= dt
+            unit.death_timer = death_timer
+        return
+
+    unit.hp = _accumulate(unit.hp, unit.hp_regen * dt, unit.max_hp, frames)
+
+    spell = unit.spell
+    if spell and unit.state != UnitState.CASTING:
+        mana_step = unit.mp_regen * dt
+        if type(spell).add_mana is Skill.add_mana:
+            if spell.current_mana < spell.mana_cost:
+                spell.current_mana = _accumulate(spell.current_mana, mana_step, spell.mana_cost, frames)
+        else:
+            for _ in range(frames):
+                spell.add_mana(mana_step)
+
+    attack_timer = unit.attack_timer
+    for _ in range(frames):
+        if attack_timer <= 0:
+            break
+        attack_timer -= dt
+    unit.attack_timer = attack_timer
+
+    think_interval = unit.board.think_interval
+    if think_interval:
+        think_timer = unit.think_timer
+        for _ in range(frames):
+            think_timer -= dt
+            while think_timer <= TIMER_EPSILON:
+                think_timer += think_interval
+        unit.think_timer = think_timer
+
+    for skill in unit.iter_skills():
+        hook_fast_forward(skill, 'update', frames, dt)
+    for item in unit.items:
+        hook_fast_forward(item, 'on_frame', frames, dt)
+
+    if unit.state == UnitState.ATTACKING:
+        unit.state = UnitState.IDLE
+    elif unit.state == UnitState.CASTING:
+        cast_timer = unit.cast_timer
+        for _ in range(frames):
+            cast_timer += dt
+        unit.cast_timer = cast_timer
+    elif unit.state == UnitState.WALKING:
+        move_timer = unit.move_timer
+        for _ in range(frames):
+            move_timer -= dt
+        unit.move_timer = move_timer
+
+
+def quiet_frames(game, dt: float = FRAME_TIME) -> int:
+    """Number of upcoming frames in which nothing but timers would change"""
+    board = game.board
+    horizon = dt
+
+    # Units first: they are the most likely to be due now
+    due = NEVER
+    for unit in board.get_all_units():
+        due = min(due, unit_next_due(unit))
+        if due < horizon:
+            return 0
+    due = min(due, game.max_combat_time - game.combat_time, board.status_timers.next_due())
+    if board.projectile_arrivals:
+        due = min(due, board.projectile_arrivals.next_due())
+    else:
+        for projectile in board.projectiles:
+            due = min(due, hook_next_due(projectile, 'update'))
+            if due < horizon:
+                return 0
+    for cloud in board.cloud_effects:
+        due = min(due, hook_next_due(cloud, 'update'))
+        if due < horizon:
+            return 0
+    for team in (game.player_team, game.enemy_team):
+        for augment in team.passive_augments:
+            due = min(due, hook_next_due(augment, 'on_frame'))
+            if due < horizon:
+                return 0
+    # Skip to the frame before the earliest one that may be due. The margin
+    # covers due times that land on a frame boundary up to rounding.
+    return math.ceil(due / dt - 1e-6) - 1
+
+
+def skip_frames(game, frames: int, dt: float = FRAME_TIME):
+    """Advance the whole battle by frames quiet frames"""
+    board = game.board
+    for _ in range(frames):
+        game.combat_time += dt
+    game.combat_frame += frames
+    board.status_timers.skip(frames, dt)
+    if board.projectile_arrivals:
+        board.projectile_arrivals.skip(frames, dt)
+    else:
+        for projectile in board.projectiles:
+            hook_fast_forward(projectile, 'update', frames, dt)
+    for cloud in board.cloud_effects:
+        hook_fast_forward(cloud, 'update', frames, dt)
+    for unit in board.get_all_units():
+        fast_forward_unit(unit, frames, dt)
+    for team in (game.player_team, game.enemy_team):
+        for augment in team.passive_augments:
+            hook_fast_forward(augment, 'on_frame', frames, dt)
+
+
+def run_combat(game, dt: float = FRAME_TIME):
+    """Run the current combat phase to the end, skipping quiet frames.
+
+    Returns the number of frames that were actually stepped.
+    """
+    from game import GamePhase
+
+    if not game.headless:
+        raise ValueError("Fast-forward requires a headless game")
+    stepped = 0
+    misses = 0   # Scans in a row that found nothing to skip
+    wait = 0     # Frames to step before the next scan
+    while game.phase == GamePhase.COMBAT:
+        if wait > 0:
+            wait -= 1
+        else:
+            frames = quiet_frames(game, dt)
+            if frames > 0:
+                skip_frames(game, frames, dt)
+                misses = 0
+            else:
+                misses += 1
+                if misses > SCAN_PATIENCE:
+                    wait = min(MAX_SCAN_BACKOFF, 1 << (misses - SCAN_PATIENCE - 1))
+        game.update_combat(dt)
+        stepped += 1
+    return stepped
+
+
+DEFAULT_MATCHUPS = [
+    (["blood_ogre", "sun_spirit", "red_wyrm"], ["void_knight", "flame_maiden", "oakenheart"]),
+    ([{"unit": "crazed_thornhound", "items": ["thrumblade"]}, "water_nymph", "imp_torturer"],
+     {"units": ["mass_of_tentacles", "big_lips", "pillar_of_bones"], "augments": ["GlobalRegenAugment"]}),
+    ([{"unit": "oakenheart", "items": ["burnmail", "armor_of_time"]}, "flame_maiden"],
+     ["red_wyrm", {"unit": "sun_spirit", "items": ["frosty_cloak"]}]),
+]
+
+
+def sample_runs(seeds=range(20), scenario_seeds=range(3)):
+    """(name, player spec, enemy spec, seeds) for the sample matchups and benchmark scenarios"""
+    from benchmark import get_scenarios
+
+    runs = [(f"matchup {index}", player_spec, enemy_spec, seeds)
+            for index, (player_spec, enemy_spec) in enumerate(DEFAULT_MATCHUPS)]
+    runs += [(name, player_spec, enemy_spec, scenario_seeds)
+             for name, (player_spec, enemy_spec) in get_scenarios().items()]
+    return runs
+
+
+def validate(matchups=None, seeds=range(20), scenario_seeds=range(3)):
+    """Compare fast-forward against the fixed-step engine on the same battles.
+
+    Without matchups, runs the sample matchups over seeds and the
+    benchmark.py scenarios over scenario_seeds. Returns a dict with winner
+    agreement, duration and HP differences, the overall wall-clock speedup
+    and the speedup of each matchup or scenario.
+    """
+    import time
+    from simulation import simulate_combat
+
+    if matchups is None:
+        runs = sample_runs(seeds, scenario_seeds)
+    else:
+        runs = [(f"matchup {index}", player_spec, enemy_spec, seeds)
+                for index, (player_spec, enemy_spec) in enumerate(matchups)]
+    report = {"battles": 0, "winner_matches": 0, "identical": 0, "max_duration_diff": 0.0,
+              "mean_duration_diff": 0.0, "max_survivor_hp_diff": 0.0,
+              "fixed_seconds": 0.0, "fast_seconds": 0.0, "speedups": {}, "mismatches": []}
+    for name, player_spec, enemy_spec, run_seeds in runs:
+        fixed_seconds = fast_seconds = 0.0
+        for seed in run_seeds:
+            start = time.perf_counter()
+            fixed = simulate_combat(player_spec, enemy_spec, seed)
+            middle = time.perf_counter()
+            fast = simulate_combat(player_spec, enemy_spec, seed, fast_forward=True)
+            fast_seconds += time.perf_counter() - middle
+            fixed_seconds += middle - start
+
+            report["battles"] += 1
+            if fixed.to_dict() == fast.to_dict():
+                report["identical"] += 1
+            duration_diff = abs(fixed.duration - fast.duration)
+            report["mean_duration_diff"] += duration_diff
+            report["max_duration_diff"] = max(report["max_duration_diff"], duration_diff)
+            if fixed.winner == fast.winner:
+                report["winner_matches"] += 1
+                fixed_hp = {(team, slot): hp for team, slot, _, hp in fixed.survivors}
+                for team, slot, _, hp in fast.survivors:
+                    if (team, slot) in fixed_hp:
+                        report["max_survivor_hp_diff"] = max(report["max_survivor_hp_diff"],
+                                                             abs(fixed_hp[(team, slot)] - hp))
+            else:
+                report["mismatches"].append((name, seed, fixed.winner, fast.winner))
+        report["fixed_seconds"] += fixed_seconds
+        report["fast_seconds"] += fast_seconds
+        report["speedups"][name] = fixed_seconds / max(fast_seconds, 1e-9)
+    report["mean_duration_diff"] /= max(1, report["battles"])
+    report["speedup"] = report["fixed_seconds"] / max(report["fast_seconds"], 1e-9)
+    return report
+
+
+if __name__ == "__main__":
+    report = validate()
+    print(f"Battles:               {report['battles']}")
+    print(f"Winner agreement:      {report['winner_matches']}/{report['battles']}")
+    print(f"Identical battles:     {report['identical']}/{report['battles']}")
+    print(f"Mean duration diff:    {report['mean_duration_diff']:.4f}s")
+    print(f"Max duration diff:     {report['max_duration_diff']:.4f}s")
+    print(f"Max survivor HP diff:  {report['max_survivor_hp_diff']:.2f}")
+    print(f"Fixed-step time:       {report['fixed_seconds']:.2f}s")
+    print(f"Fast-forward time:     {report['fast_seconds']:.2f}s")
+    print(f"Speedup:               {report['speedup']:.1f}x")
+    for name, speedup in report["speedups"].items():
+        print(f"  {name:<18} {speedup:.2f}x")
+    for name, seed, fixed_winner, fast_winner in report["mismatches"]:
+        print(f"  {name} seed {seed}: fixed {fixed_winner}, fast-forward {fast_winner}")
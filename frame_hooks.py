@@ -0,0 +1,37 @@
+"""
+Per-frame hook lists.
+
+Unit.update runs update on the unit's skills and on_frame on its items,
+and Team.update runs on_frame on the team's passive augments. Most of
+those are the base class no-ops (Skill.update, Item.on_frame) or absent.
+Units and teams instead keep a flat list of the bound hooks that do
+something and call only those each frame. The list is rebuilt when a
+unit is placed on a board or its spell or items change, and when a team
+gains an augment.
+
+A hook counts as a no-op when it resolves to the base implementation
+(Skill.update or Item.on_frame) or is not defined at all. Status effect
+ticks are already skipped this way by StatusTimers (see
+status_timers.py).
+"""
+
+from skill import Skill
+from content.items import Item
+
+_NOOP_HOOKS = (None, Skill.update, Item.on_frame)
+_active_hooks = {}
+
+
+def has_hook(cls, hook: str) -> bool:
+    """Whether cls defines hook as more than a base class no-op"""
+    key = (cls, hook)
+    active = _active_hooks.get(key)
+    if active is None:
+        active = getattr(cls, hook, None) not in _NOOP_HOOKS
+        _active_hooks[key] = active
+    return active
+
+
+def bound_hooks(objects, hook: str) -> list:
+    """Bound hook methods of the objects whose class overrides hook, in order"""
+    return [getattr(obj, hook) for obj in objects if has_hook(type(obj), hook)]
@@ -0,0 +1,164 @@
+"""
+Opt-in per-subsystem timing of combat frames.
+
+Boards carry a list of probes (board.probes). While it is empty the
+combat loop takes its normal path and pays one list check per frame.
+Once a probe is added, Game.update_combat and Board.update_combat report
+to every probe through this interface:
+
+    begin_frame(frame, dt)   start of a combat frame, before any state changes
+    end_frame()              end of that frame
+    begin(phase, detail=None) / end(phase, detail=None)
+                             around each subsystem of the frame
+    count(name)              once per counted occurrence
+
+and, if the probe defines them, attach(board) / detach(board) when it is
+added to or removed from a board.
+
+Phases are "projectiles", "clouds", "visual_effects", "text_floaters",
+"unit_store", "status_timers", "units" and "augments" (Team.update), each timed once per
+frame, and "events", timed around every outermost raise_event with the
+event type as detail. Events are raised from inside the other phases, so
+"events" time is also part of theirs. Probes with trace_units = True also
+get a "unit" span around each Unit.update, with the unit as detail. Counted names are "event:<event_type>", "damage" (each
+take_damage that lands), "path_search" (each find_path BFS) and
+"flow_field" (each flow field rebuild).
+
+FrameStats is the standard probe: it keeps the last window frames and
+reports rolling percentiles per phase, with a CSV dump of every frame:
+
+    stats = FrameStats()
+    game.board.add_probe(stats)
+    ...
+    print(stats.report())
+    stats.to_csv("frames.csv")
+"""
+
+import csv
+import math
+from collections import deque
+from time import perf_counter
+
+PHASES = ("projectiles", "clouds", "visual_effects", "text_floaters", "unit_store",
+          "status_timers", "units", "augments", "events")
+
+# Frame time budget at 60 fps
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class FrameRecord:
+    def __init__(self, frame: int, total: float, phases: dict, counts: dict):
+        self.frame = frame
+        self.total = total      # Wall time of the whole frame in seconds
+        self.phases = phases    # phase -> seconds
+        self.counts = counts    # name -> occurrences
+
+
+class FrameStats:
+    trace_units = False
+
+    def __init__(self, window: int = 600):
+        self.window = window
+        self.frames = deque(maxlen=window)
+        self._frame = None
+        self._frame_start = 0.0
+        self._phases = {}
+        self._counts = {}
+        self._starts = {}
+        self._depth = {}
+
+    def begin_frame(self, frame: int, dt: float):
+        self._frame = frame
+        self._phases = {}
+        self._counts = {}
+        self._frame_start = perf_counter()
+
+    def end_frame(self):
+        total = perf_counter() - self._frame_start
+        self.frames.append(FrameRecord(self._frame, total, self._phases, self._counts))
+
+    def begin(self, phase: str, detail=None):
+        # Only the outermost span of a phase is timed, so nested events are not counted twice
+        depth = self._depth.get(phase, 0)
+        if not depth:
+            self._starts[phase] = perf_counter()
+        self._depth[phase] = depth + 1
+
+    def end(self, phase: str, detail=None):
+        depth = self._depth[phase] - 1
+        self._depth[phase] = depth
+        if not depth:
+            self._phases[phase] = self._phases.get(phase, 0.0) + perf_counter() - self._starts[phase]
+
+    def count(self, name: str):
+        self._counts[name] = self._counts.get(name, 0) + 1
+
+    def phase_names(self):
+        """Known phases first, then any others seen in the window"""
+        names = [phase for phase in PHASES if any(phase in record.phases for record in self.frames)]
+        for record in self.frames:
+            for phase in record.phases:
+                if phase not in names:
+                    names.append(phase)
+        return names
+
+    def count_names(self):
+        return sorted({name for record in self.frames for name in record.counts})
+
+    def samples(self, name: str):
+        """Per-frame values of a phase ("total" for the whole frame) in ms, or of a counter"""
+        if name == "total":
+            return [record.total * 1000 for record in self.frames]
+        if any(name in record.counts for record in self.frames):
+            return [record.counts.get(name, 0) for record in self.frames]
+        return [record.phases.get(name, 0.0) * 1000 for record in self.frames]
+
+    def percentile(self, name: str, percent: float) -> float:
+        """Nearest-rank percentile of name over the window"""
+        values = sorted(self.samples(name))
+        if not values:
+            return 0.0
+        rank = max(0, min(len(values) - 1, math.ceil(percent / 100 * len(values)) - 1))
+        return values[rank]
+
+    def summary(self, percents=(50, 95, 99)) -> dict:
+        """name -> {"mean", "p50", ..., "max"} for the frame total, each phase and each counter"""
+        result = {}
+        for name in ["total"] + self.phase_names() + self.count_names():
+            values = self.samples(name)
+            if not values:
+                continue
+            row = {"mean": sum(values) / len(values)}
+            for percent in percents:
+                row[f"p{percent}"] = self.percentile(name, percent)
+            row["max"] = max(values)
+            result[name] = row
+        return result
+
+    def over_budget(self, budget_ms: float = FRAME_BUDGET_MS):
+        """Frames in the window whose total time exceeded budget_ms"""
+        return [record for record in self.frames if record.total * 1000 > budget_ms]
+
+    def report(self, percents=(50, 95, 99)) -> str:
+        summary = self.summary(percents)
+        columns = ["mean"] + [f"p{percent}" for percent in percents] + ["max"]
+        lines = [f"{len(self.frames)} frames (phase times in ms, counters per frame)",
+                 f"{'':<24}" + "".join(f"{column:>10}" for column in columns)]
+        for name, row in summary.items():
+            lines.append(f"{name:<24}" + "".join(f"{row[column]:>10.3f}" for column in columns))
+        return "\n".join(lines)
+
+    def to_csv(self, path: str):
+        """One row per frame in the window: frame, total and phase times in ms, then counters"""
+        phases = self.phase_names()
+        counters = self.count_names()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "total_ms"] + [f"{phase}_ms" for phase in phases] + counters)
+            for record in self.frames:
+                writer.writerow([record.frame, f"{record.total * 1000:.4f}"]
+                                + [f"{record.phases.get(phase, 0.0) * 1000:.4f}" for phase in phases]
+                                + [record.counts.get(name, 0) for name in counters])
+
+    def clear(self):
+        self.frames.clear()
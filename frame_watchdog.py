@@ -0,0 +1,200 @@
+"""
+Slow-frame capture for live sessions.
+
+SlowFrameWatchdog is a board probe (see frame_stats.py). Every
+checkpoint_interval combat frames it pickles the whole Game at the start
+of the frame: board, units, statuses, projectiles, clouds, teams and the
+RNG state, which lives in game.rng. It also records the dt of every
+frame since that checkpoint. When a frame takes longer than budget_ms it
+writes a capture directory with
+
+    snapshot.pkl   the last checkpoint plus the dts up to and including
+                   the slow frame
+    profile.prof   cProfile of the next profile_frames frames
+    profile.txt    the same profile as text, by cumulative time
+
+Only the newest keep captures are kept. The UI, probes and handlers added
+with Board.add_event_handler are not part of a snapshot.
+
+replay() loads a capture headless, steps the recorded frames and
+profiles the slow one, so a stutter can be reproduced offline:
+
+    python frame_watchdog.py slow_frames/20240101-120000_frame000412
+
+PyUI enables the watchdog when BIGBADABLER_WATCHDOG_MS is set (the
+budget in ms); captures go to BIGBADABLER_WATCHDOG_DIR, default
+"slow_frames". Checkpoints cost a pickle of the game (about 1 ms for
+8 units, 10 ms for a full 64-unit board), so this is a debugging aid,
+not something to leave on.
+"""
+
+import cProfile
+import io
+import os
+import pickle
+import pstats
+import shutil
+import time
+from time import perf_counter
+
+from frame_stats import FRAME_BUDGET_MS
+
+SNAPSHOT_VERSION = 1
+
+
+class SlowFrameWatchdog:
+    trace_units = False
+
+    def __init__(self, directory: str = "slow_frames", budget_ms: float = FRAME_BUDGET_MS,
+                 checkpoint_interval: int = 60, profile_frames: int = 10, keep: int = 5,
+                 cooldown_frames: int = 300):
+        self.directory = directory
+        self.budget_ms = budget_ms
+        self.checkpoint_interval = checkpoint_interval
+        self.profile_frames = profile_frames
+        self.keep = keep
+        self.cooldown_frames = cooldown_frames   # Frames after a capture before the next one
+        self.board = None
+        self.checkpoint = None       # (frame, pickled game) taken at the start of frame
+        self.frame_dts = []          # dt of every frame since the checkpoint
+        self.frame = 0
+        self.frame_start = 0.0
+        self.profiler = None
+        self.profile_remaining = 0
+        self.capture_path = None
+        self.quiet_until = 0
+        self.captures = []           # Capture directories written, oldest first
+
+    def attach(self, board):
+        self.board = board
+
+    def detach(self, board):
+        self._finish_profile()
+        self.board = None
+
+    def begin_frame(self, frame: int, dt: float):
+        if frame <= self.frame:
+            # A new combat started
+            self.quiet_until = 0
+        if (frame - 1) % self.checkpoint_interval == 0:
+            self.checkpoint = (frame, pickle.dumps(self.board.game, pickle.HIGHEST_PROTOCOL))
+            self.frame_dts = []
+        self.frame = frame
+        self.frame_dts.append(dt)
+        self.frame_start = perf_counter()
+
+    def end_frame(self):
+        frame_ms = (perf_counter() - self.frame_start) * 1000
+        if self.profiler:
+            self.profile_remaining -= 1
+            if self.profile_remaining <= 0:
+                self._finish_profile()
+            return
+        if frame_ms > self.budget_ms and self.frame >= self.quiet_until and self.checkpoint:
+            self._capture(frame_ms)
+
+    def begin(self, phase: str, detail=None):
+        pass
+
+    def end(self, phase: str, detail=None):
+        pass
+
+    def count(self, name: str):
+        pass
+
+    def _capture(self, frame_ms: float):
+        checkpoint_frame, game_bytes = self.checkpoint
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"{stamp}_frame{self.frame:06d}")
+        os.makedirs(path, exist_ok=True)
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "checkpoint_frame": checkpoint_frame,
+            "slow_frame": self.frame,
+            "frame_dts": list(self.frame_dts),
+            "frame_ms": frame_ms,
+            "budget_ms": self.budget_ms,
+            "game": game_bytes,
+        }
+        with open(os.path.join(path, "snapshot.pkl"), "wb") as f:
+            pickle.dump(snapshot, f, pickle.HIGHEST_PROTOCOL)
+
+        self.captures.append(path)
+        self._rotate()
+        self.capture_path = path
+        self.quiet_until = self.frame + self.cooldown_frames
+        if self.profile_frames > 0:
+            self.profiler = cProfile.Profile()
+            self.profile_remaining = self.profile_frames
+            self.profiler.enable()
+
+    def _finish_profile(self):
+        if not self.profiler:
+            return
+        self.profiler.disable()
+        if os.path.isdir(self.capture_path):
+            write_profile(self.profiler, self.capture_path)
+        self.profiler = None
+
+    def _rotate(self):
+        while len(self.captures) > self.keep:
+            shutil.rmtree(self.captures.pop(0), ignore_errors=True)
+
+
+def write_profile(profiler, path: str):
+    """Save profiler as profile.prof and a text summary as profile.txt in directory path"""
+    profiler.dump_stats(os.path.join(path, "profile.prof"))
+    text = io.StringIO()
+    pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(40)
+    with open(os.path.join(path, "profile.txt"), "w") as f:
+        f.write(text.getvalue())
+
+
+def load_snapshot(path: str):
+    """(game, snapshot dict) from a capture directory or snapshot.pkl, resumed headless"""
+    if os.path.isdir(path):
+        path = os.path.join(path, "snapshot.pkl")
+    with open(path, "rb") as f:
+        snapshot = pickle.load(f)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {snapshot.get('version')}")
+    game = pickle.loads(snapshot["game"])
+    game.headless = True
+    board = game.board
+    board.headless = True
+    board.visual_effects.clear()
+    board.text_floater_manager.clear()
+    return game, snapshot
+
+
+def replay(path: str, profile: bool = True):
+    """Step a capture from its checkpoint through the slow frame.
+
+    Returns (game, snapshot dict, frame times in ms, cProfile of the slow frame or None).
+    """
+    game, snapshot = load_snapshot(path)
+    frame_dts = snapshot["frame_dts"]
+    profiler = cProfile.Profile() if profile else None
+    times = []
+    for index, dt in enumerate(frame_dts):
+        slow = index == len(frame_dts) - 1
+        if slow and profiler:
+            profiler.enable()
+        start = perf_counter()
+        game.update_combat(dt)
+        times.append((perf_counter() - start) * 1000)
+        if slow and profiler:
+            profiler.disable()
+    return game, snapshot, times, profiler
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python frame_watchdog.py CAPTURE_DIR")
+        sys.exit(1)
+    game, snapshot, times, profiler = replay(sys.argv[1])
+    print(f"Replayed frames {snapshot['checkpoint_frame']}-{snapshot['slow_frame']} "
+          f"(live slow frame took {snapshot['frame_ms']:.1f} ms, replay {times[-1]:.1f} ms)")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
@@ -17,15 +17,22 @@ class GameMode(Enum):
     TOURNAMENT = "tournament"
 
 class Game:
-    def __init__(self, mode: GameMode = GameMode.ASYNC):
+    def __init__(self, mode: GameMode = GameMode.ASYNC, headless: bool = False, seed=None,
+                 vectorized: bool = False, think_rate: Optional[float] = None,
+                 analytic_projectiles: bool = False):
         self.mode = mode
+        self.headless = headless
+        # All gameplay randomness (shops, enemy teams, positioning, combat) draws from this
+        self.seed = seed
+        self.rng = random.Random(seed)
         self.round = 0
         self.player_lives = 5
         self.player_wins = 0
         self.gold = 0
         
         self.phase = GamePhase.SHOPPING
-        self.board = Board()
+        self.board = Board(headless=headless, rng=self.rng, vectorized=vectorized,
+                           think_rate=think_rate, analytic_projectiles=analytic_projectiles)
         self.board.game = self
         
         # Create player and enemy teams
@@ -85,7 +92,7 @@ class Game:
     
     def generate_augment_shop(self):
         from content.augments import generate_augment_shop
-        self.augment_shop = generate_augment_shop(self.player_team, 10)
+        self.augment_shop = generate_augment_shop(self.player_team, 10, rng=self.rng)
 
     def reroll_shop(self, cost: int = 20) -> bool:
         """Reroll the shop for a gold cost."""
@@ -216,6 +223,7 @@ class Game:
         # Trigger passive augments' battle start effects
         self.player_team.on_battle_start()
         self.enemy_team.on_battle_start()
+        self.board.raise_event("battle_start")
         
         # Enemy units are already positioned during shopping phase
         
@@ -230,6 +238,7 @@ class Game:
         self.combat_time = 0
         self.combat_frame = 0
         self.paused = True
+        self.board.raise_event("battle_start")
         
         # Enemy units are already positioned during shopping phase
         
@@ -284,8 +293,8 @@ class Game:
             """Get a random unused position from the given x columns."""
             attempts = 0
             while attempts < 100:
-                x = random.choice(x_options)
-                y = random.randint(0, 7)
+                x = self.rng.choice(x_options)
+                y = self.rng.randint(0, 7)
                 if (x, y) not in used_positions:
                     used_positions.add((x, y))
                     return (x, y)
@@ -309,12 +318,23 @@ class Game:
         # Return positions in original unit order
         return [unit_positions.get(id(unit), (6, 0)) for unit in units]
     
+    def __getstate__(self):
+        # Snapshots (see frame_watchdog.py) carry gameplay state only, not the UI
+        state = self.__dict__.copy()
+        state.pop('ui', None)
+        return state
+
     def update_combat(self, dt: float):
         if self.phase == GamePhase.COMBAT:
             # Don't update if paused
             if self.paused:
                 return
                 
+            probes = self.board.probes
+            if probes:
+                for probe in probes:
+                    probe.begin_frame(self.combat_frame + 1, dt)
+
             self.combat_time += dt
             self.combat_frame += 1
             
@@ -322,11 +342,21 @@ class Game:
             self.board.update_combat(dt)
 
             # Update team augments (for on_frame effects like Regeneration Field)
+            if probes:
+                for probe in probes:
+                    probe.begin("augments")
             self.player_team.update(dt)
             self.enemy_team.update(dt)
+            if probes:
+                for probe in reversed(probes):
+                    probe.end("augments")
 
             if self.check_combat_end() or self.combat_time >= self.max_combat_time:
                 self.start_post_combat()
+
+            if probes:
+                for probe in reversed(probes):
+                    probe.end_frame()
         elif self.phase == GamePhase.POST_COMBAT:
             # Continue updating visual effects and animations during post-combat
             self.board.update_projectiles(dt)  # Some projectiles might still be in flight
@@ -338,18 +368,16 @@ class Game:
                 self.end_combat()
     
     def check_combat_end(self) -> bool:
-        player_alive = any(unit.is_alive() for unit in self.board.player_units)
-        enemy_alive = any(unit.is_alive() for unit in self.board.enemy_units)
-        
-        return not player_alive or not enemy_alive
+        living = self.board.living_units
+        return not living["player"] or not living["enemy"]
     
     def start_post_combat(self):
         """Start the post-combat phase to show results"""
         self.phase = GamePhase.POST_COMBAT
         self.post_combat_timer = 0
         
-        player_alive = any(unit.is_alive() for unit in self.board.player_units)
-        enemy_alive = any(unit.is_alive() for unit in self.board.enemy_units)
+        player_alive = self.board.count_living("player") > 0
+        enemy_alive = self.board.count_living("enemy") > 0
         
         if player_alive and not enemy_alive:
             self.combat_result = "victory"
@@ -382,6 +410,8 @@ class Game:
         return create_unit(unit_type)
 
     def add_message(self, message: str):
+        if self.headless:
+            return
         self.message_log.append(message)
         if len(self.message_log) > 20:
             self.message_log.pop(0)
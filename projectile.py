@@ -2,6 +2,19 @@ import math
 from typing import Optional, Callable, Union
 from visual_effect import VisualEffectType
 
+
+# Module-level hit callbacks, bound with functools.partial so projectiles in flight can be pickled
+
+def deal_damage(damage: float, damage_types, source, target):
+    """on_hit_callback dealing a fixed amount of damage"""
+    return target.take_damage(damage, damage_types, source)
+
+
+def deal_projectile_damage(projectile, source, target):
+    """on_hit_callback for basic attack projectiles: the projectile's own damage on arrival"""
+    return target.take_damage(projectile.damage, projectile.damage_flags, source, is_attack=True)
+
+
 class Projectile:
     def __init__(self, source, target, speed: float = 10.0):
         """
@@ -70,19 +83,12 @@ class Projectile:
                     self.reached_target = True
                     return
         
-        # Determine destination based on projectile type
-        if self.target_x is not None and self.target_y is not None:
-            # Location-targeted projectile
-            dest_x = self.target_x
-            dest_y = self.target_y
-        elif self.target and self.target.is_alive():
-            # Unit-targeted projectile
-            dest_x = float(self.target.x)
-            dest_y = float(self.target.y)
-        else:
+        destination = self.get_destination()
+        if destination is None:
             # No valid target
             self.reached_target = True
             return
+        dest_x, dest_y = destination
             
         dx = dest_x - self.x
         dy = dest_y - self.y
@@ -108,6 +114,39 @@ class Projectile:
             self.x += (dx / distance) * move_distance
             self.y += (dy / distance) * move_distance
             
+    def get_destination(self):
+        """Point the projectile is flying towards, or None without a valid target"""
+        if self.target_x is not None and self.target_y is not None:
+            # Location-targeted projectile
+            return self.target_x, self.target_y
+        if self.target and self.target.is_alive():
+            # Unit-targeted projectile
+            return float(self.target.x), float(self.target.y)
+        return None
+
+    def next_due(self) -> float:
+        """Seconds of straight flight before the projectile can land (see fast_forward.py)"""
+        if self.reached_target:
+            return float('inf')
+        destination = self.get_destination()
+        if destination is None:
+            return 0.0
+        distance = math.hypot(destination[0] - self.x, destination[1] - self.y)
+        return max(0.0, (distance - 0.3) / self.speed)
+
+    def fast_forward(self, frames: int, dt: float):
+        """Apply frames updates of flight towards a stationary destination without arriving"""
+        if self.reached_target:
+            return
+        dest_x, dest_y = self.get_destination()
+        move_distance = self.speed * dt
+        for _ in range(frames):
+            dx = dest_x - self.x
+            dy = dest_y - self.y
+            distance = math.sqrt(dx * dx + dy * dy)
+            self.x += (dx / distance) * move_distance
+            self.y += (dy / distance) * move_distance
+
     def on_land(self, target):
         """Called when projectile hits a target unit"""
         if target in self.hit_units:
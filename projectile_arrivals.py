@@ -0,0 +1,249 @@
+"""
+Analytic projectile arrivals for headless simulation.
+
+A headless battle never draws projectiles, so their positions matter
+only when they land. With Board(analytic_projectiles=True) (also Game
+and simulate_combat), each projectile flies in straight segments. When a
+segment starts (at launch and after every decision), the board solves
+how long the flight to the destination takes and puts the projectile on
+a heap until the frame it lands. Between decisions its x and y are
+left at the start of the segment.
+
+A projectile is taken off the heap and decided again in a normal frame
+when
+
+- its flight is over: it is placed on its destination and runs
+  Projectile.update, which lands it (on_land and the on-hit callback);
+- its target unit moves or dies: it is placed where its flight has
+  reached and runs Projectile.update, which steers it towards the new
+  tile, retargets a homing projectile or drops it.
+
+Decisions due in a frame run in launch order, like the per-projectile
+loop. Anything that Projectile.update leaves in flight is solved again
+from where it ended up.
+
+Tolerance against the frame-stepped flight: a projectile lands on the
+same frame whenever its target stays put, except when the flight ends
+within rounding (TIMER_EPSILON seconds) of a frame boundary. It may
+then land one frame apart. After a target moves or dies, the projectile
+turns towards the new tile on the same frame as before. Its position
+along the segment is interpolated from elapsed time, not accumulated
+per frame, so it differs from the stepped position only by rounding. A
+target that dies while other projectiles are landing in the same frame
+has its remaining incoming projectiles decided next frame, instead of
+later in the same frame. For non-homing projectiles that only delays
+dropping them, which has no effect on the battle. validate() measures
+the drift on sample matchups, and `python projectile_arrivals.py`
+prints the report.
+"""
+
+import heapq
+import math
+
+from constants import TIMER_EPSILON
+from fast_forward import NEVER
+
+LANDING_DISTANCE = 0.3  # Matches Projectile.update
+
+
+class ProjectileArrivals:
+    def __init__(self, projectiles: list):
+        self.time = 0.0         # Seconds of combat stepped on this board
+        self.heap = []          # (landing time, sequence, projectile)
+        self.sequence = 0
+        self.launches = 0
+        # The board's projectile list, in launch order
+        self.projectiles = projectiles
+        # Target unit -> projectiles flying at it, re-decided when it moves or dies
+        self.incoming = {}
+        # (sequence, projectile) to decide in the next frame
+        self.pending = []
+
+    def add(self, projectile):
+        """Solve a projectile just appended to the projectile list"""
+        self.launches += 1
+        projectile.launch_order = self.launches
+        self.solve(projectile, self.time)
+
+    def solve(self, projectile, start: float):
+        """Start a straight segment at start and schedule its landing"""
+        self._untrack(projectile)
+        self.sequence += 1
+        projectile.arrival_sequence = self.sequence
+        projectile.flight_start = start
+        destination = projectile.get_destination()
+        if destination is None:
+            # Projectile.update drops it on its next frame
+            projectile.flight = None
+            self.pending.append((self.sequence, projectile))
+            return
+        dx = destination[0] - projectile.x
+        dy = destination[1] - projectile.y
+        distance = math.sqrt(dx * dx + dy * dy)
+        projectile.flight = (projectile.x, projectile.y, dx, dy, distance)
+        # Lands in the first frame that starts more than this long into the segment
+        landing = start + (distance - LANDING_DISTANCE) / projectile.speed
+        heapq.heappush(self.heap, (landing, self.sequence, projectile))
+        target = projectile.target
+        if target is not None and projectile.target_x is None:
+            self.incoming.setdefault(target, set()).add(projectile)
+            projectile.tracked_target = target
+
+    def _untrack(self, projectile):
+        target = getattr(projectile, 'tracked_target', None)
+        if target is not None:
+            incoming = self.incoming.get(target)
+            if incoming is not None:
+                incoming.discard(projectile)
+                if not incoming:
+                    del self.incoming[target]
+            projectile.tracked_target = None
+
+    def target_changed(self, unit):
+        """unit moved or died: decide its incoming projectiles next frame"""
+        incoming = self.incoming.pop(unit, None)
+        if not incoming:
+            return
+        for projectile in incoming:
+            projectile.tracked_target = None
+            self.pending.append((projectile.arrival_sequence, projectile))
+
+    def place(self, projectile, time: float, arrived: bool = False):
+        """Set projectile's x and y to where its current segment has reached at time"""
+        flight = projectile.flight
+        if flight is None:
+            return
+        start_x, start_y, dx, dy, distance = flight
+        travelled = (time - projectile.flight_start) * projectile.speed
+        if arrived or travelled >= distance:
+            projectile.x = start_x + dx
+            projectile.y = start_y + dy
+        elif travelled > 0:
+            projectile.x = start_x + dx / distance * travelled
+            projectile.y = start_y + dy / distance * travelled
+
+    def remove(self, projectile):
+        if getattr(projectile, 'arrival_sequence', None) is None:
+            return
+        self.place(projectile, self.time)
+        projectile.flight = None
+        projectile.arrival_sequence = None
+        self._untrack(projectile)
+        if projectile in self.projectiles:
+            self.projectiles.remove(projectile)
+
+    def advance(self, dt: float):
+        """Run this frame's landings and re-decisions, then step the clock"""
+        now = self.time
+        heap = self.heap
+        limit = now - TIMER_EPSILON
+        if not self.pending and not (heap and heap[0][0] < limit):
+            self.time = now + dt
+            return
+        due = {}
+        while heap and heap[0][0] < limit:
+            _, sequence, projectile = heapq.heappop(heap)
+            if projectile.arrival_sequence == sequence:
+                due[projectile] = True
+        pending, self.pending = self.pending, []
+        for sequence, projectile in pending:
+            if projectile.arrival_sequence == sequence:
+                due[projectile] = False   # Its target moved, so it has not arrived
+
+        # Projectiles launched by this frame's landings take their first step next frame
+        self.time = now + dt
+        for projectile in sorted(due, key=lambda projectile: projectile.launch_order):
+            if projectile.arrival_sequence is None:
+                continue
+            self.place(projectile, now, arrived=due[projectile])
+            projectile.flight = None
+            projectile.update(dt)
+            if projectile.reached_target:
+                self.remove(projectile)
+            else:
+                # Its next segment starts after this frame's step
+                self.solve(projectile, self.time)
+
+    def skip(self, frames: int, dt: float):
+        """Step the clock over frames in which nothing lands (see fast_forward.py)"""
+        time = self.time
+        for _ in range(frames):
+            time += dt
+        self.time = time
+
+    def next_due(self) -> float:
+        """Seconds of flight before the earliest projectile can land"""
+        if self.pending:
+            return 0.0
+        heap = self.heap
+        while heap and heap[0][2].arrival_sequence != heap[0][1]:
+            heapq.heappop(heap)
+        return max(0.0, heap[0][0] - self.time) if heap else NEVER
+
+    def clear(self):
+        for projectile in self.projectiles:
+            projectile.arrival_sequence = None
+            projectile.tracked_target = None
+        self.heap = []
+        self.pending = []
+        self.incoming = {}
+
+
+def validate(matchups=None, seeds=range(20)):
+    """Compare battles with analytic arrivals against frame-stepped flight on the same seeds.
+
+    Returns a dict with winner agreement, duration and survivor HP
+    differences and the wall-clock speedup.
+    """
+    import time
+    from simulation import simulate_combat
+    from fast_forward import DEFAULT_MATCHUPS
+
+    matchups = matchups or DEFAULT_MATCHUPS
+    report = {"battles": 0, "winner_matches": 0, "identical": 0,
+              "max_duration_diff": 0.0, "mean_duration_diff": 0.0, "mean_survivor_hp_diff": 0.0,
+              "stepped_seconds": 0.0, "analytic_seconds": 0.0, "mismatches": []}
+    hp_diffs = []
+    for index, (player_spec, enemy_spec) in enumerate(matchups):
+        for seed in seeds:
+            start = time.perf_counter()
+            stepped = simulate_combat(player_spec, enemy_spec, seed)
+            middle = time.perf_counter()
+            analytic = simulate_combat(player_spec, enemy_spec, seed, analytic_projectiles=True)
+            report["analytic_seconds"] += time.perf_counter() - middle
+            report["stepped_seconds"] += middle - start
+
+            report["battles"] += 1
+            duration_diff = abs(stepped.duration - analytic.duration)
+            report["mean_duration_diff"] += duration_diff
+            report["max_duration_diff"] = max(report["max_duration_diff"], duration_diff)
+            if (stepped.winner, stepped.duration, stepped.survivors) == \
+                    (analytic.winner, analytic.duration, analytic.survivors):
+                report["identical"] += 1
+            if stepped.winner == analytic.winner:
+                report["winner_matches"] += 1
+                stepped_hp = {(team, slot): hp for team, slot, _, hp in stepped.survivors}
+                for team, slot, _, hp in analytic.survivors:
+                    if (team, slot) in stepped_hp:
+                        hp_diffs.append(abs(stepped_hp[(team, slot)] - hp))
+            else:
+                report["mismatches"].append((index, seed, stepped.winner, analytic.winner))
+    report["mean_duration_diff"] /= max(1, report["battles"])
+    report["mean_survivor_hp_diff"] = sum(hp_diffs) / max(1, len(hp_diffs))
+    report["speedup"] = report["stepped_seconds"] / max(report["analytic_seconds"], 1e-9)
+    return report
+
+
+if __name__ == "__main__":
+    report = validate()
+    print(f"Battles:               {report['battles']}")
+    print(f"Winner agreement:      {report['winner_matches']}/{report['battles']}")
+    print(f"Identical battles:     {report['identical']}/{report['battles']}")
+    print(f"Mean duration diff:    {report['mean_duration_diff']:.4f}s")
+    print(f"Max duration diff:     {report['max_duration_diff']:.4f}s")
+    print(f"Mean survivor HP diff: {report['mean_survivor_hp_diff']:.2f}")
+    print(f"Stepped time:          {report['stepped_seconds']:.2f}s")
+    print(f"Analytic time:         {report['analytic_seconds']:.2f}s")
+    print(f"Speedup:               {report['speedup']:.2f}x")
+    for index, seed, stepped_winner, analytic_winner in report["mismatches"]:
+        print(f"  matchup {index} seed {seed}: stepped {stepped_winner}, analytic {analytic_winner}")
@@ -0,0 +1,226 @@
+"""
+Optional struct-of-arrays storage for projectiles in flight.
+
+Ranged autoattacks, Sparks and Throwing Knives keep a steady stream of
+projectiles in the air, and stepping each one through Projectile.update
+costs a square root and a handful of attribute lookups per frame. With
+a ProjectileStore (created by Board(vectorized=True) next to its
+UnitStore), every projectile keeps its position, speed and target in
+one row of NumPy columns, and all of them fly one frame in a single
+vectorized step.
+
+A unit target is kept as its UnitStore row plus that row's serial, so
+the step reads the target's tile and liveness straight from the unit
+columns. A location target keeps its fixed destination. Only rows that
+need a decision go back to Projectile.update in Python: those within
+landing distance (the on-hit callbacks), those whose target died or left
+the board (homing retargets) and those whose target has no row.
+
+Projectiles stay ordinary Projectile objects. Attaching one swaps its
+class for a cached subclass whose x and y read and write its row, as
+unit_store.py does for units. The board's projectiles list holds the
+projectiles in row order, and removal swaps the last row into the gap
+instead of shifting the list. Detaching copies x and y back and restores
+the original class.
+
+The arithmetic matches Projectile.update, so projectiles fly through
+the same positions as on the per-projectile path. Two things differ
+within a frame. Landings run in row order, which after a swap-removal
+is no longer launch order, so on-hit callbacks can fire in a different
+order. And the step reads target tiles and liveness before any landing,
+so a projectile whose target dies to an earlier landing in the same
+frame flies one more step and is dropped or retargeted a frame later.
+In benchmark.py this changes survivor HP in some projectile_storm
+battles and the winner of full_board seed 3.
+
+Requires NumPy; boards without a store never import it.
+"""
+
+LANDING_DISTANCE = 0.3  # Matches Projectile.update
+
+# target_row for projectiles without a unit row to follow
+LOCATION_TARGET = -1
+UNTRACKED_TARGET = -2
+
+COLUMNS = {
+    'x': 'f8',
+    'y': 'f8',
+    'speed': 'f8',
+    'dest_x': 'f8',          # Fixed destination of location-targeted projectiles
+    'dest_y': 'f8',
+    'target_row': 'i8',      # UnitStore row of the target unit, or one of the codes above
+    'target_serial': 'i8',   # UnitStore serial of that row when the target was set
+}
+
+_view_classes = {}
+
+
+def _column_property(column):
+    def getter(self):
+        return getattr(self.projectile_store, column).item(self.store_row)
+
+    def setter(self, value):
+        getattr(self.projectile_store, column)[self.store_row] = value
+
+    return property(getter, setter)
+
+
+def _reduce_view(self, protocol):
+    # View classes are made at runtime and can't be pickled by name; rebuild them on load
+    return (_new_view, (self.store_base_class,), self.__dict__)
+
+
+def _new_view(cls):
+    view = _view_class(cls)
+    return view.__new__(view)
+
+
+def _view_class(cls):
+    """Cached subclass of cls with x and y backed by the store"""
+    view = _view_classes.get(cls)
+    if view is None:
+        namespace = {name: _column_property(name) for name in ('x', 'y')}
+        namespace['store_base_class'] = cls
+        namespace['__reduce_ex__'] = _reduce_view
+        namespace['__module__'] = cls.__module__
+        namespace['__qualname__'] = cls.__qualname__
+        view = type(cls.__name__, (cls,), namespace)
+        _view_classes[cls] = view
+    return view
+
+
+class ProjectileStore:
+    def __init__(self, projectiles: list, unit_store=None, capacity: int = 64):
+        import numpy as np
+        self.np = np
+        self.capacity = capacity
+        # The board's projectile list; projectiles[row] is the projectile in row
+        self.projectiles = projectiles
+        self.unit_store = unit_store
+        for column, dtype in COLUMNS.items():
+            setattr(self, column, np.zeros(capacity, dtype=dtype))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['np']
+        return state
+
+    def __setstate__(self, state):
+        import numpy as np
+        self.__dict__.update(state)
+        self.np = np
+
+    def _grow(self):
+        np = self.np
+        self.capacity *= 2
+        for column in COLUMNS:
+            old = getattr(self, column)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+
+    def attach(self, projectile):
+        """Give projectile, already appended to the projectile list, the last row"""
+        row = len(self.projectiles) - 1
+        while row >= self.capacity:
+            self._grow()
+        self.x[row] = projectile.__dict__.pop('x')
+        self.y[row] = projectile.__dict__.pop('y')
+        self.speed[row] = projectile.speed
+        projectile.projectile_store = self
+        projectile.store_row = row
+        projectile.__class__ = _view_class(type(projectile))
+        self.sync_target(projectile)
+
+    def sync_target(self, projectile):
+        """Refresh the target columns after projectile's target may have changed"""
+        row = projectile.store_row
+        target = projectile.target
+        if projectile.target_x is not None and projectile.target_y is not None:
+            self.target_row[row] = LOCATION_TARGET
+            self.dest_x[row] = projectile.target_x
+            self.dest_y[row] = projectile.target_y
+        elif (target is not None and self.unit_store is not None
+              and getattr(target, 'unit_store', None) is self.unit_store):
+            self.target_row[row] = target.store_row
+            self.target_serial[row] = self.unit_store.serial[target.store_row]
+        else:
+            self.target_row[row] = UNTRACKED_TARGET
+
+    def remove(self, projectile):
+        """Detach projectile and move the last row into its place"""
+        if getattr(projectile, 'projectile_store', None) is not self:
+            return
+        row = projectile.store_row
+        values = {'x': self.x.item(row), 'y': self.y.item(row)}
+        last = len(self.projectiles) - 1
+        if row != last:
+            moved = self.projectiles[last]
+            for column in COLUMNS:
+                array = getattr(self, column)
+                array[row] = array[last]
+            self.projectiles[row] = moved
+            moved.store_row = row
+        self.projectiles.pop()
+
+        projectile.__class__ = projectile.store_base_class
+        projectile.__dict__.update(values)
+        del projectile.projectile_store
+        del projectile.store_row
+
+    def clear(self):
+        for projectile in self.projectiles[:]:
+            self.remove(projectile)
+
+    def advance(self, dt: float):
+        """Fly every projectile one frame, mirroring Projectile.update"""
+        n = len(self.projectiles)
+        if not n:
+            return
+        np = self.np
+        x = self.x[:n]
+        y = self.y[:n]
+        target_row = self.target_row[:n]
+        at_location = target_row == LOCATION_TARGET
+        dest_x = self.dest_x[:n].copy()
+        dest_y = self.dest_y[:n].copy()
+        flying = at_location.copy()
+
+        units = self.unit_store
+        if units is not None:
+            on_unit = target_row >= 0
+            rows = np.where(on_unit, target_row, 0)
+            live_target = (on_unit & (units.serial[rows] == self.target_serial[:n])
+                           & units.active[rows] & (units.hp[rows] > 0))
+            flying |= live_target
+            dest_x[live_target] = units.x[rows[live_target]]
+            dest_y[live_target] = units.y[rows[live_target]]
+
+        dx = dest_x - x
+        dy = dest_y - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        flying &= distance >= LANDING_DISTANCE
+        move_distance = self.speed[:n] * dt
+
+        arriving = flying & (move_distance >= distance)
+        x[arriving] = dest_x[arriving]
+        y[arriving] = dest_y[arriving]
+        stepping = np.flatnonzero(flying & ~arriving)
+        x[stepping] += (dx[stepping] / distance[stepping]) * move_distance[stepping]
+        y[stepping] += (dy[stepping] / distance[stepping]) * move_distance[stepping]
+
+        # Landings, dead or missing targets and untracked targets decide in Python
+        # (collected first, since removals move rows)
+        deciding = [self.projectiles[row] for row in np.flatnonzero(~flying)]
+        for projectile in deciding:
+            self._update_in_python(projectile, dt)
+
+    def _update_in_python(self, projectile, dt: float):
+        # An earlier landing this frame may already have removed it
+        if getattr(projectile, 'projectile_store', None) is not self:
+            return
+        projectile.update(dt)
+        if projectile.reached_target:
+            self.remove(projectile)
+        else:
+            self.sync_target(projectile)
@@ -0,0 +1,277 @@
+"""
+Headless combat simulation for balancing runs.
+
+Builds a Game with presentation turned off, places both teams from plain
+specs and steps Board.update_combat at the fixed frame time until combat
+ends. Nothing here imports pygame.
+
+A team spec is either a list of unit entries or a dict with "units" and
+optional "augments". A unit entry is a UnitType value (e.g. "sun_spirit")
+or a dict:
+
+    {"unit": "red_wyrm", "x": 6, "y": 3, "items": ["thrumblade"]}
+
+x/y are absolute board coordinates; when omitted the unit goes in the
+team's first free tile. Augments are passive augment class names, e.g.
+"AttackBoostAugment".
+"""
+
+from constants import FRAME_TIME
+from unit import Unit, UnitType
+
+
+class CombatResult:
+    """Compact outcome of one simulated battle"""
+
+    def __init__(self, winner, duration, frames, survivors, damage_dealt):
+        self.winner = winner              # "player", "enemy" or "draw"
+        self.duration = duration          # Seconds of combat time
+        self.frames = frames              # Fixed-step frames simulated
+        self.survivors = survivors        # List of (team, index, name, hp)
+        self.damage_dealt = damage_dealt  # {(team, index): damage}
+
+    def to_dict(self):
+        return {
+            "winner": self.winner,
+            "duration": self.duration,
+            "frames": self.frames,
+            "survivors": [list(s) for s in self.survivors],
+            "damage_dealt": {f"{team}:{index}": dmg for (team, index), dmg in self.damage_dealt.items()},
+        }
+
+    def __repr__(self):
+        return (f"CombatResult(winner={self.winner!r}, duration={self.duration:.2f}, "
+                f"survivors={len(self.survivors)})")
+
+
+def _normalize_team_spec(spec):
+    """Return (unit_entries, augment_names) for a team spec"""
+    if isinstance(spec, dict):
+        return list(spec.get("units", [])), list(spec.get("augments", []))
+    return list(spec), []
+
+
+def _normalize_unit_entry(entry):
+    if isinstance(entry, dict):
+        return entry
+    return {"unit": entry}
+
+
+def _create_augment(name):
+    from content.augments import get_all_passive_augment_types
+    for augment_class in get_all_passive_augment_types():
+        if augment_class.__name__ == name:
+            return augment_class()
+    raise ValueError(f"Unknown augment: {name}")
+
+
+def build_team(game, team, spec):
+    """Place the units, items and augments of spec onto team.
+
+    Returns the placed units in spec order.
+    """
+    from content.unit_registry import create_unit
+    from content.items import create_item
+
+    entries, augment_names = _normalize_team_spec(spec)
+
+    placed = []
+    for entry in entries:
+        entry = _normalize_unit_entry(entry)
+        unit_type = entry["unit"]
+        if not isinstance(unit_type, UnitType):
+            unit_type = UnitType(unit_type)
+        unit = create_unit(unit_type)
+        if unit is None:
+            raise ValueError(f"Unknown unit type: {entry['unit']}")
+
+        if "x" in entry and "y" in entry:
+            x, y = entry["x"], entry["y"]
+        else:
+            position = team.find_empty_position()
+            if position is None:
+                raise ValueError(f"No free tile for {unit.name} on team {team.name}")
+            x, y = position
+        if not team.add_unit(unit, x, y):
+            raise ValueError(f"Could not place {unit.name} at ({x}, {y})")
+
+        for item_name in entry.get("items", []):
+            item = create_item(item_name)
+            if item is None:
+                raise ValueError(f"Unknown item: {item_name}")
+            unit.add_item(item)
+
+        placed.append(unit)
+
+    for name in augment_names:
+        augment = _create_augment(name)
+        if augment.on_buy(team):
+            team.add_augment(augment)
+
+    return placed
+
+
+def _damage_owner(source):
+    """Attribute damage from items, statuses and summons to the unit responsible"""
+    for _ in range(4):
+        if source is None or isinstance(source, Unit):
+            break
+        source = getattr(source, 'unit', None) or getattr(source, 'source', None)
+    if isinstance(source, Unit) and source.is_summoned and source.summoner:
+        source = source.summoner
+    return source if isinstance(source, Unit) else None
+
+
+def simulate_combat(player_team_spec, enemy_team_spec, seed=None,
+                    max_combat_time: float = None, vectorized: bool = False,
+                    fast_forward: bool = False, probes=(), think_rate: float = None,
+                    analytic_projectiles: bool = False) -> CombatResult:
+    """Run one battle to completion without presentation and return its result.
+
+    All randomness comes from the game's own RNG seeded with seed, so the
+    same inputs give the same battle in any process (see README).
+    vectorized advances unit timers through a NumPy UnitStore, for large
+    boards (see unit_store.py). fast_forward skips frames in which only
+    timers change (see fast_forward.py). probes receive per-frame timings
+    and counts (see frame_stats.py). think_rate caps how often (Hz) each
+    unit decides what to do (see think_rate.py).
+    analytic_projectiles schedules projectile landings instead of stepping
+    their flight (see projectile_arrivals.py).
+    """
+    from game import Game, GamePhase
+
+    game = Game(headless=True, seed=seed, vectorized=vectorized, think_rate=think_rate,
+                analytic_projectiles=analytic_projectiles)
+    if max_combat_time is not None:
+        game.max_combat_time = max_combat_time
+    board = game.board
+
+    # Probes attach before any unit exists so hook tracing sees every subscription
+    for probe in probes:
+        board.add_probe(probe)
+
+    player_units = build_team(game, game.player_team, player_team_spec)
+    enemy_units = build_team(game, game.enemy_team, enemy_team_spec)
+
+    # Key units by their position in the spec so results are stable across runs
+    slots = {}
+    for index, unit in enumerate(player_units):
+        slots[unit] = ("player", index)
+    for index, unit in enumerate(enemy_units):
+        slots[unit] = ("enemy", index)
+    damage_dealt = {slot: 0.0 for slot in slots.values()}
+
+    def on_damage_taken(unit=None, damage=0, source=None, **kwargs):
+        owner = _damage_owner(source)
+        slot = slots.get(owner)
+        if slot is not None:
+            damage_dealt[slot] += damage
+
+    board.add_event_handler("damage_taken", on_damage_taken)
+
+    game.start_combat()
+    if fast_forward:
+        from fast_forward import run_combat
+        run_combat(game, FRAME_TIME)
+    else:
+        while game.phase == GamePhase.COMBAT:
+            game.update_combat(FRAME_TIME)
+
+    player_alive = board.count_living("player") > 0
+    enemy_alive = board.count_living("enemy") > 0
+    if player_alive and not enemy_alive:
+        winner = "player"
+    elif enemy_alive and not player_alive:
+        winner = "enemy"
+    else:
+        winner = "draw"
+
+    survivors = [(team, index, unit.name, unit.hp)
+                 for unit, (team, index) in slots.items() if unit.is_alive()]
+
+    return CombatResult(winner, game.combat_time, game.combat_frame, survivors, damage_dealt)
+
+
+def _init_worker():
+    """Pool initializer: import all content once so each battle starts warm"""
+    import content.unit_registry  # noqa: F401
+    import content.items  # noqa: F401
+    import content.augments  # noqa: F401
+
+
+def _run_matchup_chunk(chunk, options=None):
+    """Worker entry point: simulate a chunk of (index, matchup) pairs"""
+    results = []
+    for index, matchup in chunk:
+        player_spec, enemy_spec, seed, matchup_options = _normalize_matchup(matchup)
+        results.append((index, simulate_combat(player_spec, enemy_spec, seed,
+                                               **dict(options or {}, **matchup_options))))
+    return results
+
+
+def _normalize_matchup(matchup):
+    """Return (player_spec, enemy_spec, seed, options) for a tuple or dict matchup"""
+    if isinstance(matchup, dict):
+        options = {key: value for key, value in matchup.items() if key not in ("player", "enemy", "seed")}
+        return matchup["player"], matchup["enemy"], matchup.get("seed"), options
+    player_spec, enemy_spec, seed = matchup
+    return player_spec, enemy_spec, seed, {}
+
+
+class BattlePool:
+    """Long-lived pool of warm worker processes for batch simulation.
+
+    Matchups are (player_spec, enemy_spec, seed) tuples or dicts with
+    "player", "enemy" and "seed" keys. Results stream back as workers
+    finish, so a caller can aggregate while the sweep is still running.
+
+    Keyword options of simulate_combat (fast_forward, think_rate,
+    vectorized, analytic_projectiles, max_combat_time) given to run, map
+    or run_batch apply to every battle; any other key of a dict matchup is
+    passed through for that battle only and overrides them.
+
+        with BattlePool() as pool:
+            for index, result in pool.run(matchups, fast_forward=True):
+                ...
+    """
+
+    def __init__(self, max_workers: int = None):
+        from concurrent.futures import ProcessPoolExecutor
+        self.executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+
+    def run(self, matchups, chunksize: int = 1, **options):
+        """Yield (index, CombatResult) for each matchup in completion order.
+
+        chunksize groups several battles into one task to amortise the
+        inter-process round trip when individual battles are very short.
+        """
+        from concurrent.futures import as_completed
+
+        indexed = list(enumerate(matchups))
+        chunks = [indexed[i:i + chunksize] for i in range(0, len(indexed), chunksize)]
+        futures = [self.executor.submit(_run_matchup_chunk, chunk, options) for chunk in chunks]
+        for future in as_completed(futures):
+            for index, result in future.result():
+                yield index, result
+
+    def map(self, matchups, chunksize: int = 1, **options):
+        """Run all matchups and return results in input order"""
+        results = [None] * len(matchups)
+        for index, result in self.run(matchups, chunksize, **options):
+            results[index] = result
+        return results
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def run_batch(matchups, max_workers: int = None, chunksize: int = 1, **options):
+    """Simulate matchups across all cores, yielding (index, CombatResult) as they finish"""
+    with BattlePool(max_workers) as pool:
+        yield from pool.run(matchups, chunksize, **options)
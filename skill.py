@@ -1,6 +1,14 @@
 from typing import Optional, List
 
 class Skill:
+    # (event_type, role) pairs this skill's on_event handles; see event_bus.py
+    event_subscriptions = ()
+    # Delivery order among a unit's listeners: skills, items, then statuses
+    event_rank = 0
+    # (timer attribute, interval) when update only counts a timer up to an interval
+    # between actions, so fast-forward can skip ahead; see fast_forward.py
+    frame_timer = None
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -42,20 +50,13 @@ class Skill:
             max_range = self.range
             
         if target_team == "enemy":
-            units = caster.board.enemy_units if caster.team == "player" else caster.board.player_units
+            units = caster.board.get_living_enemies(caster.team)
         elif target_team == "ally":
-            units = caster.board.player_units if caster.team == "player" else caster.board.enemy_units
+            units = caster.board.get_living_units(caster.team)
         else:
             units = caster.board.get_all_units()
-            
-        valid_targets = []
-        for unit in units:
-            if not unit.is_alive():
-                continue
-            if caster.board.get_distance(caster, unit) <= max_range:
-                valid_targets.append(unit)
-                
-        return valid_targets
+
+        return caster.board.filter_in_range(units, caster.x, caster.y, max_range)
     
     def get_targets_in_area(self, caster, center_x: int, center_y: int, radius: int, target_team: str = "enemy") -> List:
         """Get targets in an area of effect"""
@@ -0,0 +1,45 @@
+"""
+Unit stats as a base value plus keyed modifier layers.
+
+Each stat in STAT_NAMES is a Stat descriptor on Unit. Assigning to it
+(unit.armor = 20, usually in a unit's __init__) sets the base value.
+Items, status effects and augments instead add layers under a key of
+their own, normally themselves:
+
+    unit.add_stat_modifier(self, {"armor": 10})        # flat, summed per key
+    unit.set_stat_multiplier(self, {"armor": 2})       # applied after all flat layers
+    unit.remove_stat_modifier(self)                    # drops both layers for the key
+
+The effective value is (base + flat layers) * multipliers. It is worked
+out on first read and cached until the base or a layer touching that stat
+changes, so a read is a dict lookup and adding or removing a layer only
+invalidates the stats it names. Removing a layer by key cannot leave
+behind rounding or stale amounts the way subtracting a bonus back out
+could, and Unit.reset drops every layer at once.
+
+Stats mirrored in a UnitStore column (max_hp, hp_regen, mp_regen) are
+written to the column as soon as they change, since the vectorized step
+reads the columns directly.
+"""
+
+STAT_NAMES = ("max_hp", "hp_regen", "mp_regen", "strength", "intelligence", "armor",
+              "magic_resist", "attack_damage", "attack_range", "attack_speed", "move_speed")
+
+
+class Stat:
+    """Unit attribute reading the cached effective stat; assignment sets the base value"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, unit, owner=None):
+        if unit is None:
+            return self
+        try:
+            return unit.stat_cache[self.name]
+        except KeyError:
+            return unit.recompute_stat(self.name)
+
+    def __set__(self, unit, value):
+        unit.base_stats[self.name] = value
+        unit.invalidate_stat(self.name)
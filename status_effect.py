@@ -1,6 +1,7 @@
 from typing import Dict, Optional
-from constants import FRAME_TIME
+from constants import FRAME_TIME, TIMER_EPSILON
 from enum import Enum
+from damage import DamageFlag, to_damage_flags
 
 
 class StackType(Enum):
@@ -8,6 +9,15 @@ class StackType(Enum):
     STACK_INTENSITY = "stack_intensity"  # Increase intensity/power when stacking
 
 class StatusEffect:
+    # Statuses on a board are only updated when next_due() says something
+    # happens; see status_timers.py
+    # (event_type, role) pairs this effect's on_event handles; see event_bus.py
+    event_subscriptions = ()
+    # Delivery order among a unit's listeners: skills, items, then statuses
+    event_rank = 2
+    # Damage pipeline stages this effect intercepts on its unit; see damage.py
+    damage_stages = ()
+
     def __init__(self, name: str, duration: Optional[float], stack_type: StackType = StackType.STACK_DURATION):
         self.name = name
         self.duration = duration
@@ -34,29 +44,37 @@ class StatusEffect:
         
         if self.tick_interval > 0:
             self.tick_timer += dt
-            if self.tick_timer >= self.tick_interval:
+            if self.tick_timer >= self.tick_interval - TIMER_EPSILON:
                 self.tick_timer -= self.tick_interval
                 self.on_tick()
                 
     def on_tick(self):
         pass
+
+    def next_due(self) -> float:
+        """Seconds until update next does more than count down"""
+        due = self.remaining_duration if self.remaining_duration is not None else float('inf')
+        if self.tick_interval > 0 and type(self).on_tick is not StatusEffect.on_tick:
+            due = min(due, self.tick_interval - self.tick_timer)
+        return due
     
     def is_expired(self) -> bool:
-        return self.remaining_duration is not None and self.remaining_duration <= 0
+        return self.remaining_duration is not None and self.remaining_duration <= TIMER_EPSILON
     
     def on_event(self, event_type: str, **kwargs):
         pass
 
 
 class DamageOverTimeEffect(StatusEffect):
-    def __init__(self, name: str, duration: Optional[float], damage_per_tick: float, damage_type: str = "magical", stack_type: StackType = StackType.STACK_DURATION):
+    def __init__(self, name: str, duration: Optional[float], damage_per_tick: float, damage_type=DamageFlag.ARCANE, stack_type: StackType = StackType.STACK_DURATION):
         super().__init__(name, duration, stack_type)
         self.damage_per_tick = damage_per_tick
         self.damage_type = damage_type
+        self.damage_flags = to_damage_flags(damage_type)
         
     def on_tick(self):
         if self.unit and self.unit.is_alive():
-            self.unit.take_damage(self.damage_per_tick, self.damage_type, self.source)
+            self.unit.take_damage(self.damage_per_tick, self.damage_flags, self.source)
 
 
 class HealOverTimeEffect(StatusEffect):
@@ -76,15 +94,11 @@ class StatModifierEffect(StatusEffect):
         
     def apply(self, unit):
         super().apply(unit)
-        for stat, value in self.stat_modifiers.items():
-            if hasattr(unit, stat):
-                setattr(unit, stat, getattr(unit, stat) + value)
+        # Extra stacks add to this layer (see Unit.add_status_effect)
+        unit.add_stat_modifier(self, self.stat_modifiers)
                 
     def remove(self, unit):
-        for stat, value in self.stat_modifiers.items():
-            if hasattr(unit, stat):
-                # Multiply by stacks to remove all accumulated changes
-                setattr(unit, stat, getattr(unit, stat) - (value * self.stacks))
+        unit.remove_stat_modifier(self)
         super().remove(unit)
 
 
@@ -95,7 +109,7 @@ class PoisonEffect(DamageOverTimeEffect):
 
     def on_tick(self):
         if self.unit and self.unit.is_alive():
-            self.unit.take_damage(self.damage_per_tick * self.stacks, self.damage_type, self.source)
+            self.unit.take_damage(self.damage_per_tick * self.stacks, self.damage_flags, self.source)
 
 
 class WeaknessEffect(StatModifierEffect):
@@ -127,57 +141,48 @@ class ProtectionEffect(StatModifierEffect):
         
     def apply(self, unit):
         super().apply(unit)
-        self.original_armor = unit.armor
-        self.original_mr = unit.magic_resist
-        unit.armor *= 2
-        unit.magic_resist *= 2
-        
-    def remove(self, unit):
-        unit.armor = self.original_armor
-        unit.magic_resist = self.original_mr
-        super().remove(unit)
+        unit.set_stat_multiplier(self, {"armor": 2, "magic_resist": 2})
 
 
 class AbsorbShieldEffect(StatusEffect):
     """Absorbs incoming damage up to a certain amount"""
+    damage_stages = ("absorb",)
+
     def __init__(self, name: str, duration: float, absorb_amount: float):
         super().__init__(name, duration)
         self.absorb_amount = absorb_amount
         self.remaining_absorb = absorb_amount
         
-    def on_damage_taken(self, unit, damage_amount: float, damage_type: str, source) -> float:
-        """Intercept damage and absorb it"""
-        if self.remaining_absorb <= 0:
-            return damage_amount
-            
-        absorbed = min(damage_amount, self.remaining_absorb)
+    def absorb(self, hit):
+        """Take mitigated damage out of the shield, breaking it when used up"""
+        absorbed = min(hit.amount, self.remaining_absorb)
         self.remaining_absorb -= absorbed
-        remaining_damage = damage_amount - absorbed
-        
-        if self.remaining_absorb <= 0:
+        hit.amount -= absorbed
+        hit.absorbed += absorbed
+
+        if self.remaining_absorb <= 0 and self.unit:
             # Shield is broken
-            self.expire()
-            
-        return remaining_damage
+            self.unit.remove_status_effect(self)
 
 
 class DodgeEffect(StatusEffect):
     """Dodge status effect that blocks one incoming attack"""
+    damage_stages = ("pre_mitigation",)
+
     def __init__(self, stacks: int = 1):
         super().__init__("Dodge", None)
         self.stacks = stacks
 
-    def on_event(self, event_type: str, **kwargs):
-        if (event_type == "unit_attacked" and "target" in kwargs and
-            kwargs["target"] == self.unit and self.stacks > 0):
-            self.stacks -= 1
-            if "damage" in kwargs:
-                kwargs["damage"] = 0
-            if self.unit.board:
-                from visual_effect import VisualEffectType
-                self.unit.board.add_visual_effect(VisualEffectType.DODGE, self.unit.x, self.unit.y)
-            if self.stacks <= 0:
-                self.unit.remove_status_effect(self)
+    def pre_mitigation(self, hit):
+        if not hit.is_attack or self.stacks <= 0:
+            return
+        self.stacks -= 1
+        hit.blocked = True
+        if self.unit.board:
+            from visual_effect import VisualEffectType
+            self.unit.board.add_visual_effect(VisualEffectType.DODGE, self.unit.x, self.unit.y)
+        if self.stacks <= 0:
+            self.unit.remove_status_effect(self)
 
 
 class PlagueEffect(DamageOverTimeEffect):
@@ -207,11 +212,10 @@ class PlagueEffect(DamageOverTimeEffect):
                                                       "enemy" if unit.team == "player" else "player")
         
         candidates = [enemy for enemy in nearby_enemies 
-                     if enemy.is_alive() and not any(eff.name == "Plague" for eff in enemy.status_effects)]
+                     if enemy.is_alive() and "Plague" not in enemy.status_effects]
         
         if candidates:
-            import random
-            target = random.choice(candidates)
+            target = unit.board.rng.choice(candidates)
             plague = PlagueEffect("Plague", self.duration * 0.7, self.damage_per_tick * 0.8)
             plague.source = self.source
             target.add_status_effect(plague)
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Board-wide wake-up schedule for status effects.
+
+Statuses used to be updated by their unit every frame. Now each board
+keeps one heap of (due time, sequence, effect) and a clock of combat time
+stepped on it. An effect is put on the heap for its next tick or expiry,
+as reported by its next_due() (see fast_forward.py), and is left alone
+until then. When it comes due, the board hands it to its unit, and
+Unit.update runs it in the usual place in the unit's turn:
+
+    effect.update(seconds since it last ran)
+
+then removes it if it has expired or schedules it again. A status whose
+class overrides update without next_due is assumed to act every frame
+and is woken every frame. One with no duration and no on_tick of its
+own (a permanent stat modifier from an augment) is never on the heap and
+costs nothing per frame.
+
+Between wake-ups an effect's remaining_duration and tick_timer are not
+counted down. Call sync() before reading them or changing them from
+outside (Unit.add_status_effect does this when refreshing a stack).
+
+Removing an effect or its unit just marks the heap entry stale; stale
+entries are dropped when they reach the top.
+"""
+
+import heapq
+
+from constants import TIMER_EPSILON
+from fast_forward import hook_next_due, NEVER
+
+
+class StatusTimers:
+    def __init__(self):
+        self.time = 0.0      # Seconds of combat stepped on this board
+        self.heap = []       # (due time, sequence, effect)
+        self.sequence = 0
+
+    def schedule(self, effect):
+        """(Re)schedule effect from its current timers, which must be in sync"""
+        effect.timer_synced = self.time
+        due = hook_next_due(effect, 'update')
+        if due == NEVER:
+            effect.timer_sequence = None
+            return
+        self.sequence += 1
+        effect.timer_sequence = self.sequence
+        heapq.heappush(self.heap, (self.time + max(due, 0.0), self.sequence, effect))
+
+    def unschedule(self, effect):
+        effect.timer_sequence = None
+
+    def sync(self, effect):
+        """Count effect's timers down to now; nothing is due before its wake-up, so no tick runs"""
+        elapsed = self.time - getattr(effect, 'timer_synced', self.time)
+        effect.timer_synced = self.time
+        if elapsed > 0:
+            if effect.remaining_duration is not None:
+                effect.remaining_duration -= elapsed
+            if effect.tick_interval > 0:
+                effect.tick_timer += elapsed
+
+    def add_unit(self, unit):
+        unit.status_timers = self
+        unit.due_statuses = []
+        for effect in unit.status_effects.values():
+            self.schedule(effect)
+
+    def remove_unit(self, unit):
+        for effect in unit.status_effects.values():
+            self.sync(effect)
+            effect.timer_sequence = None
+        unit.status_timers = None
+        unit.due_statuses = []
+
+    def advance(self, dt: float):
+        """Step the clock by one frame and queue every effect now due on its unit"""
+        self.time += dt
+        heap = self.heap
+        limit = self.time + TIMER_EPSILON
+        while heap and heap[0][0] <= limit:
+            _, sequence, effect = heapq.heappop(heap)
+            if effect.timer_sequence == sequence and effect.unit is not None:
+                effect.timer_sequence = None
+                effect.unit.due_statuses.append(effect)
+
+    def skip(self, frames: int, dt: float):
+        """Step the clock over frames in which nothing is due (see fast_forward.py)"""
+        time = self.time
+        for _ in range(frames):
+            time += dt
+        self.time = time
+
+    def next_due(self) -> float:
+        """Seconds until the earliest scheduled wake-up"""
+        heap = self.heap
+        while heap and heap[0][2].timer_sequence != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] - self.time if heap else NEVER
+
+    def wake(self, unit):
+        """Run unit's due statuses (called from Unit.update)"""
+        due, unit.due_statuses = unit.due_statuses, []
+        for effect in due:
+            if effect.unit is not unit:
+                continue
+            elapsed = self.time - effect.timer_synced
+            effect.timer_synced = self.time
+            effect.update(elapsed)
+            if effect.unit is not unit:
+                continue
+            if effect.is_expired():
+                unit.remove_status_effect(effect)
+            else:
+                self.schedule(effect)
+
+    def clear(self):
+        self.heap = []
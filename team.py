@@ -1,5 +1,6 @@
 from typing import List, Optional
 from unit import Unit
+from frame_hooks import bound_hooks
 
 class Team:
     """Represents a team of units with their augments and items"""
@@ -12,11 +13,19 @@ class Team:
         self.units: List[Unit] = []
         self.augments = []  # All augments owned by this team
         self.passive_augments = []  # Just passive augments for combat effects
+        self.frame_hooks = []  # Bound on_frame of the passive augments that have one (see frame_hooks.py)
         self.unequipped_items = []  # Items not currently equipped to units
 
         # Team stats
         self.units_purchased = 0  # Track for escalating unit costs
         
+    @property
+    def rng(self):
+        """Gameplay RNG of the board this team plays on"""
+        if self.board is None:
+            raise ValueError(f"Team {self.name!r} has no board to draw randomness from")
+        return self.board.rng
+
     def add_unit(self, unit: Unit, x: int = None, y: int = None) -> bool:
         """Add a unit to the team and optionally place it on the board"""
         self.units.append(unit)
@@ -54,6 +63,10 @@ class Team:
         from augment import PassiveAugment
         if isinstance(augment, PassiveAugment):
             self.passive_augments.append(augment)
+            self.frame_hooks = bound_hooks(self.passive_augments, 'on_frame')
+            # Augments listen to board events for as long as the team owns them
+            if self.board:
+                self.board.events.subscribe_listener(augment)
     
     def get_unit_cost(self) -> int:
         """Get the cost for the next unit purchase (escalating)"""
@@ -91,17 +104,20 @@ class Team:
     
     def clear(self):
         """Clear all units and augments (for enemy team regeneration)"""
+        if self.board:
+            for augment in self.passive_augments:
+                self.board.events.unsubscribe_listener(augment)
         self.units.clear()
         self.augments.clear()
         self.passive_augments.clear()
+        self.frame_hooks = []
         self.unequipped_items.clear()
         self.units_purchased = 0
     
     def update(self, dt: float):
         """Update all passive augments during combat"""
-        for augment in self.passive_augments:
-            if hasattr(augment, 'on_frame'):
-                augment.on_frame(dt)
+        for on_frame in self.frame_hooks:
+            on_frame(dt)
 
     def on_battle_start(self):
         """Called at the start of battle - activate passive augments"""
@@ -126,7 +142,6 @@ class Team:
     def buy_random_unit(self, remaining_budget: int, game=None) -> int:
         """Try to buy a random unit for the enemy team. Returns cost spent (0 if failed)."""
         from content.unit_registry import create_unit, get_available_units
-        import random
         
         # Check if we can afford a unit
         unit_cost = self.get_unit_cost()
@@ -143,7 +158,7 @@ class Team:
         if not unit_types:
             return 0
             
-        unit_type = random.choice(unit_types)
+        unit_type = self.rng.choice(unit_types)
         unit = create_unit(unit_type)
         
         if unit and self.add_unit(unit, position[0], position[1]):
@@ -156,7 +171,6 @@ class Team:
     
     def buy_random_augment(self, remaining_budget: int, game=None) -> int:
         """Try to buy a random augment from the pool. Returns cost spent (0 if failed)."""
-        import random
         
         # Check if we have augments in the pool
         if not hasattr(self, 'enemy_augment_pool') or not self.enemy_augment_pool:
@@ -170,10 +184,10 @@ class Team:
             return 0
         
         # Pick a random augment
-        augment = random.choice(available_augments)
+        augment = self.rng.choice(available_augments)
         
         # 70% chance to buy (for enemy balance)
-        if random.random() > 0.7:
+        if self.rng.random() > 0.7:
             return 0
         
         # Try to buy the augment
@@ -188,19 +202,17 @@ class Team:
     
     def equip_items_randomly(self):
         """Randomly equip unequipped items to units with available slots."""
-        import random
         
         for item in self.unequipped_items[:]:  # Use slice copy to avoid modification during iteration
             available_units = [unit for unit in self.units if len(unit.items) < 3]
             if available_units:
-                unit = random.choice(available_units)
+                unit = self.rng.choice(available_units)
                 if unit.add_item(item):
                     self.unequipped_items.remove(item)
     
     def generate_enemy_team(self, budget: int = 120, game=None):
         """Generate an enemy team by randomly buying units, passives, and augments until budget is exhausted."""
         from content.augments import generate_augment_shop_legacy
-        import random
         
         if self.name != "enemy":
             return  # Only generate for enemy teams
@@ -212,8 +224,8 @@ class Team:
         self.clear()
         
         # Generate augment pool once for the enemy to choose from
-        self.enemy_augment_pool = generate_augment_shop_legacy(20)
-        random.shuffle(self.enemy_augment_pool)
+        self.enemy_augment_pool = generate_augment_shop_legacy(self.rng, 20)
+        self.rng.shuffle(self.enemy_augment_pool)
         
         remaining_budget = budget
         attempts = 0
@@ -225,7 +237,7 @@ class Team:
             
             # Randomly choose what to buy
             # Weighted: 65% units, 35% augments
-            choice = random.choices(
+            choice = self.rng.choices(
                 ['unit', 'augment'],
                 weights=[0.65, 0.35],
                 k=1
@@ -74,6 +74,334 @@ class TestBoardSanity(unittest.TestCase):
                 self.fail(f"Board crashed on update {i}: {e}")
 
 
+class TestFlowField(unittest.TestCase):
+    """Test that flow-field steps agree with find_path."""
+
+    def test_single_enemy_matches_find_path(self):
+        import random
+        rng = random.Random(1234)
+        for _ in range(200):
+            board = Board()
+            tiles = [(x, y) for x in range(8) for y in range(8)]
+            rng.shuffle(tiles)
+            mover = Unit("Mover", UnitType.SKELETON)
+            enemy = Unit("Enemy", UnitType.SKELETON)
+            board.add_unit(mover, *tiles[0], "player")
+            board.add_unit(enemy, *tiles[1], "enemy")
+            for x, y in tiles[2:2 + rng.randint(0, 20)]:
+                board.add_unit(Unit("Wall", UnitType.SKELETON), x, y, "player")
+
+            path = board.find_path(mover.x, mover.y, enemy.x, enemy.y)
+            expected = path[1] if len(path) > 1 else None
+            self.assertEqual(board.get_next_step(mover, enemy), expected)
+
+    def test_field_invalidated_by_movement(self):
+        board = Board()
+        mover = Unit("Mover", UnitType.SKELETON)
+        enemy = Unit("Enemy", UnitType.SKELETON)
+        board.add_unit(mover, 0, 0, "player")
+        board.add_unit(enemy, 7, 0, "enemy")
+        self.assertEqual(board.get_next_step(mover, enemy), (1, 0))
+        board.move_unit(enemy, 0, 7)
+        self.assertEqual(board.get_next_step(mover, enemy), (0, 1))
+
+
+class TestBitboards(unittest.TestCase):
+    """Test that bitboard range queries agree with plain list scans."""
+
+    def test_range_queries_match_scan(self):
+        import random
+        rng = random.Random(4321)
+        for _ in range(100):
+            board = Board()
+            tiles = [(x, y) for x in range(8) for y in range(8)]
+            rng.shuffle(tiles)
+            units = []
+            for i, (x, y) in enumerate(tiles[:rng.randint(2, 16)]):
+                unit = Unit(f"U{i}", UnitType.SKELETON)
+                board.add_unit(unit, x, y, "player" if i % 2 else "enemy")
+                units.append(unit)
+            for unit in units[:3]:
+                unit.hp = 0
+                unit.die(None)
+            if rng.random() < 0.5:
+                board.move_unit(units[-1], *tiles[-1])
+
+            x, y = tiles[rng.randint(0, 63)]
+            r = rng.randint(0, 4)
+            for team in (None, "player", "enemy"):
+                expected = [u for u in board.get_all_units()
+                            if u.is_alive() and (team is None or u.team == team)
+                            and max(abs(u.x - x), abs(u.y - y)) <= r]
+                self.assertEqual(board.get_units_in_range(x, y, r, team), expected)
+
+            mover = units[-1]
+            enemies = [u for u in board.get_enemy_units(mover.team) if u.is_alive()]
+            self.assertEqual(board.has_enemy_in_range(mover, r),
+                             any(board.get_distance(mover, e) <= r for e in enemies))
+            if enemies:
+                closest = min(board.get_distance(mover, e) for e in enemies)
+                nearest = board.get_nearest_enemy(mover)
+                self.assertEqual(nearest, next(e for e in enemies if board.get_distance(mover, e) == closest))
+
+    def test_flow_field_matches_list_bfs(self):
+        import random
+        rng = random.Random(2468)
+        for _ in range(100):
+            board = Board()
+            tiles = [(x, y) for x in range(8) for y in range(8)]
+            rng.shuffle(tiles)
+            units = []
+            for i, (x, y) in enumerate(tiles[:rng.randint(2, 30)]):
+                unit = Unit(f"U{i}", UnitType.SKELETON)
+                board.add_unit(unit, x, y, "player" if i % 2 else "enemy")
+                units.append(unit)
+            units[0].hp = 0
+            units[0].die(None)
+            fields = {team: list(board.get_flow_field(team)) for team in ("player", "enemy")}
+            board.use_bitboards = False
+            board.flow_fields.clear()
+            for team in ("player", "enemy"):
+                self.assertEqual(fields[team], board.get_flow_field(team))
+
+
+class TestLivingRosters(unittest.TestCase):
+    """Test that per-side living rosters follow adds, deaths and removals."""
+
+    def test_rosters_follow_deaths_and_removal(self):
+        board = Board()
+        units = [Unit(f"U{i}", UnitType.SKELETON) for i in range(4)]
+        for i, unit in enumerate(units):
+            board.add_unit(unit, i, 0, "player" if i < 2 else "enemy")
+        roster = board.get_living_units("player")
+        units[0].hp = 0
+        units[0].die(None)
+        self.assertEqual(roster, units[:2])
+        self.assertEqual(board.get_living_units("player"), [units[1]])
+        self.assertEqual(board.get_living_enemies("player"), units[2:])
+        self.assertEqual(board.get_all_units(), units)
+        board.remove_unit(units[0])
+        board.remove_unit(units[2])
+        self.assertEqual(board.get_all_units(), [units[1], units[3]])
+        self.assertEqual(board.count_living("enemy"), 1)
+        self.assertEqual(board.get_units_in_range(0, 0, 7), [units[1], units[3]])
+
+    def test_combat_end_uses_living_counts(self):
+        game = Game(headless=True, seed=5)
+        ogre = create_unit(UnitType.BLOOD_OGRE)
+        hound = create_unit(UnitType.CRAZED_THORNHOUND)
+        game.board.add_unit(ogre, 1, 1, "player")
+        game.board.add_unit(hound, 6, 1, "enemy")
+        self.assertFalse(game.check_combat_end())
+        hound.take_damage(hound.hp * 10, [], ogre)
+        self.assertTrue(game.check_combat_end())
+
+
+class TestTargetCache(unittest.TestCase):
+    """Test that idle target lookups are reused until the board layout changes."""
+
+    def setUp(self):
+        self.board = Board(headless=True)
+        self.ogre = create_unit(UnitType.BLOOD_OGRE)
+        self.near = create_unit(UnitType.CRAZED_THORNHOUND)
+        self.far = create_unit(UnitType.CRAZED_THORNHOUND)
+        self.board.add_unit(self.ogre, 1, 1, "player")
+        self.board.add_unit(self.far, 6, 6, "enemy")
+        self.board.add_unit(self.near, 4, 1, "enemy")
+
+    def test_cached_until_layout_changes(self):
+        self.assertEqual(self.ogre.acquire_targets(), (None, self.near))
+        calls = []
+        self.board.get_nearest_enemy = lambda unit: calls.append(unit)
+        self.assertEqual(self.ogre.acquire_targets(), (None, self.near))
+        self.assertEqual(calls, [])
+        self.board.move_unit(self.near, 2, 1)
+        self.assertEqual(self.ogre.acquire_targets(), (self.near, None))
+
+    def test_death_and_range_invalidate(self):
+        self.board.move_unit(self.near, 2, 1)
+        self.assertEqual(self.ogre.acquire_targets(), (self.near, None))
+        self.ogre.attack_range = 6
+        self.assertEqual(self.ogre.acquire_targets(), (self.far, None))
+        self.far.take_damage(self.far.hp * 10, [], self.ogre)
+        self.assertEqual(self.ogre.acquire_targets(), (self.near, None))
+
+
+def _has_numpy():
+    try:
+        import numpy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@unittest.skipUnless(_has_numpy(), "NumPy not installed")
+class TestUnitStore(unittest.TestCase):
+    """Test that the array-backed unit store matches per-unit updates."""
+
+    def test_timers_match_per_unit_update(self):
+        units = []
+        for vectorized in (False, True):
+            board = Board(headless=True, vectorized=vectorized)
+            unit = create_unit(UnitType.SUN_SPIRIT)
+            board.add_unit(unit, 3, 3, "player")
+            unit.hp = unit.max_hp / 2
+            unit.attack_timer = 0.5
+            for _ in range(30):
+                board.update_combat(FRAME_TIME)
+            units.append(unit)
+        plain, stored = units
+        self.assertIsNotNone(stored.store_row)
+        for name in ("hp", "attack_timer", "move_timer", "cast_timer"):
+            self.assertAlmostEqual(getattr(stored, name), getattr(plain, name))
+        self.assertAlmostEqual(stored.spell.current_mana, plain.spell.current_mana)
+
+    def test_regen_runs_before_any_unit_acts(self):
+        # The second unit is hit at full HP by the first: per unit, its regen
+        # follows the hit; in the store it ran at the start of the frame, capped
+        defenders = []
+        for vectorized in (False, True):
+            board = Board(headless=True, vectorized=vectorized)
+            board.add_unit(create_unit(UnitType.BLOOD_OGRE), 1, 1, "player")
+            defender = create_unit(UnitType.BLOOD_OGRE)
+            board.add_unit(defender, 2, 1, "enemy")
+            board.update_combat(FRAME_TIME)
+            defenders.append(defender)
+        plain, stored = defenders
+        self.assertLess(plain.hp, plain.max_hp)
+        self.assertAlmostEqual(plain.hp - stored.hp, plain.hp_regen * FRAME_TIME)
+
+    def test_detach_restores_plain_unit(self):
+        board = Board(headless=True, vectorized=True)
+        unit = create_unit(UnitType.BLOOD_OGRE)
+        original_class = type(unit)
+        board.add_unit(unit, 1, 1, "player")
+        self.assertIsNot(type(unit), original_class)
+        unit.hp = 123
+        unit.spell.current_mana = 40
+        board.remove_unit(unit)
+        self.assertIs(type(unit), original_class)
+        self.assertIsNone(unit.store_row)
+        self.assertEqual((unit.hp, unit.spell.current_mana), (123, 40))
+
+    def test_stat_columns_follow_modifier_layers(self):
+        board = Board(headless=True, vectorized=True)
+        unit = create_unit(UnitType.BLOOD_OGRE)
+        board.add_unit(unit, 1, 1, "player")
+        base = unit.max_hp
+        unit.add_stat_modifier("test", {"max_hp": 100, "hp_regen": 2})
+        self.assertEqual(board.unit_store.max_hp[unit.store_row], base + 100)
+        unit.max_hp = 50
+        self.assertEqual(unit.max_hp, 150)
+        unit.remove_stat_modifier("test")
+        board.remove_unit(unit)
+        self.assertEqual(unit.max_hp, 50)
+        self.assertNotIn('max_hp', unit.__dict__)
+
+    def test_large_board_queries_match_scan(self):
+        import random
+        rng = random.Random(99)
+        tiles = [(x, y) for x in range(16) for y in range(16)]
+        rng.shuffle(tiles)
+        boards = [Board(16, 16, headless=True), Board(16, 16, headless=True, vectorized=True)]
+        for board in boards:
+            for i, (x, y) in enumerate(tiles[:80]):
+                board.add_unit(Unit(f"U{i}", UnitType.SKELETON), x, y, "player" if i % 2 else "enemy")
+            for unit in board.get_all_units()[:10]:
+                unit.hp = 0
+                unit.die(None)
+        for plain, stored in zip(*(board.get_all_units() for board in boards)):
+            nearest = (boards[0].get_nearest_enemy(plain), boards[1].get_nearest_enemy(stored))
+            self.assertEqual(nearest[0].name, nearest[1].name)
+            for r in (1, 2, 3):
+                self.assertEqual(boards[0].has_enemy_in_range(plain, r),
+                                 boards[1].has_enemy_in_range(stored, r))
+
+
+@unittest.skipUnless(_has_numpy(), "NumPy not installed")
+class TestProjectileStore(unittest.TestCase):
+    """Test that the array-backed projectile store matches per-projectile updates."""
+
+    def _fire(self, board, hits):
+        from projectile import Projectile
+        archer = Unit("Archer", UnitType.SKELETON)
+        near = Unit("Near", UnitType.SKELETON)
+        far = Unit("Far", UnitType.SKELETON)
+        board.add_unit(archer, 0, 0, "player")
+        board.add_unit(near, 3, 1, "enemy")
+        board.add_unit(far, 6, 5, "enemy")
+        projectiles = []
+        for target, speed in ((far, 4.0), (near, 4.0), (far, 9.0)):
+            projectile = Projectile(archer, target, speed)
+            projectile.set_on_hit(lambda unit, speed=speed: hits.append((unit.name, speed)))
+            board.add_projectile(projectile)
+            projectiles.append(projectile)
+        return projectiles
+
+    def test_flight_matches_per_projectile_update(self):
+        results = []
+        for vectorized in (False, True):
+            board = Board(headless=True, vectorized=vectorized)
+            hits = []
+            projectiles = self._fire(board, hits)
+            positions = []
+            for _ in range(20):
+                board.update_projectiles(FRAME_TIME)
+                positions.append([(p.x, p.y) for p in projectiles])
+            results.append((positions, hits, len(board.projectiles)))
+        self.assertEqual(results[0][0], results[1][0])
+        self.assertEqual(sorted(results[0][1]), sorted(results[1][1]))
+        self.assertEqual(results[0][2], results[1][2])
+
+    def test_swap_remove_keeps_rows(self):
+        board = Board(headless=True, vectorized=True)
+        first, second, third = self._fire(board, [])
+        from projectile import Projectile
+        self.assertIsNot(type(second), Projectile)
+        board.remove_projectile(first)
+        self.assertIs(type(first), Projectile)
+        self.assertFalse(hasattr(first, 'projectile_store'))
+        self.assertEqual(board.projectiles, [third, second])
+        self.assertEqual((third.store_row, second.store_row), (0, 1))
+        self.assertEqual((third.x, third.y), (0.0, 0.0))
+        board.remove_projectile(first)
+        self.assertEqual(len(board.projectiles), 2)
+
+    def test_same_frame_landings_follow_row_order(self):
+        from projectile import Projectile
+        orders = []
+        for vectorized in (False, True):
+            board = Board(headless=True, vectorized=vectorized)
+            archer = Unit("Archer", UnitType.SKELETON)
+            near = Unit("Near", UnitType.SKELETON)
+            board.add_unit(archer, 0, 0, "player")
+            board.add_unit(near, 3, 0, "enemy")
+            hits = []
+            projectiles = []
+            for name in ("first", "second", "third"):
+                projectile = Projectile(archer, near, 4.0)
+                projectile.set_on_hit(lambda unit, name=name: hits.append(name))
+                board.add_projectile(projectile)
+                projectiles.append(projectile)
+            # Swap-removal moves the third projectile into the first row
+            board.remove_projectile(projectiles[0])
+            for _ in range(60):
+                board.update_projectiles(FRAME_TIME)
+            orders.append(hits)
+        self.assertEqual(orders, [["second", "third"], ["third", "second"]])
+
+    def test_dead_target_drops_projectile(self):
+        board = Board(headless=True, vectorized=True)
+        hits = []
+        first, second, third = self._fire(board, hits)
+        board.update_projectiles(FRAME_TIME)
+        first.target.take_damage(first.target.hp * 10, [], second.source)
+        board.update_projectiles(FRAME_TIME)
+        self.assertEqual(board.projectiles, [second])
+        self.assertTrue(first.reached_target and third.reached_target)
+        self.assertEqual(hits, [])
+
+
 class TestGameSanity(unittest.TestCase):
     """Test that the game can handle basic operations without crashing."""
     
@@ -82,7 +410,7 @@ class TestGameSanity(unittest.TestCase):
         self.game = Game(GameMode.ASYNC)
         # Set up the game properly
         self.game.available_units = get_available_units()
-        self.game.available_items = generate_item_shop()
+        self.game.available_items = generate_item_shop(self.game.rng)
         
         # Override create methods
         from content.unit_registry import create_unit, get_unit_cost
@@ -142,7 +470,7 @@ class TestGameRoundReset(unittest.TestCase):
         """Set up a game with proper initialization."""
         self.game = Game(GameMode.ASYNC)
         self.game.available_units = get_available_units()
-        self.game.available_items = generate_item_shop()
+        self.game.available_items = generate_item_shop(self.game.rng)
         
         from content.unit_registry import create_unit, get_unit_cost
         self.game.create_unit = create_unit
@@ -214,7 +542,7 @@ class TestUnitPersistence(unittest.TestCase):
         """Set up a game with proper initialization."""
         self.game = Game(GameMode.ASYNC)
         self.game.available_units = get_available_units()
-        self.game.available_items = generate_item_shop()
+        self.game.available_items = generate_item_shop(self.game.rng)
         
         from content.unit_registry import create_unit, get_unit_cost
         self.game.create_unit = create_unit
@@ -504,7 +832,7 @@ class TestUnitReset(unittest.TestCase):
         
         # Add a status effect
         poison = PoisonEffect(None)
-        unit.status_effects.append(poison)
+        unit.status_effects[poison.name] = poison
         
         # Add a spell 
         unit.spell = test_skill
@@ -603,6 +931,420 @@ class TestAugmentPersistence(unittest.TestCase):
             f"HP buff should persist during combat. Expected {boosted_hp}, got {unit.max_hp}")
 
 
+
+class TestDamagePipeline(unittest.TestCase):
+    """Test per-unit damage interceptors."""
+
+    # Hits use no damage types, so armor and resists don't apply
+
+    def setUp(self):
+        self.board = Board()
+        self.ogre = create_unit(UnitType.BLOOD_OGRE)
+        self.hound = create_unit(UnitType.CRAZED_THORNHOUND)
+        self.board.add_unit(self.ogre, 1, 1, "player")
+        self.board.add_unit(self.hound, 2, 1, "enemy")
+
+    def test_absorb_shield_absorbs_then_breaks(self):
+        from status_effect import AbsorbShieldEffect
+        shield = AbsorbShieldEffect("Shield", 10.0, 50)
+        self.ogre.add_status_effect(shield)
+        hp = self.ogre.hp
+        self.ogre.take_damage(30, [], self.hound)
+        self.assertEqual(self.ogre.hp, hp)
+        self.ogre.take_damage(30, [], self.hound)
+        self.assertAlmostEqual(self.ogre.hp, hp - 10)
+        self.assertNotIn(shield, self.ogre.status_effects.values())
+        self.assertEqual(self.ogre.damage_interceptors, {})
+
+    def test_dodge_blocks_attacks_only(self):
+        from status_effect import DodgeEffect
+        self.ogre.add_status_effect(DodgeEffect(1))
+        hp = self.ogre.hp
+        self.ogre.take_damage(40, [], self.hound)
+        self.assertLess(self.ogre.hp, hp)
+        hp = self.ogre.hp
+        self.assertEqual(self.ogre.take_damage(40, [], self.hound, is_attack=True), 0)
+        self.assertEqual(self.ogre.hp, hp)
+        self.assertNotIn("Dodge", self.ogre.status_effects)
+
+    def test_fire_shield_counts_damage_taken(self):
+        from content.units.sun_spirit import FireShieldEffect
+        shield = FireShieldEffect(50, 10)
+        self.ogre.add_status_effect(shield)
+        self.ogre.take_damage(30, [], self.hound)
+        self.assertAlmostEqual(shield.shield_remaining, 20)
+        self.hound.add_status_effect(FireShieldEffect(50, 10))
+        self.assertAlmostEqual(shield.shield_remaining, 20)
+        self.ogre.take_damage(30, [], self.hound)
+        self.assertNotIn(shield, self.ogre.status_effects.values())
+
+
+class TestStatLayers(unittest.TestCase):
+    """Test that stat modifiers are keyed layers over the base stats."""
+
+    def setUp(self):
+        self.board = Board()
+        self.ogre = create_unit(UnitType.BLOOD_OGRE)
+        self.board.add_unit(self.ogre, 1, 1, "player")
+
+    def _stats(self):
+        return self.ogre.get_total_stats()
+
+    def test_items_and_stacks_revert_exactly(self):
+        from content.items import create_item
+        from status_effect import StatModifierEffect, ProtectionEffect, StackType
+        before = self._stats()
+        item = create_item("beastheart")
+        self.ogre.add_item(item)
+        self.assertEqual(self.ogre.max_hp, int(before["hp"] * 1.25))
+        for _ in range(3):
+            self.ogre.add_status_effect(StatModifierEffect("Rage", None, {"attack_speed": 7},
+                                                           StackType.STACK_INTENSITY))
+        self.ogre.add_status_effect(ProtectionEffect(1.0))
+        self.assertEqual(self.ogre.attack_speed, before["attack_speed"] + 21)
+        self.assertEqual(self.ogre.armor, before["armor"] * 2)
+        self.ogre.remove_item(item)
+        self.ogre.clear_status_effects()
+        self.assertEqual(self._stats(), before)
+
+    def test_percent_hp_scales_max_hp_when_equipped(self):
+        from content.items import create_item
+        self.ogre.max_hp = 1001
+        self.ogre.add_stat_modifier("earlier", {"max_hp": 100})
+        item = create_item("beastheart")
+        self.ogre.add_item(item)
+        self.assertEqual(self.ogre.max_hp, int(1101 * 1.25))
+        self.ogre.add_stat_modifier("later", {"max_hp": 250})
+        self.assertEqual(self.ogre.max_hp, int(1101 * 1.25) + 250)
+        self.ogre.remove_item(item)
+        self.assertEqual(self.ogre.max_hp, 1351)
+
+    def test_reset_drops_combat_layers(self):
+        from content.items import create_item
+        item = create_item("armor_of_time")
+        self.ogre.add_item(item)
+        with_item = self._stats()
+        item.on_frame(1.0)
+        self.ogre.add_stat_modifier("shred", {"armor": -5})
+        self.assertEqual(self.ogre.armor, with_item["armor"] - 3)
+        self.ogre.reset()
+        self.assertEqual(self._stats(), with_item)
+
+
+class TestStatusTimers(unittest.TestCase):
+    """Test that statuses are only woken when they tick or expire."""
+
+    def setUp(self):
+        self.board = Board(headless=True)
+        self.ogre = create_unit(UnitType.BLOOD_OGRE)
+        self.board.add_unit(self.ogre, 1, 1, "player")
+
+    def _step(self, frames):
+        for _ in range(frames):
+            self.board.status_timers.advance(FRAME_TIME)
+            self.ogre.update(FRAME_TIME)
+
+    def test_permanent_modifier_is_never_scheduled(self):
+        from status_effect import StatModifierEffect
+        self.ogre.add_status_effect(StatModifierEffect("Bark", None, {"armor": 1}))
+        self.assertEqual(self.board.status_timers.heap, [])
+        self._step(10)
+        self.assertEqual(self.ogre.due_statuses, [])
+
+    def test_ticks_and_expiry_land_on_frame(self):
+        from status_effect import PoisonEffect
+        ticks = []
+        self.ogre.take_damage = lambda *args, **kwargs: ticks.append(frame)
+        poison = PoisonEffect(2.0, 1.0)
+        self.ogre.add_status_effect(poison)
+        for frame in range(1, 131):
+            self._step(1)
+        self.assertEqual(ticks, list(range(5, 121, 5)))
+        self.assertNotIn(poison, self.ogre.status_effects.values())
+
+    def test_refresh_extends_expiry(self):
+        from status_effect import StatModifierEffect
+        chill = StatModifierEffect("Chill", 1.0, {"move_speed": -1})
+        self.ogre.add_status_effect(chill)
+        self._step(30)
+        self.ogre.add_status_effect(StatModifierEffect("Chill", 1.0, {"move_speed": -1}))
+        self.assertAlmostEqual(chill.remaining_duration, 1.0)
+        self._step(59)
+        self.assertIn(chill, self.ogre.status_effects.values())
+        self._step(1)
+        self.assertNotIn(chill, self.ogre.status_effects.values())
+
+    def test_statuses_keyed_by_name_in_order(self):
+        from status_effect import PoisonEffect, StatModifierEffect
+        first = PoisonEffect(2.0)
+        self.ogre.add_status_effect(first)
+        self.ogre.add_status_effect(StatModifierEffect("Chill", 1.0, {"move_speed": -1}))
+        self.ogre.add_status_effect(PoisonEffect(1.0))
+        self.assertEqual(list(self.ogre.status_effects), ["Poison", "Chill"])
+        self.assertIs(self.ogre.status_effects["Poison"], first)
+        self.assertEqual(first.stacks, 2)
+        self.ogre.remove_status_effect(PoisonEffect(2.0))
+        self.assertIs(self.ogre.status_effects["Poison"], first)
+        self.ogre.remove_status_effect(first)
+        self.assertEqual(list(self.ogre.status_effects), ["Chill"])
+
+    def test_removed_unit_keeps_synced_timers(self):
+        from status_effect import StatModifierEffect
+        chill = StatModifierEffect("Chill", 1.0, {"move_speed": -1})
+        self.ogre.add_status_effect(chill)
+        self._step(30)
+        self.board.remove_unit(self.ogre)
+        self.assertAlmostEqual(chill.remaining_duration, 0.5)
+        self.assertIsNone(self.ogre.status_timers)
+
+
+class TestFrameHooks(unittest.TestCase):
+    """Test that units and teams only call hooks that override the base no-ops."""
+
+    def test_unit_hooks_follow_spell_and_items(self):
+        from content.items import create_item
+        board = Board(headless=True)
+        spirit = create_unit(UnitType.SUN_SPIRIT)
+        board.add_unit(spirit, 1, 1, "player")
+        self.assertEqual(spirit.skill_hooks, [spirit.spell.passive.update])
+        self.assertEqual(spirit.item_hooks, [])
+        blade = create_item("thrumblade")
+        spirit.add_item(create_item("beastheart"))
+        spirit.add_item(blade)
+        self.assertEqual(spirit.item_hooks, [blade.on_frame])
+        spirit.remove_item(blade)
+        self.assertEqual(spirit.item_hooks, [])
+
+    def test_real_hook_kept_next_to_fast_forward_marker(self):
+        from content.items import Item
+        from frame_hooks import has_hook
+
+        class Ticking(Item):
+            frame_timer = None
+
+            def on_frame(self, dt):
+                pass
+
+        self.assertTrue(has_hook(Ticking, 'on_frame'))
+        self.assertFalse(has_hook(type("Plain", (Item,), {}), 'on_frame'))
+
+    def test_team_hooks_skip_augments_without_on_frame(self):
+        from content.augments import GlobalRegenAugment, AttackBoostAugment
+        game = Game(headless=True, seed=3)
+        regen = GlobalRegenAugment()
+        game.player_team.add_augment(AttackBoostAugment())
+        game.player_team.add_augment(regen)
+        self.assertEqual(game.player_team.frame_hooks, [regen.on_frame])
+
+    def test_clear_drops_team_hooks(self):
+        from content.augments import GlobalRegenAugment
+        game = Game(headless=True, seed=3)
+        regen = GlobalRegenAugment()
+        calls = []
+        regen.on_frame = calls.append
+        game.enemy_team.add_augment(regen)
+        game.enemy_team.update(FRAME_TIME)
+        self.assertEqual(calls, [FRAME_TIME])
+        calls.clear()
+        game.enemy_team.clear()
+        self.assertEqual(game.enemy_team.frame_hooks, [])
+        game.enemy_team.update(FRAME_TIME)
+        self.assertEqual(calls, [])
+
+
+class TestDamageFlags(unittest.TestCase):
+    """Test bitmask damage types and the per-unit mitigation cache."""
+
+    def setUp(self):
+        self.board = Board()
+        self.ogre = create_unit(UnitType.BLOOD_OGRE)
+        self.board.add_unit(self.ogre, 1, 1, "player")
+
+    def test_legacy_spellings_match_flags(self):
+        from damage import DamageFlag, DamageType, to_damage_flags, flag_types
+        self.assertEqual(to_damage_flags("magical"), DamageFlag.ARCANE)
+        self.assertEqual(to_damage_flags([DamageType.FIRE, "physical"]),
+                         DamageFlag.FIRE | DamageFlag.PHYSICAL)
+        self.assertEqual(to_damage_flags("unknown"), DamageFlag.NONE)
+        self.assertEqual(flag_types(DamageFlag.ARCANE | DamageFlag.PHYSICAL),
+                         (DamageType.PHYSICAL, DamageType.ARCANE))
+
+    def test_cache_invalidated_by_armor_and_affinities(self):
+        from damage import DamageFlag
+        from unit import ElementalAffinity, DamageType
+        self.ogre.armor = 0
+        hp = self.ogre.hp
+        self.ogre.take_damage(10, DamageFlag.PHYSICAL, None)
+        self.assertAlmostEqual(self.ogre.hp, hp - 10)
+        self.ogre.armor = 100
+        hp = self.ogre.hp
+        self.ogre.take_damage(10, "physical", None)
+        self.assertAlmostEqual(self.ogre.hp, hp - 5)
+        self.ogre.affinities = {DamageType.PHYSICAL: ElementalAffinity.IMMUNE}
+        hp = self.ogre.hp
+        self.ogre.take_damage(10, [DamageType.PHYSICAL], None)
+        self.assertEqual(self.ogre.hp, hp)
+
+
+class TestSeededGame(unittest.TestCase):
+    """Test that a seeded game replays identically and cosmetics don't consume gameplay RNG."""
+
+    def _round_snapshot(self, seed):
+        game = Game(GameMode.ASYNC, seed=seed)
+        game.start_new_round()
+        enemies = [(u.unit_type, u.x, u.y, [i.name for i in u.items]) for u in game.enemy_team.units]
+        shop = [entry.name if hasattr(entry, 'name') else entry.unit_type for entry in game.augment_shop]
+        return enemies, shop, game.rng.random()
+
+    def test_same_seed_same_round(self):
+        self.assertEqual(self._round_snapshot(42), self._round_snapshot(42))
+
+    def test_text_floaters_do_not_touch_gameplay_rng(self):
+        game = Game(GameMode.ASYNC, seed=3)
+        state = game.rng.getstate()
+        for _ in range(10):
+            game.board.make_text_floater("-10", (255, 255, 255), 1, 1)
+        self.assertEqual(game.rng.getstate(), state)
+
+    def test_shops_never_fall_back_to_global_random(self):
+        import random
+        from team import Team
+        from content.augments import generate_augment_shop
+        game = Game(GameMode.ASYNC, seed=7)
+        random.seed(0)
+        state = random.getstate()
+        game.rng.seed(1)
+        first = [entry.name for entry in generate_augment_shop(game.player_team)]
+        game.rng.seed(1)
+        second = [entry.name for entry in generate_augment_shop(game.player_team)]
+        self.assertEqual(first, second)
+        self.assertEqual(random.getstate(), state)
+        with self.assertRaises(ValueError):
+            generate_augment_shop()
+        with self.assertRaises(ValueError):
+            Team("player").rng
+
+
+
+class TestEventBus(unittest.TestCase):
+    """Test subscription-scoped event dispatch."""
+
+    def setUp(self):
+        self.board = Board()
+        self.ogre = create_unit(UnitType.BLOOD_OGRE)
+        self.hound = create_unit(UnitType.CRAZED_THORNHOUND)
+        self.board.add_unit(self.ogre, 1, 1, "player")
+        self.board.add_unit(self.hound, 2, 1, "enemy")
+
+    def test_scoped_item_only_sees_its_own_unit(self):
+        from content.items import CriticalEdge
+        edge = CriticalEdge()
+        self.ogre.add_item(edge)
+        self.board.raise_event("unit_attack", attacker=self.hound, target=self.ogre, damage=10)
+        self.assertEqual(edge.attack_count, 0)
+        self.board.raise_event("unit_attack", attacker=self.ogre, target=self.hound, damage=10)
+        self.assertEqual(edge.attack_count, 1)
+
+    def test_removed_item_is_unsubscribed(self):
+        from content.items import CriticalEdge
+        edge = CriticalEdge()
+        self.ogre.add_item(edge)
+        self.ogre.remove_item(edge)
+        self.board.raise_event("unit_attack", attacker=self.ogre, target=self.hound, damage=10)
+        self.assertEqual(edge.attack_count, 0)
+
+    def test_undeclared_on_event_receives_everything(self):
+        from status_effect import StatusEffect
+
+        class Recorder(StatusEffect):
+            def __init__(self):
+                super().__init__("Recorder", None)
+                self.seen = []
+
+            def on_event(self, event_type, **kwargs):
+                self.seen.append(event_type)
+
+        recorder = Recorder()
+        self.ogre.add_status_effect(recorder)
+        self.board.raise_event("custom_event", value=1)
+        self.assertEqual(recorder.seen, ["custom_event"])
+
+    def test_handlers_fire_in_broadcast_order(self):
+        from skill import Skill
+        from content.items import Item
+        from status_effect import StatusEffect
+        from augment import PassiveAugment
+        log = []
+
+        class PingSkill(Skill):
+            event_subscriptions = (("ping", None),)
+
+            def on_event(self, event_type, **kwargs):
+                log.append(("skill", self.owner.name))
+
+        class PingItem(Item):
+            event_subscriptions = (("ping", "unit"),)
+
+            def on_event(self, event_type, **kwargs):
+                log.append(("item", self.unit.name))
+
+        class PingStatus(StatusEffect):
+            def on_event(self, event_type, **kwargs):
+                log.append(("status", self.unit.name))
+
+        class PingAugment(PassiveAugment):
+            event_subscriptions = (("ping", None),)
+
+            def on_event(self, event_type, **kwargs):
+                log.append(("augment", None))
+
+        board = Board(headless=True)
+        board.events.subscribe_listener(PingAugment("Ping", "", 0))
+        board.add_event_handler("ping", lambda **kwargs: log.append(("handler", None)))
+        enemy = Unit("Enemy", UnitType.SKELETON)
+        player = Unit("Player", UnitType.SKELETON)
+        board.add_unit(enemy, 5, 1, "enemy")
+        board.add_unit(player, 1, 1, "player")
+        for unit in (enemy, player):
+            unit.add_status_effect(PingStatus("Ping", None))
+            unit.add_item(PingItem("Ping", "", 0))
+            unit.set_spell(PingSkill("Ping", ""))
+        board.raise_event("ping", unit=player)
+        self.assertEqual(log, [("handler", None), ("skill", "Player"), ("item", "Player"),
+                               ("status", "Player"), ("skill", "Enemy"), ("status", "Enemy"),
+                               ("augment", None)])
+
+    def test_dead_units_do_not_react(self):
+        from content.items import CriticalEdge
+        edge = CriticalEdge()
+        self.ogre.add_item(edge)
+        self.ogre.take_damage(100000, "physical", self.hound)
+        self.board.raise_event("unit_attack", attacker=self.ogre, target=self.hound, damage=10)
+        self.assertEqual(edge.attack_count, 0)
+
+
+    def test_team_augment_receives_death_events(self):
+        from content.augments import SoulHarvestAugment
+        game = Game(GameMode.ASYNC)
+        game.gold = 1000
+        self.assertTrue(game.purchase_unit(UnitType.BLOOD_OGRE, 3, 3))
+        ogre = game.player_team.units[0]
+        enemy = create_unit(UnitType.CRAZED_THORNHOUND)
+        game.enemy_team.add_unit(enemy, 4, 3)
+
+        augment = SoulHarvestAugment()
+        augment.on_buy(game.player_team)
+        game.player_team.add_augment(augment)
+
+        ogre.hp = 100
+        enemy.take_damage(100000, "physical", ogre)
+        self.assertGreaterEqual(ogre.hp, 500)
+
+        # Cleared teams stop listening
+        game.player_team.clear()
+        self.assertFalse(game.board.events.is_subscribed(augment))
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     unittest.main(verbosity=2)
\ No newline at end of file
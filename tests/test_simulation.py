@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Tests for the headless combat simulation.
+"""
+
+import unittest
+import subprocess
+import sys
+import os
+
+# Add the parent directory (game root) to Python path
+GAME_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GAME_ROOT)
+
+from simulation import simulate_combat, BattlePool
+
+
+PLAYER_SPEC = [
+    {"unit": "blood_ogre", "x": 2, "y": 3},
+    {"unit": "sun_spirit", "x": 1, "y": 4, "items": ["thrumblade"]},
+]
+ENEMY_SPEC = {
+    "units": [{"unit": "red_wyrm", "x": 6, "y": 3}, "void_knight"],
+    "augments": ["ArmorBoostAugment"],
+}
+
+
+class TestSimulateCombat(unittest.TestCase):
+    """Test that headless battles run to completion and are reproducible."""
+
+    def test_battle_completes(self):
+        result = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=1)
+        self.assertIn(result.winner, ("player", "enemy", "draw"))
+        self.assertGreater(result.duration, 0)
+        self.assertEqual(set(result.damage_dealt),
+                         {("player", 0), ("player", 1), ("enemy", 0), ("enemy", 1)})
+        if result.winner != "draw":
+            self.assertTrue(all(team == result.winner for team, _, _, _ in result.survivors))
+
+    def test_same_seed_same_result(self):
+        first = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=7)
+        second = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=7)
+        self.assertEqual(first.to_dict(), second.to_dict())
+
+    def test_no_pygame_import(self):
+        """The simulation path must not pull in pygame."""
+        code = ("import sys; from simulation import simulate_combat; "
+                "simulate_combat(['blood_ogre'], ['red_wyrm'], seed=0); "
+                "print('pygame' in sys.modules)")
+        output = subprocess.check_output([sys.executable, "-c", code], cwd=GAME_ROOT, text=True)
+        self.assertEqual(output.strip(), "False")
+
+
+class TestFastForward(unittest.TestCase):
+    """Test that fast-forward plays out the same battle as fixed stepping."""
+
+    def test_matches_fixed_step(self):
+        for seed in range(3):
+            fixed = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed)
+            fast = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed, fast_forward=True)
+            self.assertEqual(fast.to_dict(), fixed.to_dict())
+
+    def test_steps_fewer_frames(self):
+        from game import Game
+        from simulation import build_team
+        from fast_forward import run_combat
+
+        game = Game(headless=True, seed=3)
+        build_team(game, game.player_team, PLAYER_SPEC)
+        build_team(game, game.enemy_team, ENEMY_SPEC)
+        game.start_combat()
+        stepped = run_combat(game)
+        self.assertLess(stepped, game.combat_frame)
+
+    def test_busy_board_backs_off_scanning(self):
+        from unittest import mock
+        import fast_forward
+        from benchmark import get_scenarios
+        from game import Game
+        from simulation import build_team
+
+        player_spec, enemy_spec = get_scenarios()["full_board"]
+        game = Game(headless=True, seed=0)
+        build_team(game, game.player_team, player_spec)
+        build_team(game, game.enemy_team, enemy_spec)
+        game.max_combat_time = 20.0
+        game.start_combat()
+        with mock.patch.object(fast_forward, "quiet_frames", wraps=fast_forward.quiet_frames) as scan:
+            fast_forward.run_combat(game)
+        # Some unit is due nearly every frame here, so scanning every frame would only add cost
+        self.assertLess(scan.call_count, game.combat_frame / 5)
+
+
+class TestThinkRate(unittest.TestCase):
+    """Test that a capped decision rate only lets units decide on their think ticks."""
+
+    def test_capped_battle_completes_and_fast_forwards(self):
+        for seed in range(2):
+            capped = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed, think_rate=15)
+            self.assertIn(capped.winner, ("player", "enemy", "draw"))
+            fast = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed, think_rate=15, fast_forward=True)
+            self.assertEqual(fast.to_dict(), capped.to_dict())
+
+    def test_idle_unit_decides_once_per_interval(self):
+        from board import Board
+        from content.unit_registry import create_unit
+        from unit import UnitType
+        from constants import FRAME_TIME
+
+        decisions = []
+        for think_rate in (None, 10):
+            board = Board(headless=True, think_rate=think_rate)
+            ogre = create_unit(UnitType.BLOOD_OGRE)
+            board.add_unit(ogre, 1, 1, "player")
+            calls = []
+            ogre.acquire_targets = lambda: calls.append(1) or (None, None)
+            for _ in range(12):
+                ogre.update(FRAME_TIME)
+            decisions.append(len(calls))
+        self.assertEqual(decisions, [12, 2])
+
+    def test_first_decision_waits_for_think_tick(self):
+        from board import Board
+        from content.unit_registry import create_unit
+        from unit import UnitType, UnitState
+        from constants import FRAME_TIME
+
+        board = Board(headless=True, think_rate=10)
+        ogre = create_unit(UnitType.BLOOD_OGRE)
+        hound = create_unit(UnitType.CRAZED_THORNHOUND)
+        board.add_unit(ogre, 1, 1, "player")
+        board.add_unit(hound, 2, 1, "enemy")
+        hound.max_hp = hound.hp = 1e9
+        ogre.base_attack_time = 0.74
+        attack_frames = []
+        for frame in range(300):
+            ogre.update(FRAME_TIME)
+            if ogre.state == UnitState.ATTACKING:
+                attack_frames.append(frame)
+        # The ogre first thinks 0.1s after it is placed, picking its target, then keeps
+        # attacking it whenever its cooldown ends, between its ticks every 6th frame
+        self.assertEqual(attack_frames[:3], [5, 50, 95])
+
+    def test_think_phases_are_staggered(self):
+        from board import Board
+        from content.unit_registry import create_unit
+        from unit import UnitType
+
+        board = Board(headless=True, think_rate=10)
+        units = [create_unit(UnitType.BLOOD_OGRE) for _ in range(8)]
+        for index, unit in enumerate(units):
+            board.add_unit(unit, index, 0, "player" if index % 2 else "enemy")
+        phases = [unit.think_phase for unit in units]
+        self.assertEqual(len(set(phases)), len(phases))
+        self.assertTrue(all(0 < phase <= board.think_interval for phase in phases))
+        # A unit's phase survives the reset at the start of combat
+        units[3].think_timer = 0.05
+        units[3].reset()
+        self.assertEqual(units[3].think_timer, phases[3])
+
+    def test_full_rate_matches_per_frame(self):
+        from benchmark import get_scenarios
+        from constants import FRAME_TIME
+        for name in ("8v8_mixed", "full_board"):
+            player_spec, enemy_spec = get_scenarios()[name]
+            per_frame = simulate_combat(player_spec, enemy_spec, 1, max_combat_time=20)
+            capped = simulate_combat(player_spec, enemy_spec, 1, max_combat_time=20,
+                                     think_rate=1 / FRAME_TIME)
+            with self.subTest(scenario=name):
+                self.assertEqual(capped.to_dict(), per_frame.to_dict())
+
+
+class TestAnalyticProjectiles(unittest.TestCase):
+    """Test that scheduled projectile landings match frame-stepped flight."""
+
+    RANGED_SPEC = ["big_lips", "flame_maiden", "water_nymph", "imp_torturer"]
+
+    def test_battles_match_stepped_flight(self):
+        for seed in range(2):
+            stepped = simulate_combat(self.RANGED_SPEC, self.RANGED_SPEC[::-1], seed)
+            analytic = simulate_combat(self.RANGED_SPEC, self.RANGED_SPEC[::-1], seed,
+                                       analytic_projectiles=True)
+            self.assertEqual(analytic.to_dict(), stepped.to_dict())
+            fast = simulate_combat(self.RANGED_SPEC, self.RANGED_SPEC[::-1], seed,
+                                   analytic_projectiles=True, fast_forward=True)
+            self.assertEqual(fast.to_dict(), stepped.to_dict())
+
+    def test_landing_frame_follows_moving_target(self):
+        from board import Board
+        from projectile import Projectile
+        from unit import Unit, UnitType
+        from constants import FRAME_TIME
+
+        landings = []
+        for analytic in (False, True):
+            board = Board(headless=True, analytic_projectiles=analytic)
+            archer = Unit("Archer", UnitType.SKELETON)
+            target = Unit("Target", UnitType.SKELETON)
+            board.add_unit(archer, 0, 0, "player")
+            board.add_unit(target, 6, 2, "enemy")
+            projectile = Projectile(archer, target, speed=15.0)
+            hits = []
+            projectile.set_on_hit(hits.append)
+            board.add_projectile(projectile)
+            frame = 0
+            while not hits:
+                frame += 1
+                board.update_projectiles(FRAME_TIME)
+                if frame in (10, 14):
+                    board.move_unit(target, target.x + 1, target.y + 1)
+            landings.append((frame, board.projectiles))
+        self.assertEqual(landings[0], landings[1])
+
+    def test_requires_headless_board(self):
+        from board import Board
+        with self.assertRaises(ValueError):
+            Board(analytic_projectiles=True)
+
+
+class TestBattlePool(unittest.TestCase):
+    """Test that pooled batches match serial simulation."""
+
+    def test_pool_matches_serial(self):
+        matchups = [(PLAYER_SPEC, ENEMY_SPEC, seed) for seed in range(4)]
+        with BattlePool(max_workers=2) as pool:
+            streamed = dict(pool.run(matchups, chunksize=3))
+        self.assertEqual(sorted(streamed), [0, 1, 2, 3])
+        for index, (player_spec, enemy_spec, seed) in enumerate(matchups):
+            expected = simulate_combat(player_spec, enemy_spec, seed)
+            self.assertEqual(streamed[index].to_dict(), expected.to_dict())
+
+    def test_pool_passes_simulation_options(self):
+        matchups = [(PLAYER_SPEC, ENEMY_SPEC, 0),
+                    {"player": PLAYER_SPEC, "enemy": ENEMY_SPEC, "seed": 1, "think_rate": 15}]
+        with BattlePool(max_workers=2) as pool:
+            results = pool.map(matchups, fast_forward=True, max_combat_time=5.0)
+        expected = [simulate_combat(PLAYER_SPEC, ENEMY_SPEC, 0, fast_forward=True, max_combat_time=5.0),
+                    simulate_combat(PLAYER_SPEC, ENEMY_SPEC, 1, fast_forward=True, max_combat_time=5.0,
+                                    think_rate=15)]
+        self.assertEqual([result.to_dict() for result in results],
+                         [result.to_dict() for result in expected])
+        self.assertLess(results[0].duration, simulate_combat(PLAYER_SPEC, ENEMY_SPEC, 0).duration)
+
+
+class TestFrameStats(unittest.TestCase):
+    """Test per-subsystem frame timing probes."""
+
+    def test_probed_battle_matches_and_records(self):
+        import tempfile
+        from frame_stats import FrameStats
+
+        stats = FrameStats(window=10000)
+        probed = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=3, probes=[stats])
+        plain = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=3)
+        self.assertEqual(probed.to_dict(), plain.to_dict())
+
+        self.assertEqual(len(stats.frames), probed.frames)
+        summary = stats.summary()
+        for name in ("total", "projectiles", "units", "augments", "events", "damage"):
+            self.assertIn(name, summary)
+        self.assertGreaterEqual(summary["total"]["max"], summary["units"]["max"])
+        self.assertEqual(sum(stats.samples("damage")), sum(stats.samples("event:damage_taken")))
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "frames.csv")
+            stats.to_csv(path)
+            with open(path) as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), probed.frames + 1)
+        self.assertTrue(lines[0].startswith("frame,total_ms,"))
+
+
+class TestContentProfiler(unittest.TestCase):
+    """Test per-class cost attribution of content hooks."""
+
+    def test_profiles_by_concrete_class_and_restores(self):
+        from content_profile import ContentProfiler
+        from skill import Skill
+
+        original = Skill.__dict__["update"]
+        profiler = ContentProfiler()
+        with profiler:
+            profiled = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=2)
+        self.assertIs(Skill.__dict__["update"], original)
+        self.assertEqual(profiled.to_dict(), simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=2).to_dict())
+
+        self.assertIn(("Thrumblade", "on_frame"), profiler.stats)
+        self.assertNotIn("Skill", {stats.class_name for stats in profiler.stats.values()})
+        ranked = profiler.ranked()
+        self.assertGreaterEqual(ranked[0].self_time, ranked[-1].self_time)
+        self.assertIn("Thrumblade.on_frame", profiler.report(limit=100))
+
+
+class TestCombatTrace(unittest.TestCase):
+    """Test Chrome trace export of a battle."""
+
+    def test_trace_is_valid_and_nested(self):
+        import json
+        import tempfile
+        from combat_trace import CombatTracer
+        from skill import Skill
+
+        original = Skill.__dict__["update"]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            with CombatTracer(path, hooks=True, buffer_size=64) as tracer:
+                traced = simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=4, probes=[tracer])
+            with open(path) as f:
+                events = json.load(f)
+
+        self.assertIs(Skill.__dict__["update"], original)
+        self.assertEqual(traced.to_dict(), simulate_combat(PLAYER_SPEC, ENEMY_SPEC, seed=4).to_dict())
+
+        depth = 0
+        for event in events:
+            if event["ph"] == "B":
+                depth += 1
+            elif event["ph"] == "E":
+                depth -= 1
+                self.assertGreaterEqual(depth, 0)
+        self.assertEqual(depth, 0)
+
+        frames = [event for event in events if event.get("cat") == "frame"]
+        self.assertEqual(len(frames), traced.frames)
+        names = {event["name"] for event in events if "name" in event}
+        self.assertIn("units", names)
+        self.assertIn("death", names)
+        self.assertIn("Thrumblade.on_frame", names)
+
+
+class TestFrameWatchdog(unittest.TestCase):
+    """Test slow-frame snapshots and headless replay."""
+
+    def test_capture_and_replay(self):
+        import tempfile
+        from constants import FRAME_TIME
+        from game import Game, GamePhase
+        from simulation import build_team
+        from frame_watchdog import SlowFrameWatchdog, replay
+
+        with tempfile.TemporaryDirectory() as directory:
+            game = Game(headless=False, seed=6)
+            # A budget of zero makes every frame slow
+            watchdog = SlowFrameWatchdog(directory, budget_ms=0, checkpoint_interval=20,
+                                         profile_frames=3, keep=2, cooldown_frames=50)
+            game.board.add_probe(watchdog)
+            build_team(game, game.player_team, PLAYER_SPEC)
+            build_team(game, game.enemy_team, ENEMY_SPEC)
+            game.start_combat()
+            live = {}
+            while game.phase == GamePhase.COMBAT:
+                game.update_combat(FRAME_TIME)
+                live[game.combat_frame] = [(unit.name, unit.hp) for unit in game.board.get_all_units()]
+
+            self.assertEqual(len(watchdog.captures), 2)
+            self.assertEqual(len(os.listdir(directory)), 2)
+            capture = watchdog.captures[-1]
+            self.assertTrue(os.path.exists(os.path.join(capture, "profile.txt")))
+
+            replayed, snapshot, times, profiler = replay(capture)
+            self.assertTrue(replayed.board.headless)
+            self.assertEqual(replayed.combat_frame, snapshot["slow_frame"])
+            self.assertEqual(len(times), snapshot["slow_frame"] - snapshot["checkpoint_frame"] + 1)
+            self.assertEqual([(unit.name, unit.hp) for unit in replayed.board.get_all_units()],
+                             live[snapshot["slow_frame"]])
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test the benchmark scenarios and baseline comparison."""
+
+    def test_scenarios_build_and_fight(self):
+        import benchmark
+        player_spec, enemy_spec = benchmark.get_scenarios()["full_board"]
+        result = simulate_combat(player_spec, enemy_spec, seed=0, max_combat_time=2.0)
+        self.assertGreater(result.frames, 0)
+
+    def test_compare_direction(self):
+        import benchmark
+        baseline = {"scenarios": {"a": {"frames_per_sec": 100.0}}, "functions": {"shop_ms": 1.0}}
+        current = {"scenarios": {"a": {"frames_per_sec": 150.0}}, "functions": {"shop_ms": 2.0}}
+        rows = {row[0]: row for row in benchmark.compare_results(current, baseline)}
+        self.assertEqual(rows["a.frames_per_sec"][4], "faster")
+        self.assertEqual(rows["shop_ms"][4], "slower")
+
+    def test_vectorized_warning_below_min_units(self):
+        import benchmark
+        big = [{"unit": "blood_ogre"}] * (benchmark.VECTORIZED_MIN_UNITS // 2)
+        warnings = benchmark.vectorized_warnings({"small": (PLAYER_SPEC, ENEMY_SPEC), "big": (big, big)})
+        self.assertEqual(len(warnings), 1)
+        self.assertTrue(warnings[0].startswith("small:"))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
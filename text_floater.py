@@ -1,8 +1,7 @@
-import pygame
 import random
 
 class TextFloater:
-    def __init__(self, x: int, y: int, text: str, color: tuple):
+    def __init__(self, x: int, y: int, text: str, color: tuple, rng=random):
         self.grid_x = x  # Store grid coordinates
         self.grid_y = y
         self.text = str(text)
@@ -17,7 +16,7 @@ class TextFloater:
         self.vertical_offset = 0.0  # Track total vertical movement in pixels
         
         # Add small random horizontal offset to prevent overlap (in pixels)
-        self.horizontal_offset = random.uniform(-10, 10)
+        self.horizontal_offset = rng.uniform(-10, 10)
         
     def update(self, dt: float):
         """Update the text floater position and lifetime."""
@@ -42,7 +41,7 @@ class TextFloater:
             fade_progress = self.lifetime / self.fade_start_time
             return int(255 * fade_progress)
             
-    def draw(self, screen: pygame.Surface, font: pygame.font.Font, board_x: int, board_y: int, tile_size: int):
+    def draw(self, screen: "pygame.Surface", font: "pygame.font.Font", board_x: int, board_y: int, tile_size: int):
         """Draw the text floater on the screen."""
         if not self.is_alive():
             return
@@ -67,12 +66,13 @@ class TextFloater:
 
 
 class TextFloaterManager:
-    def __init__(self):
+    def __init__(self, rng=random):
         self.text_floaters = []
+        self.rng = rng  # Cosmetic stream only - never the gameplay RNG
         
     def add_text_floater(self, x: int, y: int, text: str, color: tuple):
         """Add a new text floater at the specified grid position."""
-        floater = TextFloater(x, y, text, color)
+        floater = TextFloater(x, y, text, color, self.rng)
         self.text_floaters.append(floater)
         
     def update(self, dt: float):
@@ -81,7 +81,7 @@ class TextFloaterManager:
         for floater in self.text_floaters:
             floater.update(dt)
             
-    def draw(self, screen: pygame.Surface, font: pygame.font.Font, board_x: int, board_y: int, tile_size: int):
+    def draw(self, screen: "pygame.Surface", font: "pygame.font.Font", board_x: int, board_y: int, tile_size: int):
         """Draw all active text floaters."""
         for floater in self.text_floaters:
             floater.draw(screen, font, board_x, board_y, tile_size)
@@ -1,6 +1,12 @@
+import functools
 from enum import Enum
 from typing import List, Optional
 import math
+from damage import (DamageType, DamageFlag, DamageHit, PRE_MITIGATION, ABSORB, POST_DAMAGE,
+                    to_damage_flags, flag_types)
+from stats import Stat, STAT_NAMES
+from frame_hooks import bound_hooks
+from constants import TIMER_EPSILON
 
 class UnitState(Enum):
     IDLE = "idle"
@@ -8,16 +14,6 @@ class UnitState(Enum):
     ATTACKING = "attacking"
     CASTING = "casting"
 
-class DamageType(Enum):
-    PHYSICAL = "physical"
-    FIRE = "fire"
-    ICE = "ice"
-    LIGHTNING = "lightning"
-    HOLY = "holy"
-    DARK = "dark"
-    ARCANE = "arcane"
-    POISON = "poison"
-
 class ElementalAffinity(Enum):
     IMMUNE = "immune"       # 100% reduction (multiplier 0.0)
     STRONG = "strong"       # 50% reduction (multiplier 0.5)
@@ -58,6 +54,19 @@ class UnitType(Enum):
 
 class Unit:
     _next_id = 0
+
+    # Base value plus modifier layers; see stats.py
+    max_hp = Stat()
+    hp_regen = Stat()
+    mp_regen = Stat()
+    strength = Stat()
+    intelligence = Stat()
+    armor = Stat()
+    magic_resist = Stat()
+    attack_damage = Stat()
+    attack_range = Stat()
+    attack_speed = Stat()
+    move_speed = Stat()
     
     def __init__(self, name: str, unit_type: UnitType):
         self.id = Unit._next_id
@@ -65,6 +74,17 @@ class Unit:
         self.name = name
         self.unit_type = unit_type
         self.team = None
+
+        self.base_stats = {}
+        self.stat_modifiers = {}     # key -> {stat: flat amount}
+        self.stat_multipliers = {}   # key -> {stat: factor}
+        self.stat_cache = {}         # stat -> effective value, missing while dirty
+        # DamageFlag -> (mitigation, affinity multiplier), cleared when armor,
+        # magic_resist or affinities change
+        self.damage_multipliers = {}
+        # Set while the board's UnitStore holds this unit's timers (see unit_store.py)
+        self.unit_store = None
+        self.store_row = None
         self.x = 0
         self.y = 0
         self.original_x = 0
@@ -100,10 +120,25 @@ class Unit:
         
         self.spell = None
         self.items = []
-        self.status_effects = []
+        # Bound skill update / item on_frame hooks that are not no-ops (see frame_hooks.py)
+        self.skill_hooks = []
+        self.item_hooks = []
+        self.status_effects = {}  # name -> effect, in the order they were added
+        # Set while on a board, whose StatusTimers queues due statuses here (see status_timers.py)
+        self.status_timers = None
+        self.due_statuses = []
+        # Damage pipeline stage -> tuple of interceptors protecting this unit (see damage.py)
+        self.damage_interceptors = {}
         
         self.state = UnitState.IDLE
         self.target = None
+        # (board layout_version, attack_range, enemy in attack range, nearest enemy);
+        # see acquire_targets
+        self.target_cache = None
+        # Seconds until this unit's next think tick, and where in the think interval its
+        # ticks fall; only used when the board has a think_rate (set by the board)
+        self.think_timer = 0
+        self.think_phase = 0
         self.cast_skill = None
         self.cast_timer = 0
         self.cast_time = 0
@@ -112,6 +147,8 @@ class Unit:
         self.move_speed = 2.0
         
         self.board = None
+        self.events_subscribed = False  # Set by the board while this unit's listeners are on its event bus
+        self.event_order = ()  # Set by the board: where this unit's listeners fire (see event_bus.py)
         self.is_summoned = False
         self.summoner = None
         
@@ -124,6 +161,25 @@ class Unit:
         self.death_timer = 0
         self.cast_jump_timer = 0
 
+    @property
+    def affinities(self):
+        # Assign a new dict to change affinities; edits in place are not seen by the damage cache
+        return self._affinities
+
+    @affinities.setter
+    def affinities(self, value):
+        self._affinities = value
+        self.damage_multipliers = {}
+
+    @property
+    def attack_damage_types(self):
+        return self._attack_damage_types
+
+    @attack_damage_types.setter
+    def attack_damage_types(self, value):
+        self._attack_damage_types = value
+        self.attack_damage_flags = to_damage_flags(value)
+
     def is_alive(self) -> bool:
         return self.hp > 0
     
@@ -154,28 +210,30 @@ class Unit:
         # Check if this is a ranged attack
         distance = self.board.get_distance(self, target)
         if distance > 1:  # Ranged attack - create projectile
-            from projectile import Projectile
+            from projectile import Projectile, deal_projectile_damage
             projectile = Projectile(self, target, speed=15.0)
             projectile.damage = damage
             projectile.damage_types = damage_types
-            projectile.on_hit_callback = lambda tgt: tgt.take_damage(projectile.damage, projectile.damage_types, self)
+            projectile.damage_flags = self.attack_damage_flags
+            projectile.on_hit_callback = functools.partial(deal_projectile_damage, projectile, self)
             self.board.add_projectile(projectile)
         else:  # Melee attack - direct damage
-            target.take_damage(damage, damage_types, self)
+            target.take_damage(damage, self.attack_damage_flags, self, is_attack=True)
 
         # Visual effect - bump towards target
-        dx = target.x - self.x
-        dy = target.y - self.y
-        if dx != 0:
-            dx = dx / abs(dx)
-        if dy != 0:
-            dy = dy / abs(dy)
-        self.bump_direction = (dx * 0.6, dy * 0.6)
-        self.bump_timer = 0.3
+        if not self.board.headless:
+            dx = target.x - self.x
+            dy = target.y - self.y
+            if dx != 0:
+                dx = dx / abs(dx)
+            if dy != 0:
+                dy = dy / abs(dy)
+            self.bump_direction = (dx * 0.6, dy * 0.6)
+            self.bump_timer = 0.3
 
         self.board.raise_event("unit_attack", attacker=self, target=target, damage=damage)
     
-    def take_damage(self, amount: float, damage_types, source):
+    def take_damage(self, amount: float, damage_types, source, is_attack: bool = False):
         """Take damage with the given damage types.
 
         damage_types can be:
@@ -183,44 +241,68 @@ class Unit:
         - A single DamageType enum
         - A string like "physical", "fire", etc. (legacy compatibility)
         - A list of strings (legacy compatibility)
+
+        The hit passes through this unit's damage interceptors (see damage.py).
+        is_attack marks basic attacks, which dodge can block.
         """
         if not self.is_alive():
             return
 
-        # Normalize damage_types to a list of DamageType enums
-        damage_types = self._normalize_damage_types(damage_types)
+        if self.board.probes:
+            self.board.probe_count("damage")
+
+        flags = damage_types if type(damage_types) is DamageFlag else to_damage_flags(damage_types)
+
+        interceptors = self.damage_interceptors
+        hit = None
+        if interceptors:
+            hit = DamageHit(self, amount, flags, source, is_attack)
+            for interceptor in interceptors.get(PRE_MITIGATION, ()):
+                interceptor.pre_mitigation(hit)
+            if hit.blocked:
+                return 0
+            amount = hit.amount
 
         # Grant mana based on pre-mitigation damage
         if self.spell and self.state != UnitState.CASTING:
             self.spell.add_mana(amount * 0.02)
 
-        # Calculate armor/resist mitigation
-        has_physical = DamageType.PHYSICAL in damage_types
-        has_non_physical = any(dt != DamageType.PHYSICAL for dt in damage_types)
-
-        if has_physical and not has_non_physical:
-            mitigation = 100 / (100 + self.armor)
-        elif has_non_physical and not has_physical:
-            mitigation = 100 / (100 + self.magic_resist)
-        elif has_physical and has_non_physical:
-            # Mixed: average of both mitigations
-            phys_mit = 100 / (100 + self.armor)
-            magic_mit = 100 / (100 + self.magic_resist)
-            mitigation = (phys_mit + magic_mit) / 2
-        else:
-            mitigation = 1.0
-
-        # Apply elemental affinity multiplier (worst case for attacker = best for defender)
-        # If any type is immune, all damage is blocked
-        # Otherwise multiply: use the product of all affinity multipliers
-        affinity_mult = 1.0
-        for dt in damage_types:
-            if dt in self.affinities:
-                affinity_mult *= AFFINITY_MULTIPLIERS[self.affinities[dt]]
+        multipliers = self.damage_multipliers.get(flags)
+        if multipliers is None:
+            multipliers = self._damage_multipliers(flags)
+        mitigation, affinity_mult = multipliers
 
         actual_damage = amount * mitigation * affinity_mult
+        if hit:
+            hit.amount = actual_damage
+            for interceptor in interceptors.get(ABSORB, ()):
+                if hit.amount <= 0:
+                    break
+                interceptor.absorb(hit)
+            actual_damage = hit.amount
         self.hp -= actual_damage
+        if hit:
+            for interceptor in interceptors.get(POST_DAMAGE, ()):
+                interceptor.post_damage(hit)
+
+        damage_types = flag_types(flags)
+        if not self.board.headless:
+            self._show_damage(actual_damage, damage_types, source)
+
+        self.board.raise_event("damage_taken",
+                              unit=self,
+                              damage=actual_damage,
+                              damage_types=damage_types,
+                              source=source)
+
+        if self.hp <= 0:
+            self.hp = 0
+            self.die(source)
 
+        return actual_damage
+
+    def _show_damage(self, actual_damage: float, damage_types, source):
+        """Presentation for a hit: drain animation, flash, floater, combat log and sound."""
         # Start/extend damage drain animation
         self.damage_anim_timer = 0.5
 
@@ -247,47 +329,36 @@ class Unit:
             if hasattr(self.board.game, 'ui') and self.board.game.ui:
                 self.board.game.ui.play_sound('hit')
 
-        self.board.raise_event("damage_taken",
-                              unit=self,
-                              damage=actual_damage,
-                              damage_types=damage_types,
-                              source=source)
+    def _damage_multipliers(self, flags: DamageFlag):
+        """(mitigation, affinity multiplier) for hits of the given types, cached per mask"""
+        # Calculate armor/resist mitigation
+        has_physical = bool(flags & DamageFlag.PHYSICAL)
+        has_non_physical = bool(flags & ~DamageFlag.PHYSICAL)
 
-        if self.hp <= 0:
-            self.hp = 0
-            self.die(source)
+        if has_physical and not has_non_physical:
+            mitigation = 100 / (100 + self.armor)
+        elif has_non_physical and not has_physical:
+            mitigation = 100 / (100 + self.magic_resist)
+        elif has_physical and has_non_physical:
+            # Mixed: average of both mitigations
+            phys_mit = 100 / (100 + self.armor)
+            magic_mit = 100 / (100 + self.magic_resist)
+            mitigation = (phys_mit + magic_mit) / 2
+        else:
+            mitigation = 1.0
 
-        return actual_damage
+        # Apply elemental affinity multiplier (worst case for attacker = best for defender)
+        # If any type is immune, all damage is blocked
+        # Otherwise multiply: use the product of all affinity multipliers
+        affinity_mult = 1.0
+        for dt in flag_types(flags):
+            if dt in self.affinities:
+                affinity_mult *= AFFINITY_MULTIPLIERS[self.affinities[dt]]
+
+        multipliers = (mitigation, affinity_mult)
+        self.damage_multipliers[flags] = multipliers
+        return multipliers
 
-    @staticmethod
-    def _normalize_damage_types(damage_types):
-        """Normalize damage_types to a list of DamageType enums."""
-        if damage_types is None:
-            return []
-        if isinstance(damage_types, DamageType):
-            return [damage_types]
-        if isinstance(damage_types, str):
-            # Legacy string support
-            try:
-                return [DamageType(damage_types)]
-            except ValueError:
-                if damage_types == "magical":
-                    return [DamageType.ARCANE]
-                return []
-        if isinstance(damage_types, list):
-            result = []
-            for dt in damage_types:
-                if isinstance(dt, DamageType):
-                    result.append(dt)
-                elif isinstance(dt, str):
-                    try:
-                        result.append(DamageType(dt))
-                    except ValueError:
-                        if dt == "magical":
-                            result.append(DamageType.ARCANE)
-            return result
-        return []
-    
     def heal(self, amount: float, source):
         if not self.is_alive():
             return
@@ -297,7 +368,7 @@ class Unit:
         actual_heal = self.hp - old_hp
 
         # Start heal fill animation
-        if actual_heal > 0:
+        if actual_heal > 0 and not self.board.headless:
             self.heal_anim_timer = 0.5
 
             # Visual effect - bright green flash on heal
@@ -317,7 +388,7 @@ class Unit:
         self.flash_color = (255, 0, 0)
 
         # Add to combat log and play death sound
-        if self.board.game:
+        if self.board.game and not self.board.headless:
             killer_name = killer.name if hasattr(killer, 'name') else "Unknown"
             self.board.game.add_message(f"{self.name} is slain by {killer_name}")
             # Play death sound
@@ -326,7 +397,8 @@ class Unit:
         
         # Add corpse to the board for necromancer abilities
         self.board.add_corpse(self.x, self.y, self)
-        
+
+        self.board.notify_death(self)
         self.board.raise_event("unit_death", unit=self, killer=killer)
         self.board.raise_event("death", dying_unit=self, killer=killer)
     
@@ -352,18 +424,19 @@ class Unit:
         self.cast_timer = 0
         self.cast_time = skill.cast_time
 
-        # Visual effect - continuous purple glow during cast
-        self.flash_color = (128, 0, 255)
-        self.flash_timer = skill.cast_time  # Glow for entire cast duration
-        self.flash_duration = skill.cast_time
-        # Don't jump up immediately - will jump at cast completion
+        if not self.board.headless:
+            # Visual effect - continuous purple glow during cast
+            self.flash_color = (128, 0, 255)
+            self.flash_timer = skill.cast_time  # Glow for entire cast duration
+            self.flash_duration = skill.cast_time
+            # Don't jump up immediately - will jump at cast completion
 
-        # Text floater for beginning cast
-        self.board.make_text_floater(f"Casting {skill.name}...", (128, 0, 255), unit=self)
-        
-        # Add to combat log
-        if self.board.game:
-            self.board.game.add_message(f"{self.name} begins casting {skill.name}")
+            # Text floater for beginning cast
+            self.board.make_text_floater(f"Casting {skill.name}...", (128, 0, 255), unit=self)
+
+            # Add to combat log
+            if self.board.game:
+                self.board.game.add_message(f"{self.name} begins casting {skill.name}")
         
         self.board.raise_event("spell_cast", caster=self, skill=skill)
         return True
@@ -376,15 +449,20 @@ class Unit:
         return False
     
     def update(self, dt: float):
+        headless = self.board.headless
+        # Regen and timers were already advanced for the whole board by its UnitStore
+        vectorized = self.store_row is not None
+
         # Update visual effects
-        if self.flash_timer > 0:
-            self.flash_timer -= dt
-            
-        if self.bump_timer > 0:
-            self.bump_timer -= dt
-            
-        if self.cast_jump_timer > 0:
-            self.cast_jump_timer -= dt
+        if not headless and not vectorized:
+            if self.flash_timer > 0:
+                self.flash_timer -= dt
+
+            if self.bump_timer > 0:
+                self.bump_timer -= dt
+
+            if self.cast_jump_timer > 0:
+                self.cast_jump_timer -= dt
 
         if self.death_timer > 0:
             self.death_timer -= dt
@@ -394,11 +472,14 @@ class Unit:
                 
         if not self.is_alive():
             return
-            
-        self.hp = min(self.hp + self.hp_regen * dt, self.max_hp)
+
+        if not vectorized:
+            self.hp = min(self.hp + self.hp_regen * dt, self.max_hp)
 
         # Update damage drain animation
-        if self.damage_anim_timer > 0 and self.old_cur_hp > self.hp:
+        if headless:
+            pass
+        elif self.damage_anim_timer > 0 and self.old_cur_hp > self.hp:
             drain_rate = (self.old_cur_hp - self.hp) / self.damage_anim_timer
             self.old_cur_hp -= drain_rate * dt
             self.damage_anim_timer -= dt
@@ -415,42 +496,51 @@ class Unit:
             # No animation active, snap to actual hp
             self.old_cur_hp = self.hp
 
-        # Add mp_regen to spell if not casting
-        if self.spell and self.state != UnitState.CASTING:
-            self.spell.add_mana(self.mp_regen * dt)
-        
-        if self.attack_timer > 0:
-            self.attack_timer -= dt
+        if not vectorized:
+            # Add mp_regen to spell if not casting
+            if self.spell and self.state != UnitState.CASTING:
+                self.spell.add_mana(self.mp_regen * dt)
+
+            if self.attack_timer > 0:
+                self.attack_timer -= dt
+
+        # With a think_rate, decisions only happen on this unit's think ticks
+        think_tick = True
+        think_interval = self.board.think_interval
+        if think_interval:
+            self.think_timer -= dt
+            think_tick = self.think_timer <= TIMER_EPSILON
+            while self.think_timer <= TIMER_EPSILON:
+                self.think_timer += think_interval
             
         # Update all skills
-        for skill in self.iter_skills():
-            skill.update(dt)
+        for update in self.skill_hooks:
+            update(dt)
             
-        for status in self.status_effects[:]:
-            status.update(dt)
-            if status.is_expired():
-                self.remove_status_effect(status)
+        if self.due_statuses:
+            self.status_timers.wake(self)
         
         # Update all items
-        for item in self.items:
-            if hasattr(item, 'on_frame'):
-                item.on_frame(dt)
+        for on_frame in self.item_hooks:
+            on_frame(dt)
                 
         if self.state == UnitState.CASTING:
-            self.cast_timer += dt
+            if not vectorized:
+                self.cast_timer += dt
             if self.cast_timer >= self.cast_time:
-                # Visual effect - bump up when cast completes
-                self.cast_jump_timer = 0.3
+                if not headless:
+                    # Visual effect - bump up when cast completes
+                    self.cast_jump_timer = 0.3
 
-                # Text floater for completing cast
-                self.board.make_text_floater(f"Casts {self.cast_skill.name}!", (128, 0, 255), unit=self)
+                    # Text floater for completing cast
+                    self.board.make_text_floater(f"Casts {self.cast_skill.name}!", (128, 0, 255), unit=self)
 
-                # Add to combat log and play spell sound
-                if self.board.game:
-                    self.board.game.add_message(f"{self.name} casts {self.cast_skill.name}!")
-                    # Play spell sound
-                    if hasattr(self.board.game, 'ui') and self.board.game.ui:
-                        self.board.game.ui.play_sound('spell')
+                    # Add to combat log and play spell sound
+                    if self.board.game:
+                        self.board.game.add_message(f"{self.name} casts {self.cast_skill.name}!")
+                        # Play spell sound
+                        if hasattr(self.board.game, 'ui') and self.board.game.ui:
+                            self.board.game.ui.play_sound('spell')
 
                 self.cast_skill.execute(self)
                 self.cast_skill.current_mana = 0  # Reset mana after casting
@@ -461,7 +551,8 @@ class Unit:
             self.state = UnitState.IDLE
             
         elif self.state == UnitState.WALKING:
-            self.move_timer -= dt
+            if not vectorized:
+                self.move_timer -= dt
             if self.move_timer <= 0:
                 self.state = UnitState.IDLE
                 
@@ -469,6 +560,12 @@ class Unit:
             # Don't take any actions while attack is on cooldown
             if self.attack_timer > 0:
                 return
+            # Between think ticks, only carry out the last decision: keep attacking
+            # the target it picked
+            if not think_tick:
+                if self.target and self.target.is_alive() and self.can_attack(self.target):
+                    self.attack(self.target)
+                return
                 
             if self.try_cast_spell():
                 return
@@ -477,23 +574,37 @@ class Unit:
                 self.attack(self.target)
                 return
                 
-            # Check if we can attack any enemy in range first
-            enemies = self.board.enemy_units if self.team == "player" else self.board.player_units
-            enemies_in_range = [enemy for enemy in enemies if enemy.is_alive() and self.can_attack(enemy)]
-            
-            if enemies_in_range:
-                # Attack the first enemy in range
-                self.attack(enemies_in_range[0])
-            else:
-                # For ranged units, check if any enemies are within attack range before moving
-                enemies_in_attack_range = [enemy for enemy in enemies if enemy.is_alive() and 
-                                         self.board.get_distance(self, enemy) <= self.attack_range]
-                
-                if not enemies_in_attack_range:
-                    # Only move if no enemies are within attack range
-                    nearest_enemy = self.board.get_nearest_enemy(self)
-                    if nearest_enemy:
-                        self.move_towards(nearest_enemy)
+            # Attack the first enemy in range; only move if there is none
+            enemy_in_range, nearest_enemy = self.acquire_targets()
+            if enemy_in_range:
+                self.attack(enemy_in_range)
+            elif nearest_enemy:
+                self.move_towards(nearest_enemy)
+
+    def acquire_targets(self):
+        """(enemy to attack, enemy to walk towards) for an idle unit with its attack ready.
+
+        The first is the first living enemy within attack range. Only when there is none
+        is the second looked up, as the nearest enemy. Both are cached until a unit is
+        added, moves, dies or is removed, or attack_range changes.
+        """
+        board = self.board
+        attack_range = self.attack_range
+        cache = self.target_cache
+        if cache is not None and cache[0] == board.layout_version and cache[1] == attack_range:
+            return cache[2], cache[3]
+
+        enemy_in_range = None
+        nearest_enemy = None
+        if board.has_enemy_in_range(self, attack_range):
+            for enemy in board.get_living_enemies(self.team):
+                if board.get_distance(self, enemy) <= attack_range:
+                    enemy_in_range = enemy
+                    break
+        else:
+            nearest_enemy = board.get_nearest_enemy(self)
+        self.target_cache = (board.layout_version, attack_range, enemy_in_range, nearest_enemy)
+        return enemy_in_range, nearest_enemy
     
         
     def move_towards(self, target):
@@ -502,20 +613,18 @@ class Unit:
         if self.immobile:
             return
 
-        path = self.board.find_path(self.x, self.y, target.x, target.y)
-        if len(path) > 1:
-            next_pos = path[1]
+        next_pos = self.board.get_next_step(self, target)
+        if next_pos:
             if self.board.move_unit(self, next_pos[0], next_pos[1]):
                 self.state = UnitState.WALKING
                 self.move_timer = 1.0 / self.move_speed
     
     def reset(self):
         """Reset unit to fresh state for new round."""
-        # Basic stats
-        # Properly remove all status effects (so stat modifiers are reverted)
-        for effect in self.status_effects[:]:  # Copy list to avoid modification during iteration
-            effect.remove(self)
-        self.status_effects.clear()
+        # Remove all status effects, then every remaining stat layer (augment growth,
+        # armor shred from enemies); items re-apply theirs below
+        self.clear_status_effects()
+        self.clear_stat_modifiers()
 
         # Now reset HP after status effects are removed
         self.hp = self.max_hp
@@ -527,7 +636,7 @@ class Unit:
         if self.spell:
             self.spell.current_mana = 0
             
-        # Reset items - remove and re-apply to clear temporary bonuses
+        # Reset items - remove and re-apply to clear their counters
         items_to_reset = self.items.copy()  # Copy list to avoid modification during iteration
         for item in items_to_reset:
             item.remove_from_unit(self)
@@ -535,6 +644,8 @@ class Unit:
         
         # Combat state
         self.target = None
+        self.target_cache = None
+        self.think_timer = self.think_phase
         self.state = UnitState.IDLE
         self.attack_timer = 0
         
@@ -558,94 +669,191 @@ class Unit:
         # Spells no longer have cooldowns
     
     def set_spell(self, spell):
+        if self.events_subscribed:
+            for skill in self.iter_skills():
+                self.board.events.unsubscribe_listener(skill)
+        if self.unit_store:
+            self.unit_store.unbind_spell(self)
         self.spell = spell
         if spell:
             spell.owner = self
             spell.current_mana = 0  # Start with 0 mana
+            if getattr(spell, 'passive', None):
+                spell.passive.owner = self
+        if self.unit_store:
+            self.unit_store.bind_spell(self)
+        if self.events_subscribed:
+            for skill in self.iter_skills():
+                self.board.events.subscribe_listener(skill, self)
+        self.bind_frame_hooks()
         return True
     
     def iter_skills(self):
-        """Iterate over all skills"""
+        """Iterate over all skills, including the spell's attached passive"""
         if self.spell:
             yield self.spell
+            passive = getattr(self.spell, 'passive', None)
+            if passive:
+                yield passive
     
+    def bind_frame_hooks(self):
+        """Rebuild the skill and item hooks Unit.update calls each frame"""
+        self.skill_hooks = bound_hooks(self.iter_skills(), 'update')
+        self.item_hooks = bound_hooks(self.items, 'on_frame')
+
     def add_item(self, item):
         if len(self.items) >= 3:
             return False
         self.items.append(item)
         item.apply_to_unit(self)
+        self.bind_frame_hooks()
+        if self.events_subscribed:
+            self.board.events.subscribe_listener(item, self)
         return True
     
     def remove_item(self, item):
         if item in self.items:
             self.items.remove(item)
             item.remove_from_unit(self)
+            self.bind_frame_hooks()
+            if self.events_subscribed:
+                self.board.events.unsubscribe_listener(item)
     
     def add_status_effect(self, status_effect):
         from status_effect import StackType
 
         # Check if a status effect with the same name already exists
-        for existing_effect in self.status_effects:
-            if existing_effect.name == status_effect.name:
-                # Handle stacking based on stack_type
-                if status_effect.stack_type == StackType.STACK_INTENSITY:
-                    # Increment intensity/stacks
-                    existing_effect.stacks += status_effect.stacks
-                    # Apply additional stat changes for StatModifierEffect
-                    if hasattr(status_effect, 'stat_modifiers') and status_effect.stat_modifiers:
-                        for stat, value in status_effect.stat_modifiers.items():
-                            if hasattr(self, stat):
-                                setattr(self, stat, getattr(self, stat) + value)
-                    # Refresh duration if new effect has longer duration
-                    if status_effect.remaining_duration is not None:
-                        if existing_effect.remaining_duration is None:
-                            existing_effect.remaining_duration = status_effect.remaining_duration
-                        else:
-                            existing_effect.remaining_duration = max(existing_effect.remaining_duration, status_effect.remaining_duration)
-                elif status_effect.stack_type == StackType.STACK_DURATION:
-                    # Refresh/extend duration
-                    if status_effect.remaining_duration is not None:
-                        if existing_effect.remaining_duration is None:
-                            existing_effect.remaining_duration = status_effect.remaining_duration
-                        else:
-                            existing_effect.remaining_duration = max(existing_effect.remaining_duration, status_effect.remaining_duration)
-                return
+        existing_effect = self.status_effects.get(status_effect.name)
+        if existing_effect is not None:
+            if self.status_timers:
+                self.status_timers.sync(existing_effect)
+            # Handle stacking based on stack_type
+            if status_effect.stack_type == StackType.STACK_INTENSITY:
+                # Increment intensity/stacks
+                existing_effect.stacks += status_effect.stacks
+                # Add the new stack's stat changes to the existing effect's layer
+                if status_effect.stat_modifiers:
+                    self.add_stat_modifier(existing_effect, status_effect.stat_modifiers)
+                # Refresh duration if new effect has longer duration
+                if status_effect.remaining_duration is not None:
+                    if existing_effect.remaining_duration is None:
+                        existing_effect.remaining_duration = status_effect.remaining_duration
+                    else:
+                        existing_effect.remaining_duration = max(existing_effect.remaining_duration, status_effect.remaining_duration)
+            elif status_effect.stack_type == StackType.STACK_DURATION:
+                # Refresh/extend duration
+                if status_effect.remaining_duration is not None:
+                    if existing_effect.remaining_duration is None:
+                        existing_effect.remaining_duration = status_effect.remaining_duration
+                    else:
+                        existing_effect.remaining_duration = max(existing_effect.remaining_duration, status_effect.remaining_duration)
+            if self.status_timers:
+                self.status_timers.schedule(existing_effect)
+            return
 
         # No existing effect found, add the new one
-        self.status_effects.append(status_effect)
+        self.status_effects[status_effect.name] = status_effect
         status_effect.apply(self)
+        if self.status_timers:
+            self.status_timers.schedule(status_effect)
+        if status_effect.damage_stages:
+            self.add_damage_interceptor(status_effect)
+        if self.events_subscribed:
+            self.board.events.subscribe_listener(status_effect, self)
     
     def remove_status_effect(self, status_effect):
-        if status_effect in self.status_effects:
-            self.status_effects.remove(status_effect)
+        if self.status_effects.get(status_effect.name) is status_effect:
+            del self.status_effects[status_effect.name]
             status_effect.remove(self)
+            if self.status_timers:
+                self.status_timers.unschedule(status_effect)
+            if status_effect.damage_stages:
+                self.remove_damage_interceptor(status_effect)
+            if self.events_subscribed:
+                self.board.events.unsubscribe_listener(status_effect)
+
+    def clear_status_effects(self):
+        """Remove every status effect, reverting their stat modifiers"""
+        for effect in list(self.status_effects.values()):  # Copy to avoid modification during iteration
+            effect.remove(self)
+            if self.status_timers:
+                self.status_timers.unschedule(effect)
+            if effect.damage_stages:
+                self.remove_damage_interceptor(effect)
+            if self.events_subscribed:
+                self.board.events.unsubscribe_listener(effect)
+        self.status_effects.clear()
+        self.due_statuses = []
+
+    def add_damage_interceptor(self, interceptor):
+        """Run interceptor's damage_stages methods on every hit this unit takes"""
+        for stage in interceptor.damage_stages:
+            self.damage_interceptors[stage] = self.damage_interceptors.get(stage, ()) + (interceptor,)
+
+    def remove_damage_interceptor(self, interceptor):
+        for stage in interceptor.damage_stages:
+            remaining = tuple(i for i in self.damage_interceptors.get(stage, ()) if i is not interceptor)
+            if remaining:
+                self.damage_interceptors[stage] = remaining
+            else:
+                self.damage_interceptors.pop(stage, None)
     
+    def recompute_stat(self, stat: str):
+        """Work out stat from its base value and layers and cache it"""
+        value = self.base_stats.get(stat, 0)
+        for layer in self.stat_modifiers.values():
+            if stat in layer:
+                value += layer[stat]
+        for layer in self.stat_multipliers.values():
+            if stat in layer:
+                value *= layer[stat]
+        self.stat_cache[stat] = value
+        return value
+
+    def invalidate_stat(self, stat: str):
+        self.stat_cache.pop(stat, None)
+        if stat == "armor" or stat == "magic_resist":
+            self.damage_multipliers = {}
+        if self.unit_store is not None:
+            self.unit_store.refresh_stat(self, stat)
+
+    def add_stat_modifier(self, key, stats: dict):
+        """Add flat stat -> amount bonuses to the layer under key, creating it.
+        Names that are not stats are ignored."""
+        layer = self.stat_modifiers.get(key)
+        if layer is None:
+            layer = self.stat_modifiers[key] = {}
+        for stat, amount in stats.items():
+            if stat in STAT_NAMES:
+                layer[stat] = layer.get(stat, 0) + amount
+                self.invalidate_stat(stat)
+
+    def set_stat_multiplier(self, key, stats: dict):
+        """Replace the stat -> factor layer under key"""
+        old = self.stat_multipliers.pop(key, {})
+        self.stat_multipliers[key] = {stat: factor for stat, factor in stats.items() if stat in STAT_NAMES}
+        for stat in list(old) + list(stats):
+            if stat in STAT_NAMES:
+                self.invalidate_stat(stat)
+
+    def remove_stat_modifier(self, key):
+        """Drop the flat and multiplier layers under key"""
+        for layers in (self.stat_modifiers, self.stat_multipliers):
+            layer = layers.pop(key, None)
+            if layer:
+                for stat in layer:
+                    self.invalidate_stat(stat)
+
+    def clear_stat_modifiers(self):
+        self.stat_modifiers = {}
+        self.stat_multipliers = {}
+        for stat in STAT_NAMES:
+            self.invalidate_stat(stat)
+
     def get_total_stats(self):
-        stats = {
-            "hp": self.max_hp,
-            "hp_regen": self.hp_regen,
-            "mp_regen": self.mp_regen,
-            "strength": self.strength,
-            "intelligence": self.intelligence,
-            "armor": self.armor,
-            "magic_resist": self.magic_resist,
-            "attack_damage": self.attack_damage,
-            "attack_range": self.attack_range,
-            "attack_speed": self.attack_speed
-        }
-        
-        for item in self.items:
-            if hasattr(item, "stats"):
-                for stat, value in item.stats.items():
-                    if stat in stats:
-                        stats[stat] += value
-                        
-        for status in self.status_effects:
-            if hasattr(status, "stat_modifiers"):
-                for stat, value in status.stat_modifiers.items():
-                    if stat in stats:
-                        stats[stat] += value
-                        
+        """Effective value of every stat, with max_hp reported as "hp"."""
+        stats = {stat: getattr(self, stat) for stat in STAT_NAMES if stat != "max_hp"}
+        stats["hp"] = self.max_hp
         return stats
     
     @staticmethod
@@ -0,0 +1,309 @@
+"""
+Optional struct-of-arrays storage for per-frame unit state.
+
+With a UnitStore, every unit on the board keeps its hot numeric state
+(hp, regen, mana and the per-frame timers) in one row of shared NumPy
+columns. Board.update_combat advances all rows in one vectorized step
+before the per-unit logic runs, and Unit.update skips those parts.
+
+Units stay ordinary Unit objects: attaching one swaps its class for a
+cached subclass whose column attributes are properties reading and
+writing the unit's row, so content code is unchanged. Stat columns
+(max_hp and the regens) hold the effective stat: assigning one still
+sets the base value, and the unit writes the recomputed stat back to the
+row whenever its base or a modifier layer changes (see stats.py). The unit's spell
+gets the same treatment for current_mana and mana_cost. Detaching copies
+the values back and restores the original classes.
+
+The store also mirrors each unit's tile and side, which the board uses
+to answer "any enemy in range" and "nearest enemy" with one array
+expression on boards too large for bitboards.
+
+The vectorized step runs at the start of the unit phase instead of
+inside each unit's turn, so regen and timers for every unit are applied
+before any unit acts that frame. The arithmetic is the same, and the
+only difference from the per-unit path is when it lands: a unit hit at
+full HP before its own turn has already had that frame's regen capped
+away, where the per-unit path would add it after the hit. Survivor HP is
+then a frame of regen lower, and on crowded boards (full_board in
+benchmark.py) a single hit point can change which units survive. Battles
+without such hits, e.g. 1v1_melee, give identical results.
+death_timer and the HP bar animation stay in Python since they trigger
+removal and presentation.
+
+Requires NumPy; boards without a store never import it.
+"""
+
+from unit import UnitState
+from stats import STAT_NAMES
+
+# Unit attribute -> column dtype
+UNIT_COLUMNS = {
+    'hp': 'f8',
+    'max_hp': 'f8',
+    'hp_regen': 'f8',
+    'mp_regen': 'f8',
+    'attack_timer': 'f8',
+    'move_timer': 'f8',
+    'cast_timer': 'f8',
+    'cast_time': 'f8',
+    'flash_timer': 'f8',
+    'bump_timer': 'f8',
+    'cast_jump_timer': 'f8',
+}
+
+# Spell attribute -> column name
+SPELL_COLUMNS = {
+    'current_mana': 'mana',
+    'mana_cost': 'mana_cost',
+}
+
+# Timers that count down whenever the unit is on the board, dead or alive
+VISUAL_TIMERS = ('flash_timer', 'bump_timer', 'cast_jump_timer')
+
+STATES = list(UnitState)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+_view_classes = {}
+
+
+def _column_property(column):
+    def getter(self):
+        return getattr(self.unit_store, column).item(self.store_row)
+
+    def setter(self, value):
+        getattr(self.unit_store, column)[self.store_row] = value
+
+    return property(getter, setter)
+
+
+def _stat_column_property(column):
+    def getter(self):
+        return getattr(self.unit_store, column).item(self.store_row)
+
+    def setter(self, value):
+        self.base_stats[column] = value
+        self.invalidate_stat(column)
+
+    return property(getter, setter)
+
+
+def _state_property():
+    def getter(self):
+        return STATES[self.unit_store.state.item(self.store_row)]
+
+    def setter(self, value):
+        self.unit_store.state[self.store_row] = STATE_CODES[value]
+
+    return property(getter, setter)
+
+
+def _is_alive(self) -> bool:
+    return self.unit_store.hp.item(self.store_row) > 0
+
+
+def _reduce_view(self, protocol):
+    # View classes are made at runtime and can't be pickled by name; rebuild them on load.
+    # The row values travel with the pickled store in self.unit_store.
+    return (_new_view, (self.store_base_class, self.store_unit_view), self.__dict__)
+
+
+def _new_view(cls, unit_view):
+    columns = {name: name for name in UNIT_COLUMNS} if unit_view else SPELL_COLUMNS
+    view = _view_class(cls, columns, unit_view)
+    return view.__new__(view)
+
+
+def _view_class(cls, columns, unit_view=False):
+    """Cached subclass of cls with the given attribute -> column properties"""
+    view = _view_classes.get(cls)
+    if view is None:
+        namespace = {name: _stat_column_property(column) if name in STAT_NAMES else _column_property(column)
+                     for name, column in columns.items()}
+        if unit_view:
+            namespace['state'] = _state_property()
+            namespace['is_alive'] = _is_alive
+        namespace['store_base_class'] = cls
+        namespace['store_unit_view'] = unit_view
+        namespace['__reduce_ex__'] = _reduce_view
+        namespace['__module__'] = cls.__module__
+        namespace['__qualname__'] = cls.__qualname__
+        view = type(cls.__name__, (cls,), namespace)
+        _view_classes[cls] = view
+    return view
+
+
+class UnitStore:
+    def __init__(self, capacity: int = 64):
+        import numpy as np
+        self.np = np
+        self.capacity = capacity
+        self.size = 0          # Rows in use so far (high-water mark)
+        self.free_rows = []
+        for column, dtype in UNIT_COLUMNS.items():
+            setattr(self, column, np.zeros(capacity, dtype=dtype))
+        self.mana = np.zeros(capacity)
+        self.mana_cost = np.zeros(capacity)
+        self.state = np.zeros(capacity, dtype='i1')
+        self.has_spell = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)
+        # Mirrors of board position and side (0 player, 1 enemy), kept by the board
+        self.x = np.zeros(capacity, dtype='i4')
+        self.y = np.zeros(capacity, dtype='i4')
+        self.side = np.zeros(capacity, dtype='i1')
+        # Bumped each time a row is taken, so a stale row reference can tell it was reused
+        self.serial = np.zeros(capacity, dtype='i8')
+        self.units = [None] * capacity
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['np']
+        return state
+
+    def __setstate__(self, state):
+        import numpy as np
+        self.__dict__.update(state)
+        self.np = np
+
+    def _grow(self):
+        np = self.np
+        self.capacity *= 2
+        for column in list(UNIT_COLUMNS) + ['mana', 'mana_cost', 'state', 'has_spell', 'active',
+                                            'x', 'y', 'side', 'serial']:
+            old = getattr(self, column)
+            new = np.zeros(self.capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, column, new)
+        self.units.extend([None] * (self.capacity - len(self.units)))
+
+    def attach(self, unit):
+        """Move unit's state into a row and turn unit into a view over it"""
+        if unit.store_row is not None:
+            return
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            row = self.size
+            self.size += 1
+
+        for name in UNIT_COLUMNS:
+            getattr(self, name)[row] = getattr(unit, name)
+            unit.__dict__.pop(name, None)
+        self.state[row] = STATE_CODES[unit.__dict__.pop('state')]
+        self.active[row] = True
+        self.serial[row] += 1
+        self.units[row] = unit
+
+        unit.unit_store = self
+        unit.store_row = row
+        unit.__class__ = _view_class(type(unit), {name: name for name in UNIT_COLUMNS}, unit_view=True)
+        self.bind_spell(unit)
+        self.move(unit)
+
+    def detach(self, unit):
+        """Copy unit's row back onto the unit and free the row"""
+        row = unit.store_row
+        if row is None or unit.unit_store is not self:
+            return
+        self.unbind_spell(unit)
+        # Stats live in the unit's own base and layers
+        values = {name: getattr(self, name).item(row) for name in UNIT_COLUMNS if name not in STAT_NAMES}
+        values['state'] = STATES[self.state.item(row)]
+
+        unit.__class__ = unit.store_base_class
+        unit.__dict__.update(values)
+        unit.unit_store = None
+        unit.store_row = None
+        self.active[row] = False
+        self.units[row] = None
+        self.free_rows.append(row)
+
+    def refresh_stat(self, unit, stat: str):
+        """Write unit's recomputed stat to its row if the stat has a column"""
+        if stat in UNIT_COLUMNS:
+            getattr(self, stat)[unit.store_row] = unit.recompute_stat(stat)
+
+    def move(self, unit):
+        """Refresh the position mirror after the board moves unit"""
+        row = unit.store_row
+        self.x[row] = unit.x
+        self.y[row] = unit.y
+        self.side[row] = 0 if unit.team == "player" else 1
+
+    def _enemy_distances(self, unit):
+        """(living enemy mask, Chebyshev distance) over all rows"""
+        n = self.size
+        np = self.np
+        enemies = self.active[:n] & (self.hp[:n] > 0) & (self.side[:n] != self.side[unit.store_row])
+        distance = np.maximum(np.abs(self.x[:n] - unit.x), np.abs(self.y[:n] - unit.y))
+        return enemies, distance
+
+    def has_enemy_in_range(self, unit, range) -> bool:
+        enemies, distance = self._enemy_distances(unit)
+        return bool((enemies & (distance <= range)).any())
+
+    def nearest_enemy_candidates(self, unit):
+        """Living enemies at the smallest distance from unit, in row order"""
+        enemies, distance = self._enemy_distances(unit)
+        if not enemies.any():
+            return []
+        closest = distance[enemies].min()
+        return [self.units[row] for row in self.np.flatnonzero(enemies & (distance == closest))]
+
+    def bind_spell(self, unit):
+        """Back unit.spell's mana with unit's row"""
+        spell = unit.spell
+        row = unit.store_row
+        if spell is None or row is None:
+            return
+        for name, column in SPELL_COLUMNS.items():
+            getattr(self, column)[row] = spell.__dict__.pop(name)
+        spell.unit_store = self
+        spell.store_row = row
+        spell.__class__ = _view_class(type(spell), SPELL_COLUMNS)
+        self.has_spell[row] = True
+
+    def unbind_spell(self, unit):
+        spell = unit.spell
+        row = unit.store_row
+        if spell is None or row is None or getattr(spell, 'unit_store', None) is not self:
+            return
+        values = {name: getattr(self, column).item(row) for name, column in SPELL_COLUMNS.items()}
+        spell.__class__ = spell.store_base_class
+        spell.__dict__.update(values)
+        del spell.unit_store
+        del spell.store_row
+        self.has_spell[row] = False
+
+    def advance(self, dt: float):
+        """Apply one frame of timers and regen to every row, mirroring Unit.update"""
+        n = self.size
+        if not n:
+            return
+        np = self.np
+        active = self.active[:n]
+        hp = self.hp[:n]
+        alive = active & (hp > 0)
+        state = self.state[:n]
+
+        for name in VISUAL_TIMERS:
+            timer = getattr(self, name)[:n]
+            np.subtract(timer, dt, out=timer, where=active & (timer > 0))
+
+        np.minimum(hp + self.hp_regen[:n] * dt, self.max_hp[:n], out=hp, where=alive)
+
+        mana = self.mana[:n]
+        mana_cost = self.mana_cost[:n]
+        regen = alive & self.has_spell[:n] & (state != STATE_CODES[UnitState.CASTING]) & (mana < mana_cost)
+        np.minimum(mana + self.mp_regen[:n] * dt, mana_cost, out=mana, where=regen)
+
+        attack_timer = self.attack_timer[:n]
+        np.subtract(attack_timer, dt, out=attack_timer, where=alive & (attack_timer > 0))
+
+        cast_timer = self.cast_timer[:n]
+        np.add(cast_timer, dt, out=cast_timer, where=alive & (state == STATE_CODES[UnitState.CASTING]))
+
+        move_timer = self.move_timer[:n]
+        np.subtract(move_timer, dt, out=move_timer, where=alive & (state == STATE_CODES[UnitState.WALKING]))